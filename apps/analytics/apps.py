@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 
 class AnalyticsConfig(AppConfig):
-    name = 'analytics'
+    name = 'apps.analytics'
+    label = 'analytics'
+
+    def ready(self):
+        from apps.analytics import signals  # noqa
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Per-breed performance time series.
+
+Each source table is read once as plain columns with values_list(), loaded
+into a NumPy array and summed per (breed, month) with np.unique/np.bincount,
+so no Python loop runs per row. Results are cached per breed and dropped by
+the signal handlers in apps.analytics.signals when a source row changes.
+The keys also carry the cache versions of the source models, which the
+writes that send no signals (QuerySet.update(), bulk_update()) move.
+"""
+import numpy as np
+from django.core.cache import cache
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from apps.breeders.models import Breed, Breeders
+from apps.chicks.models import Chicks, ChicksSold, Mortality
+from apps.core.cache import models_version
+from apps.hatchery import archive
+from apps.hatchery.models import ArchivedRecord, Candling, Hatching
+
+CACHE_KEY = 'analytics:breed:{}'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Months are numbered year * 12 + month - 1, this spaces breeds apart.
+PERIODS = 12 * 10000
+
+# (model, path to the breed id, {series: column}) for every source table.
+SOURCES = (
+    (Candling, 'breeders__breed_id',
+     {'eggs_candled': 'eggs', 'fertile_eggs': 'fertile_eggs'}),
+    (Hatching, 'breeders__breed_id',
+     {'eggs_hatched': 'hatched', 'spoilt_hatch': 'spoilt',
+      'chicks_hatched': 'chicks_hatched'}),
+    (Breeders, 'breed_id',
+     {'hens': 'hens', 'cocks': 'cocks', 'flock_mortality': 'mortality'}),
+    (Mortality, 'chicks__breed_id', {'chick_mortality': 'mortality'}),
+    (ChicksSold, 'chicks__breed_id',
+     {'chicks_sold': 'number', 'revenue': 'sales'}),
+)
+SERIES = tuple(name for _, _, columns in SOURCES for name in columns)
+# Every model the results are computed from.
+MODELS = (Breed, Chicks) + tuple(model for model, _, _ in SOURCES)
+
+
+def _load(model, path, columns, breed_ids):
+    """
+    Return the (breed, month) keys and a {series: values} dict of a source
+    table, summed per key.
+    """
+    qs = model.objects.filter(**{path + '__isnull': False})
+    if breed_ids is not None:
+        qs = qs.filter(**{path + '__in': breed_ids})
+    qs = qs.annotate(
+        period=ExtractYear('created') * 12 + ExtractMonth('created') - 1)\
+        .order_by().values_list(path, 'period', *columns.values())
+
+    rows = list(qs)
+    if archive.is_archived(model):
+        rows.extend(_archived(model, path, columns, breed_ids))
+    data = np.array(rows, dtype=float).reshape(-1, 2 + len(columns))
+    keys = data[:, 0].astype(np.int64) * PERIODS + data[:, 1].astype(np.int64)
+    keys, inverse = np.unique(keys, return_inverse=True)
+    sums = {}
+    for index, name in enumerate(columns, 2):
+        sums[name] = np.bincount(inverse, weights=np.nan_to_num(data[:, index]),
+                                 minlength=len(keys))
+    return keys, sums
+
+
+def _archived(model, path, columns, breed_ids):
+    """
+    (breed, month, *columns) rows of the archived records of a source table.
+    Only paths through one foreign key to the breed are supported.
+    """
+    relation, _, breed_column = path.partition('__')
+    field = model._meta.get_field(relation)
+    breed_of = dict(field.related_model.objects.order_by()
+                    .values_list('id', breed_column))
+    created = model._meta.get_field('created')
+    for data in ArchivedRecord.objects.rows(model):
+        breed_id = breed_of.get(data.get(field.attname))
+        if breed_id is None or (breed_ids is not None and
+                                breed_id not in breed_ids):
+            continue
+        moment = timezone.localtime(created.to_python(data['created']))
+        yield (breed_id, moment.year * 12 + moment.month - 1) + tuple(
+            data.get(column) for column in columns.values())
+
+
+def _rate(part, whole):
+    rate = np.divide(part, whole, out=np.zeros_like(part), where=whole > 0)
+    return np.round(rate * 100, 1)
+
+
+def _percent(part, whole):
+    return round(100.0 * float(part) / float(whole), 1) if whole else 0
+
+
+def _series(breed, months, totals):
+    labels = ['{:04d}-{:02d}'.format(int(m) // 12, int(m) % 12 + 1)
+              for m in months]
+    flock = totals['hens'] + totals['cocks']
+    series = {
+        'fertility': _rate(totals['fertile_eggs'], totals['eggs_candled']),
+        'hatchability': _rate(totals['chicks_hatched'],
+                              totals['eggs_hatched'] + totals['spoilt_hatch']),
+        'flock_mortality': _rate(totals['flock_mortality'], flock),
+        'chick_mortality': totals['chick_mortality'],
+        'chicks_sold': totals['chicks_sold'],
+        'revenue': np.round(totals['revenue'], 2),
+    }
+    return {
+        'breed': breed['id'],
+        'code': breed['code'],
+        'name': breed['breed'],
+        'eggs_year': breed['eggs_year'],
+        'adult_weight': breed['adult_weight'],
+        'months': labels,
+        'series': {name: values.tolist() for name, values in series.items()},
+        'totals': {
+            'fertility': _percent(totals['fertile_eggs'].sum(),
+                                  totals['eggs_candled'].sum()),
+            'hatchability': _percent(
+                totals['chicks_hatched'].sum(),
+                (totals['eggs_hatched'] + totals['spoilt_hatch']).sum()),
+            'chicks_sold': float(totals['chicks_sold'].sum()),
+            'revenue': round(float(totals['revenue'].sum()), 2),
+        },
+    }
+
+
+def compute(breed_ids=None):
+    """
+    Compute the monthly series of the given breeds (all breeds by default).
+    Returns ``{breed_id: result}``.
+    """
+    loaded = [_load(model, path, columns, breed_ids)
+              for model, path, columns in SOURCES]
+    keys = np.unique(np.concatenate(
+        [source_keys for source_keys, _ in loaded] +
+        [np.zeros(0, dtype=np.int64)]))
+
+    totals = {name: np.zeros(len(keys)) for name in SERIES}
+    for source_keys, sums in loaded:
+        positions = np.searchsorted(keys, source_keys)
+        for name, values in sums.items():
+            totals[name][positions] = values
+
+    breeds = Breed.objects.all()
+    if breed_ids is not None:
+        breeds = breeds.filter(id__in=breed_ids)
+    breeds = {breed['id']: breed for breed in breeds.order_by().values(
+        'id', 'code', 'breed', 'eggs_year', 'adult_weight')}
+
+    results = {}
+    key_breeds = keys // PERIODS
+    starts = np.searchsorted(key_breeds, list(breeds))
+    ends = np.searchsorted(key_breeds, list(breeds), side='right')
+    for breed_id, start, end in zip(breeds, starts, ends):
+        results[breed_id] = _series(
+            breeds[breed_id], keys[start:end] % PERIODS,
+            {name: values[start:end] for name, values in totals.items()})
+    return results
+
+
+def _key(breed_id, version):
+    return '{}:{}'.format(CACHE_KEY.format(breed_id), version)
+
+
+def breed_performance(breed_id):
+    """
+    Cached series of one breed, or None if the breed does not exist.
+    """
+    key = _key(breed_id, models_version(*MODELS))
+    result = cache.get(key)
+    if result is None:
+        result = compute([breed_id]).get(breed_id)
+        if result is not None:
+            cache.set(key, result, CACHE_TIMEOUT)
+    return result
+
+
+def all_breed_performance():
+    """
+    Series of every breed, computed in one pass on a cache miss.
+    """
+    breed_ids = list(Breed.objects.order_by('id').values_list('id', flat=True))
+    version = models_version(*MODELS)
+    keys = [_key(breed_id, version) for breed_id in breed_ids]
+    cached = cache.get_many(keys)
+    if len(cached) == len(keys):
+        return [cached[key] for key in keys]
+
+    results = compute()
+    cache.set_many({_key(breed_id, version): result
+                    for breed_id, result in results.items()}, CACHE_TIMEOUT)
+    return [results[breed_id] for breed_id in breed_ids
+            if breed_id in results]
+
+
+def invalidate(*breed_ids):
+    breed_ids = set(breed_ids) - {None}
+    if breed_ids:
+        version = models_version(*MODELS)
+        cache.delete_many([_key(breed_id, version) for breed_id in breed_ids])
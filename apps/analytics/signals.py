@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.analytics import breeds
+from apps.breeders.models import Breed, Breeders
+from apps.chicks.models import Chicks, ChicksSold, Mortality
+from apps.hatchery.models import Candling, Hatching
+
+# Path from each source model to the breed its rows count towards.
+BREED_PATHS = {
+    Breeders: 'breed_id',
+    Chicks: 'breed_id',
+    Candling: 'breeders__breed_id',
+    Hatching: 'breeders__breed_id',
+    Mortality: 'chicks__breed_id',
+    ChicksSold: 'chicks__breed_id',
+}
+
+
+def breed_id_of(instance):
+    """
+    The breed an instance counts towards, from its current values.
+    """
+    path = BREED_PATHS[type(instance)]
+    if '__' not in path:
+        return getattr(instance, path)
+    name, path = path.split('__', 1)
+    related_id = getattr(instance, name + '_id')
+    if related_id is None:
+        return None
+    model = instance._meta.get_field(name).related_model
+    return model.objects.filter(pk=related_id)\
+        .values_list(path, flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Breed)
+def breed_changed(sender, instance, **kwargs):
+    breeds.invalidate(instance.id)
+
+
+@receiver(pre_save, sender=Breeders)
+@receiver(pre_save, sender=Chicks)
+@receiver(pre_save, sender=Candling)
+@receiver(pre_save, sender=Hatching)
+@receiver(pre_save, sender=Mortality)
+@receiver(pre_save, sender=ChicksSold)
+def record_saving(sender, instance, raw=False, **kwargs):
+    # The breed the row counted towards as stored, in case it moves.
+    instance._stored_breed_id = None
+    if instance.pk is not None and not raw:
+        instance._stored_breed_id = sender.objects.filter(pk=instance.pk)\
+            .values_list(BREED_PATHS[sender], flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Breeders)
+@receiver([post_save, post_delete], sender=Chicks)
+@receiver([post_save, post_delete], sender=Candling)
+@receiver([post_save, post_delete], sender=Hatching)
+@receiver([post_save, post_delete], sender=Mortality)
+@receiver([post_save, post_delete], sender=ChicksSold)
+def record_changed(sender, instance, **kwargs):
+    breeds.invalidate(instance.__dict__.pop('_stored_breed_id', None),
+                      breed_id_of(instance))
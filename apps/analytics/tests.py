@@ -1,3 +1,90 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TransactionTestCase
 
-# Create your tests here.
+from apps.analytics import breeds
+from apps.breeders.models import Breed, Breeders
+from apps.chicks.models import Chicks, ChicksSold
+from apps.hatchery import archive
+from apps.hatchery.models import (Candling, EggSetting, Hatching,
+                                  Incubation)
+
+
+class BreedPerformanceTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.kuroiler = Breed.objects.create(code='KUR', breed='Kuroiler')
+        self.kienyeji = Breed.objects.create(code='KNY', breed='Kienyeji')
+        flock = Breeders.objects.create(breed=self.kuroiler, hens=90, cocks=10,
+                                        mortality=5, butchered=0, sold=0)
+        Candling.objects.create(breeders=flock, eggs=100, spoilt_eggs=20)
+        Candling.objects.create(breeders=flock, eggs=100, spoilt_eggs=0)
+        Hatching.objects.create(breeders=flock, hatched=150, deformed=6,
+                                spoilt=30)
+        chicks = Chicks.objects.create(breed=self.kuroiler, number=144)
+        ChicksSold.objects.create(chicks=chicks, number=100, price=1.5)
+
+    def test_compute(self):
+        results = breeds.compute()
+        self.assertEqual(set(results), {self.kuroiler.id, self.kienyeji.id})
+
+        kuroiler = results[self.kuroiler.id]
+        self.assertEqual(len(kuroiler['months']), 1)
+        self.assertEqual(kuroiler['series']['fertility'], [90.0])
+        self.assertEqual(kuroiler['series']['hatchability'], [80.0])
+        self.assertEqual(kuroiler['series']['flock_mortality'], [5.0])
+        self.assertEqual(kuroiler['totals']['revenue'], 150.0)
+        self.assertEqual(results[self.kienyeji.id]['months'], [])
+
+    def test_cache_is_invalidated_on_write(self):
+        self.assertEqual(breeds.breed_performance(self.kuroiler.id)
+                         ['totals']['chicks_sold'], 100)
+        with self.assertNumQueries(0):
+            breeds.breed_performance(self.kuroiler.id)
+
+        chicks = Chicks.objects.get()
+        ChicksSold.objects.create(chicks=chicks, number=20, price=1.5)
+        self.assertEqual(breeds.breed_performance(self.kuroiler.id)
+                         ['totals']['chicks_sold'], 120)
+
+    def test_moves_invalidate_both_breeds(self):
+        def fertility():
+            return tuple(breeds.breed_performance(breed.id)['totals']
+                         ['fertility']
+                         for breed in (self.kuroiler, self.kienyeji))
+
+        self.assertEqual(fertility(), (90.0, 0))
+        flock = Breeders.objects.get()
+        flock.breed = self.kienyeji
+        flock.save()
+        self.assertEqual(fertility(), (0, 90.0))
+
+        candling = Candling.objects.first()
+        candling.breeders = Breeders.objects.create(breed=self.kuroiler,
+                                                    hens=1, cocks=1)
+        candling.save()
+        self.assertEqual(fertility(), (80.0, 100.0))
+
+    def test_bulk_writes_invalidate(self):
+        self.assertEqual(len(breeds.all_breed_performance()), 2)
+        self.assertEqual(breeds.breed_performance(self.kuroiler.id)
+                         ['series']['flock_mortality'], [5.0])
+        Breeders.objects.update(mortality=10)
+        self.assertEqual(breeds.breed_performance(self.kuroiler.id)
+                         ['series']['flock_mortality'], [10.0])
+        sold = ChicksSold.objects.get()
+        sold.price = 2.0
+        ChicksSold.objects.bulk_update([sold], ['price'])
+        self.assertEqual(breeds.all_breed_performance()[0]['totals']
+                         ['revenue'], 200.0)
+
+    def test_archived_rows_are_included(self):
+        before = breeds.compute()
+        setting = EggSetting.objects.create(eggs=200)
+        incubation = Incubation.objects.create(eggsetting=setting, eggs=200)
+        Candling.objects.update(incubation=incubation)
+        Hatching.objects.update(candling=Candling.objects.first())
+
+        archive.archive_settings([setting.id])
+        self.assertFalse(Candling.objects.exists())
+        self.assertEqual(breeds.compute(), before)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from apps.analytics.views import breed_detail_view, breed_list_view
+
+urlpatterns = [
+    path('breeds/', breed_list_view, name='analytics_breed_list'),
+    path('breeds/<int:breed_id>/', breed_detail_view,
+         name='analytics_breed_detail'),
+]
@@ -1,3 +1,41 @@
-from django.shortcuts import render
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, JsonResponse
 
-# Create your views here.
+from apps.analytics import breeds
+
+
+def _since(result, since):
+    """
+    Keep the months from ``since`` (YYYY-MM) on.
+    """
+    if not since:
+        return result
+    start = next((i for i, month in enumerate(result['months'])
+                  if month >= since), len(result['months']))
+    result = dict(result)
+    result['months'] = result['months'][start:]
+    result['series'] = {name: values[start:]
+                        for name, values in result['series'].items()}
+    return result
+
+
+@staff_member_required
+def breed_list_view(request):
+    since = request.GET.get('since')
+    return JsonResponse({'breeds': [
+        _since(result, since) for result in breeds.all_breed_performance()]})
+
+
+@staff_member_required
+def breed_detail_view(request, breed_id):
+    result = breeds.breed_performance(breed_id)
+    if result is None:
+        raise Http404('No breed with id %s.' % breed_id)
+    return JsonResponse(_since(result, request.GET.get('since')))
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    name = 'apps.api'
+    label = 'api'
+
+    def ready(self):
+        from apps.api import signals
+        signals.connect()
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.api import sync
+
+
+class Command(BaseCommand):
+    help = 'Delete the sync tombstones and idempotency keys older than ' \
+           'SYNC_TOMBSTONE_DAYS days. Clients with an older watermark are ' \
+           'sent a full copy.'
+
+    def handle(self, *args, **options):
+        total = sync.prune()
+        self.stdout.write('Deleted %s row(s).\n' % total)
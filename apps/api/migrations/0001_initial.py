@@ -0,0 +1,56 @@
+# Generated by Django 3.1.2 on 2020-11-06 09:30
+
+from django.conf import settings
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncTombstone',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=50)),
+                ('record_id', models.IntegerField()),
+                ('deleted', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'SyncTombstone',
+                'verbose_name_plural': 'SyncTombstones',
+                'db_table': 'sync_tombstone',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='SyncUpload',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('model', models.CharField(max_length=50)),
+                ('record_id', models.IntegerField(blank=True, null=True)),
+                ('result', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='syncupload_user', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'SyncUpload',
+                'verbose_name_plural': 'SyncUploads',
+                'db_table': 'sync_upload',
+                'managed': True,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='synctombstone',
+            index=models.Index(fields=['model', 'deleted'], name='sync_tombstone_deleted'),
+        ),
+    ]
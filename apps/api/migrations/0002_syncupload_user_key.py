@@ -0,0 +1,30 @@
+# Generated by Django 3.1.2 on 2026-10-18 14:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='syncupload',
+            name='key',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='syncupload',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='syncupload_user', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='syncupload',
+            unique_together={('user', 'key')},
+        ),
+    ]
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class SyncTombstone(models.Model):
+    """
+    SyncTombstone Model
+
+    A deleted row of a model synced by apps.api.sync, kept so that clients
+    syncing later drop it too. Pruned after SYNC_TOMBSTONE_DAYS days.
+    """
+    id = models.AutoField(primary_key=True)
+    model=models.CharField(max_length=50)
+    record_id=models.IntegerField()
+    deleted=models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "sync_tombstone"
+        verbose_name = 'SyncTombstone'
+        verbose_name_plural = "SyncTombstones"
+        managed = True
+        indexes = [
+            models.Index(fields=['model', 'deleted'],
+                         name='sync_tombstone_deleted'),
+        ]
+
+    def __str__(self):
+        return '{} {}'.format(self.model, self.record_id)
+
+
+class SyncUpload(models.Model):
+    """
+    SyncUpload Model
+
+    The outcome of an uploaded change, under the idempotency key the client
+    gave it: a change sent again by the same user, after a lost response,
+    is not applied twice and gets the same answer. Keys are only unique
+    per user.
+    """
+    id = models.AutoField(primary_key=True)
+    key=models.CharField(max_length=64)
+    user=models.ForeignKey(settings.AUTH_USER_MODEL,
+        related_name="syncupload_user", blank=True, null=True,
+        on_delete=models.CASCADE)
+    model=models.CharField(max_length=50)
+    record_id=models.IntegerField(null=True,blank=True)
+    result=models.JSONField(encoder=DjangoJSONEncoder)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "sync_upload"
+        unique_together = (('user', 'key'),)
+        verbose_name = 'SyncUpload'
+        verbose_name_plural = "SyncUploads"
+        managed = True
+
+    def __str__(self):
+        return self.key
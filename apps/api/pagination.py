@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Newest first on the primary key: pages seek on the primary key index
+    whatever their position, no COUNT(*) is run, and rows created while a
+    client pages through are not skipped nor repeated.
+    """
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from rest_framework import serializers
+
+from apps.breeders.models import Breed, Breeders
+from apps.chicks.models import Chicks, ChicksAvailable, ChicksSold, Mortality
+from apps.customer.models import Customer, CustomerRequest, Eggs
+from apps.hatchery.models import (Candling, EggSetting, Hatchery, Hatching,
+                                  Holding, Incubation, IncubatorCapacity,
+                                  Incubators)
+from apps.images import renditions
+
+
+def requested_fields(request):
+    """
+    The field names asked for with ``?fields=a,b``, or None for all.
+    """
+    if request is None or not request.query_params.get('fields'):
+        return None
+    return {name.strip() for name in request.query_params['fields']
+            .split(',') if name.strip()}
+
+
+def code(slug_field, **kwargs):
+    # Relations to records with a unique code are sent as that code.
+    return serializers.SlugRelatedField(slug_field=slug_field,
+                                        read_only=True, **kwargs)
+
+
+class RenditionsField(serializers.Field):
+    """
+    URLs of the resized copies of a photo by width and format:
+    ``{"160": {"jpg": url, "webp": url}, "640": ...}``.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super(RenditionsField, self).__init__(**kwargs)
+
+    def to_representation(self, fieldfile):
+        if not fieldfile:
+            return None
+        request = self.context.get('request')
+        build = request.build_absolute_uri if request else (lambda url: url)
+        return {str(width): {extension: build(renditions.url(
+                    fieldfile, width, extension))
+                    for extension in renditions.FORMATS}
+                for width in renditions.WIDTHS}
+
+
+class SparseModelSerializer(serializers.ModelSerializer):
+    """
+    Drops the fields not listed in the request's ``?fields=``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(SparseModelSerializer, self).__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class CustomerSerializer(SparseModelSerializer):
+    photo_renditions = RenditionsField(source='photo')
+
+    class Meta:
+        model = Customer
+        exclude = ('location',)
+
+
+class EggsSerializer(SparseModelSerializer):
+    customer = code('customercode')
+    photo_renditions = RenditionsField(source='photo')
+
+    class Meta:
+        model = Eggs
+        fields = '__all__'
+
+
+class CustomerRequestSerializer(SparseModelSerializer):
+
+    class Meta:
+        model = CustomerRequest
+        fields = '__all__'
+
+
+class BreedSerializer(SparseModelSerializer):
+    front_photo_renditions = RenditionsField(source='front_photo')
+    side_photo_renditions = RenditionsField(source='side_photo')
+    back_photo_renditions = RenditionsField(source='back_photo')
+
+    class Meta:
+        model = Breed
+        fields = '__all__'
+
+
+class BreedersSerializer(SparseModelSerializer):
+    hens_photo_renditions = RenditionsField(source='hens_photo')
+    cocks_photo_renditions = RenditionsField(source='cocks_photo')
+
+    class Meta:
+        model = Breeders
+        fields = '__all__'
+
+
+class HatcherySerializer(SparseModelSerializer):
+    incubators = code('code', source='incubators_hatchery', many=True)
+    photo_renditions = RenditionsField(source='photo')
+
+    class Meta:
+        model = Hatchery
+        exclude = ('location',)
+
+
+class IncubatorsSerializer(SparseModelSerializer):
+    hatchery = code('name')
+
+    class Meta:
+        model = Incubators
+        fields = '__all__'
+
+
+class IncubatorCapacitySerializer(SparseModelSerializer):
+    incubator = code('code')
+
+    class Meta:
+        model = IncubatorCapacity
+        fields = '__all__'
+
+
+class EggSettingSerializer(SparseModelSerializer):
+    incubator = code('code')
+    customer = code('customercode')
+
+    class Meta:
+        model = EggSetting
+        fields = '__all__'
+
+
+class IncubationSerializer(SparseModelSerializer):
+    eggsetting = code('settingcode')
+    customer = code('customercode')
+
+    class Meta:
+        model = Incubation
+        fields = '__all__'
+
+
+class CandlingSerializer(SparseModelSerializer):
+    incubation = code('incubationcode')
+    customer = code('customercode')
+
+    class Meta:
+        model = Candling
+        fields = '__all__'
+
+
+class HatchingSerializer(SparseModelSerializer):
+    candling = code('candlingcode')
+    customer = code('customercode')
+
+    class Meta:
+        model = Hatching
+        fields = '__all__'
+
+
+class HoldingSerializer(SparseModelSerializer):
+    hatching = code('hatchingcode')
+    customer = code('customercode')
+
+    class Meta:
+        model = Holding
+        exclude = ('location',)
+
+
+class ChicksSerializer(SparseModelSerializer):
+
+    class Meta:
+        model = Chicks
+        fields = '__all__'
+
+
+class MortalitySerializer(SparseModelSerializer):
+    chicks = code('batchnumber')
+
+    class Meta:
+        model = Mortality
+        fields = '__all__'
+
+
+class ChicksSoldSerializer(SparseModelSerializer):
+    chicks = code('batchnumber')
+
+    class Meta:
+        model = ChicksSold
+        fields = '__all__'
+
+
+class ChicksAvailableSerializer(SparseModelSerializer):
+
+    class Meta:
+        model = ChicksAvailable
+        fields = '__all__'
+
+
+# Writable serializers of the models synced by apps.api.sync. Codes are
+# given by the server, relations are sent as codes where there is one.
+
+class EggsSyncSerializer(serializers.ModelSerializer):
+    customer = serializers.SlugRelatedField(
+        slug_field='customercode', queryset=Customer.objects.all(),
+        allow_null=True, required=False)
+
+    class Meta:
+        model = Eggs
+        fields = '__all__'
+        read_only_fields = ('photo', 'received', 'created', 'updated')
+
+
+class CandlingSyncSerializer(serializers.ModelSerializer):
+    incubation = serializers.SlugRelatedField(
+        slug_field='incubationcode', queryset=Incubation.objects.all(),
+        allow_null=True, required=False)
+    customer = serializers.SlugRelatedField(
+        slug_field='customercode', queryset=Customer.objects.all(),
+        allow_null=True, required=False)
+
+    class Meta:
+        model = Candling
+        fields = '__all__'
+        read_only_fields = ('candlingcode', 'fertile_eggs', 'created',
+                            'updated')
+
+
+class HatchingSyncSerializer(serializers.ModelSerializer):
+    candling = serializers.SlugRelatedField(
+        slug_field='candlingcode', queryset=Candling.objects.all(),
+        allow_null=True, required=False)
+    customer = serializers.SlugRelatedField(
+        slug_field='customercode', queryset=Customer.objects.all(),
+        allow_null=True, required=False)
+
+    class Meta:
+        model = Hatching
+        fields = '__all__'
+        read_only_fields = ('hatchingcode', 'chicks_hatched', 'created',
+                            'updated')
+
+
+class MortalitySyncSerializer(serializers.ModelSerializer):
+    chicks = serializers.SlugRelatedField(
+        slug_field='batchnumber', queryset=Chicks.objects.all(),
+        allow_null=True, required=False)
+
+    class Meta:
+        model = Mortality
+        fields = '__all__'
+        read_only_fields = ('created', 'updated')
+
+
+class ChicksSoldSyncSerializer(serializers.ModelSerializer):
+    chicks = serializers.SlugRelatedField(
+        slug_field='batchnumber', queryset=Chicks.objects.all(),
+        allow_null=True, required=False)
+
+    class Meta:
+        model = ChicksSold
+        fields = '__all__'
+        read_only_fields = ('sales', 'created', 'updated')
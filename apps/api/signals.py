@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.apps import apps
+from django.db.models.signals import post_delete
+from django.utils import timezone
+
+from apps.api.models import SyncTombstone
+from apps.api.sync import SYNCED
+
+
+def object_deleted(sender, instance, **kwargs):
+    SyncTombstone.objects.create(model=sender._meta.label_lower,
+                                 record_id=instance.pk,
+                                 deleted=timezone.now())
+
+
+def connect():
+    for name, (label, _, _) in SYNCED.items():
+        post_delete.connect(object_deleted, sender=apps.get_model(label),
+                            dispatch_uid='sync_deleted_' + name)
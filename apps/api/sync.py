@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Delta sync of the records field staff capture offline.
+
+Download: changes() returns the rows of one synced model written since the
+client's watermark, in (updated, id) order on their index, ``limit`` at a
+time, with the ids deleted meanwhile and the watermark to send next time.
+``more`` asks the client to call again straight away. Rows written in the
+last MARGIN are left to the next sync, so that a transaction committing
+late with an earlier ``updated`` is not skipped. A watermark older than
+SYNC_TOMBSTONE_DAYS days, whose deletions are forgotten, starts over with
+``reset`` set: the client replaces its copy.
+
+Upload: upload() applies a batch of changes in one transaction. Each change
+carries an idempotency key made by the client; a key the user already
+applied is answered with its first result instead of being applied again.
+"""
+import datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from apps.api import serializers
+from apps.api.models import SyncTombstone, SyncUpload
+
+# name: (model, serializer, relations read by the serializer)
+SYNCED = {
+    'eggs': ('customer.Eggs', serializers.EggsSyncSerializer,
+             ('customer',)),
+    'candling': ('hatchery.Candling', serializers.CandlingSyncSerializer,
+                 ('incubation', 'customer')),
+    'hatching': ('hatchery.Hatching', serializers.HatchingSyncSerializer,
+                 ('candling', 'customer')),
+    'mortality': ('chicks.Mortality', serializers.MortalitySyncSerializer,
+                  ('chicks',)),
+    'chicks_sold': ('chicks.ChicksSold',
+                    serializers.ChicksSoldSyncSerializer, ('chicks',)),
+}
+
+MARGIN = datetime.timedelta(seconds=5)
+MAX_CHANGES = 500
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class UploadError(Exception):
+
+    def __init__(self, errors):
+        super(UploadError, self).__init__(errors)
+        self.errors = errors
+
+
+def tombstone_days():
+    return getattr(settings, 'SYNC_TOMBSTONE_DAYS', 90)
+
+
+def synced_model(name):
+    try:
+        label, serializer_class, related = SYNCED[name]
+    except (KeyError, TypeError):
+        raise ValidationError({'model': 'Unknown model {!r}.'.format(name)})
+    return apps.get_model(label), serializer_class, related
+
+
+def encode_watermark(moment, pk):
+    delta = moment - EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 10 ** 6 + \
+        delta.microseconds
+    return '{}-{}'.format(micros, pk)
+
+
+def decode_watermark(watermark):
+    try:
+        micros, pk = (int(part) for part in watermark.split('-'))
+    except ValueError:
+        raise ValueError('Invalid watermark {!r}.'.format(watermark))
+    return EPOCH + datetime.timedelta(microseconds=micros), pk
+
+
+def changes(name, watermark=None, limit=500, now=None):
+    model, serializer_class, related = synced_model(name)
+    now = now or timezone.now()
+    until = now - MARGIN
+    since, since_id = decode_watermark(watermark) if watermark else (None, 0)
+    reset = since is not None and \
+        since < now - datetime.timedelta(days=tombstone_days())
+    if reset:
+        since = None
+
+    qs = model._default_manager.filter(updated__lt=until)\
+        .select_related(*related).order_by('updated', 'id')
+    if since is not None:
+        qs = qs.filter(Q(updated__gt=since) | Q(updated=since,
+                                                 id__gt=since_id))
+    rows = list(qs[:limit + 1])
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if more:
+        end, next_watermark = rows[-1].updated, encode_watermark(
+            rows[-1].updated, rows[-1].id)
+    else:
+        end, next_watermark = until, encode_watermark(until, 0)
+
+    deleted = []
+    if since is not None:
+        deleted = list(SyncTombstone.objects.filter(
+            model=model._meta.label_lower, deleted__gte=since,
+            deleted__lt=end).values_list('record_id', flat=True))
+    return {
+        'rows': serializer_class(rows, many=True).data,
+        'deleted': deleted,
+        'watermark': next_watermark,
+        'more': more,
+        'reset': reset,
+    }
+
+
+def apply_change(change, user=None):
+    if not isinstance(change, dict):
+        raise ValidationError('A change must be an object.')
+    key = change.get('key')
+    if not isinstance(key, str) or not 0 < len(key) <= 64:
+        raise ValidationError(
+            {'key': 'A key of at most 64 characters is required.'})
+    done = SyncUpload.objects.filter(user=user, key=key).first()
+    if done is not None:
+        return dict(done.result, duplicate=True)
+
+    name = change.get('model')
+    model, serializer_class, _ = synced_model(name)
+    instance = None
+    if change.get('id') is not None:
+        instance = model._default_manager.filter(id=change['id']).first()
+        if instance is None:
+            raise ValidationError({'id': 'No {} {}.'.format(name,
+                                                           change['id'])})
+    serializer = serializer_class(instance, data=change.get('data') or {},
+                                  partial=instance is not None)
+    serializer.is_valid(raise_exception=True)
+    try:
+        obj = serializer.save()
+    except DjangoValidationError as e:
+        raise ValidationError(e.messages)
+    result = {'key': key, 'model': name, 'id': obj.id,
+              'row': serializer_class(obj).data}
+    SyncUpload.objects.create(key=key, user=user, model=name,
+                              record_id=obj.id, result=result)
+    return dict(result, duplicate=False)
+
+
+def upload(changes, user=None):
+    """
+    Apply a list of changes ``{"key", "model", "id", "data"}``, creating a
+    row when there is no id. Everything is rolled back when one fails.
+    """
+    if not isinstance(changes, list) or len(changes) > MAX_CHANGES:
+        raise UploadError({'changes': 'A list of at most {} changes is '
+                                      'expected.'.format(MAX_CHANGES)})
+    results, errors = [], {}
+    with transaction.atomic():
+        for index, change in enumerate(changes):
+            try:
+                with transaction.atomic():
+                    results.append(apply_change(change, user))
+            except ValidationError as e:
+                errors[index] = e.detail
+            except IntegrityError:
+                errors[index] = ['Conflicting write, send the change again.']
+        if errors:
+            raise UploadError(errors)
+    return results
+
+
+def prune(now=None):
+    """
+    Forget the deletions and idempotency keys older than
+    SYNC_TOMBSTONE_DAYS days. Returns the number of rows deleted.
+    """
+    cutoff = (now or timezone.now()) - datetime.timedelta(
+        days=tombstone_days())
+    tombstones, _ = SyncTombstone.objects.filter(deleted__lt=cutoff).delete()
+    uploads, _ = SyncUpload.objects.filter(created__lt=cutoff).delete()
+    return tombstones + uploads
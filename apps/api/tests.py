@@ -0,0 +1,187 @@
+import datetime
+import gzip
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from apps.api import sync
+from apps.api.models import SyncTombstone
+from apps.chicks.models import Chicks, Mortality
+from apps.customer.models import Customer, Eggs
+from apps.hatchery.models import (EggSetting, Hatchery, IncubatorCapacity,
+                                  Incubators)
+
+
+class ApiTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('clerk', password='pass')
+        self.client.force_login(self.user)
+        self.customer = Customer.objects.create(first_name='Jane',
+                                                last_name='Doe')
+
+    def test_cursor_pages(self):
+        eggs = [Eggs.objects.create(batchnumber='EGG-{}'.format(number),
+                                    customer=self.customer, brought=10,
+                                    returned=0) for number in range(5)]
+        ids, url = [], '/api/eggs/?page_size=2'
+        while url:
+            page = self.client.get(url).json()
+            ids += [row['id'] for row in page['results']]
+            url = page['next']
+        self.assertEqual(ids, [row.id for row in reversed(eggs)])
+        self.assertNotIn('count', page)
+
+    def test_sparse_fields_and_joins(self):
+        hatchery = Hatchery.objects.create(name='Kisumu')
+        incubator = Incubators.objects.create(hatchery=hatchery)
+        IncubatorCapacity.objects.create(incubator=incubator, capacity=100,
+                                         occupied=0)
+        for _ in range(3):
+            EggSetting.objects.create(customer=self.customer,
+                                      incubator=incubator, eggs=10)
+        with self.assertNumQueries(3):
+            rows = self.client.get('/api/egg_settings/').json()['results']
+        self.assertEqual(rows[0]['customer'], self.customer.customercode)
+        self.assertEqual(rows[0]['incubator'], incubator.code)
+
+        with self.assertNumQueries(3):
+            rows = self.client.get(
+                '/api/egg_settings/?fields=settingcode,eggs').json()['results']
+        self.assertEqual(set(rows[0]), {'settingcode', 'eggs'})
+
+        with self.assertNumQueries(4):
+            hatcheries = self.client.get('/api/hatcheries/').json()['results']
+        self.assertEqual(hatcheries[0]['incubators'], [incubator.code])
+        response = self.client.get('/api/hatcheries/Kisumu/?fields=name')
+        self.assertEqual(response.json(), {'name': 'Kisumu'})
+
+    def test_etag_and_gzip(self):
+        url = '/api/customers/{}/'.format(self.customer.customercode)
+        response = self.client.get(url)
+        self.assertTrue(response.has_header('ETag'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        Eggs.objects.bulk_create([Eggs(batchnumber='EGG-{}'.format(number),
+                                       customer=self.customer)
+                                  for number in range(20)])
+        response = self.client.get('/api/eggs/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        page = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(page['results']), 20)
+
+    def test_authentication(self):
+        self.client.logout()
+        self.assertIn(self.client.get('/api/customers/').status_code,
+                      (401, 403))
+        token = Token.objects.create(user=self.user)
+        response = self.client.get(
+            '/api/customers/', HTTP_AUTHORIZATION='Token ' + token.key)
+        self.assertEqual(response.status_code, 200)
+
+
+class SyncTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('clerk', password='pass')
+        self.client.force_login(self.user)
+        self.chicks = Chicks.objects.create(number=100)
+        self.now = timezone.now()
+        clock = mock.patch('django.utils.timezone.now', lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def age(self):
+        # Let the clock move past the margin left to transactions in flight.
+        self.now += datetime.timedelta(minutes=1)
+
+    def test_delta_download(self):
+        rows = [Mortality.objects.create(chicks=self.chicks, mortality=n)
+                for n in range(3)]
+        self.age()
+        first = sync.changes('mortality', limit=2)
+        self.assertTrue(first['more'])
+        second = sync.changes('mortality', first['watermark'], limit=2)
+        self.assertFalse(second['more'])
+        self.assertEqual([row['id'] for row in first['rows'] + second['rows']],
+                         [row.id for row in rows])
+        self.assertEqual(first['rows'][0]['chicks'], self.chicks.batchnumber)
+
+        rows[0].mortality = 5
+        rows[0].save()
+        Mortality.objects.filter(pk=rows[1].pk).update(mortality=7)
+        deleted = rows[2].id
+        rows[2].delete()
+        # Writes of the last seconds wait for the next sync.
+        self.assertEqual(sync.changes('mortality', second['watermark'])
+                         ['rows'], [])
+        self.age()
+        third = sync.changes('mortality', second['watermark'])
+        self.assertEqual([row['mortality'] for row in third['rows']], [5, 7])
+        self.assertEqual(third['deleted'], [deleted])
+        self.assertEqual(sync.changes('mortality', third['watermark'])
+                         ['rows'], [])
+
+    def test_old_watermark_resets(self):
+        Mortality.objects.create(chicks=self.chicks)
+        watermark = sync.encode_watermark(
+            timezone.now() - datetime.timedelta(days=365), 0)
+        self.age()
+        result = sync.changes('mortality', watermark)
+        self.assertTrue(result['reset'])
+        self.assertEqual(len(result['rows']), 1)
+
+    def upload(self, *changes):
+        return self.client.post('/api/sync/', {'changes': list(changes)},
+                                content_type='application/json')
+
+    def test_upload_is_idempotent(self):
+        change = {'key': 'device-1:1', 'model': 'mortality',
+                  'data': {'chicks': self.chicks.batchnumber, 'mortality': 2}}
+        first = self.upload(change).json()['results']
+        again = self.upload(change).json()['results']
+        self.assertEqual(Mortality.objects.count(), 1)
+        self.assertFalse(first[0]['duplicate'])
+        self.assertTrue(again[0]['duplicate'])
+        self.assertEqual(again[0]['id'], first[0]['id'])
+
+        update = {'key': 'device-1:2', 'model': 'mortality',
+                  'id': first[0]['id'], 'data': {'mortality': 3}}
+        self.assertEqual(self.upload(update).status_code, 200)
+        self.assertEqual(Mortality.objects.get().mortality, 3)
+
+    def test_keys_are_per_user(self):
+        change = {'key': 'device-1:1', 'model': 'mortality',
+                  'data': {'chicks': self.chicks.batchnumber, 'mortality': 2}}
+        first = self.upload(change).json()['results'][0]
+        self.client.force_login(User.objects.create_user('other'))
+        other = self.upload(change).json()['results'][0]
+        self.assertFalse(other['duplicate'])
+        self.assertNotEqual(other['id'], first['id'])
+        self.assertEqual(Mortality.objects.count(), 2)
+
+    def test_upload_is_atomic(self):
+        response = self.upload(
+            {'key': 'a', 'model': 'mortality', 'data': {'mortality': 1}},
+            {'key': 'b', 'model': 'mortality',
+             'data': {'chicks': 'CHK-MISSING'}},
+            {'key': 'c', 'model': 'unknown', 'data': {}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()['errors']), {'1', '2'})
+        self.assertFalse(Mortality.objects.exists())
+
+    def test_sync_view(self):
+        Eggs.objects.create(batchnumber='EGG-1')
+        self.age()
+        models = self.client.get('/api/sync/', {'eggs': ''}).json()['models']
+        self.assertEqual(list(models), ['eggs'])
+        self.assertEqual(models['eggs']['rows'][0]['batchnumber'], 'EGG-1')
+        self.assertEqual(self.client.get('/api/sync/',
+                                         {'eggs': 'x'}).status_code, 400)
+        Eggs.objects.all().delete()
+        self.assertEqual(SyncTombstone.objects.count(), 1)
@@ -0,0 +1,28 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from apps.api import views
+
+router = DefaultRouter()
+router.register('customers', views.CustomerViewSet)
+router.register('eggs', views.EggsViewSet)
+router.register('customer_requests', views.CustomerRequestViewSet)
+router.register('breeds', views.BreedViewSet)
+router.register('breeders', views.BreedersViewSet)
+router.register('hatcheries', views.HatcheryViewSet)
+router.register('incubators', views.IncubatorsViewSet)
+router.register('incubator_capacities', views.IncubatorCapacityViewSet)
+router.register('egg_settings', views.EggSettingViewSet)
+router.register('incubations', views.IncubationViewSet)
+router.register('candlings', views.CandlingViewSet)
+router.register('hatchings', views.HatchingViewSet)
+router.register('holdings', views.HoldingViewSet)
+router.register('chicks', views.ChicksViewSet)
+router.register('mortality', views.MortalityViewSet)
+router.register('chicks_sold', views.ChicksSoldViewSet)
+router.register('chicks_available', views.ChicksAvailableViewSet)
+
+urlpatterns = [
+    path('sync/', views.SyncView.as_view(), name='sync'),
+    path('', include(router.urls)),
+]
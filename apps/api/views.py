@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import conditional_page
+from rest_framework import viewsets
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.api import serializers, sync
+from apps.api.serializers import requested_fields
+from apps.breeders.models import Breed, Breeders
+from apps.chicks.models import Chicks, ChicksAvailable, ChicksSold, Mortality
+from apps.customer.models import Customer, CustomerRequest, Eggs
+from apps.hatchery.models import (Candling, EggSetting, Hatchery, Hatching,
+                                  Holding, Incubation, IncubatorCapacity,
+                                  Incubators)
+
+
+class ApiViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only endpoint of a model. ``select_related`` and
+    ``prefetch_related`` map serializer fields to the relations they read,
+    joined or prefetched only when the field is sent (see ``?fields=``).
+
+    Responses carry an ETag: a request repeating it in If-None-Match gets
+    an empty 304 when nothing changed. They are gzipped for clients
+    accepting it.
+    """
+    select_related = {}
+    prefetch_related = {}
+    # A page's queries do not depend on its length (see apps/monitoring).
+    query_budget = 10
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super(ApiViewSet, cls).as_view(actions, **initkwargs)
+        return gzip_page(conditional_page(view))
+
+    def get_queryset(self):
+        fields = requested_fields(self.request)
+        qs = self.queryset.all()
+        related = [path for name, path in self.select_related.items()
+                   if fields is None or name in fields]
+        if related:
+            qs = qs.select_related(*related)
+        prefetch = [path for name, path in self.prefetch_related.items()
+                    if fields is None or name in fields]
+        if prefetch:
+            qs = qs.prefetch_related(*prefetch)
+        return qs
+
+
+class CustomerViewSet(ApiViewSet):
+    queryset = Customer.objects.all()
+    serializer_class = serializers.CustomerSerializer
+    lookup_field = 'customercode'
+
+
+class EggsViewSet(ApiViewSet):
+    queryset = Eggs.objects.all()
+    serializer_class = serializers.EggsSerializer
+    select_related = {'customer': 'customer'}
+
+
+class CustomerRequestViewSet(ApiViewSet):
+    queryset = CustomerRequest.objects.all()
+    serializer_class = serializers.CustomerRequestSerializer
+
+
+class BreedViewSet(ApiViewSet):
+    queryset = Breed.objects.all()
+    serializer_class = serializers.BreedSerializer
+
+
+class BreedersViewSet(ApiViewSet):
+    queryset = Breeders.objects.all()
+    serializer_class = serializers.BreedersSerializer
+
+
+class HatcheryViewSet(ApiViewSet):
+    queryset = Hatchery.objects.all()
+    serializer_class = serializers.HatcherySerializer
+    lookup_field = 'name'
+    prefetch_related = {'incubators': 'incubators_hatchery'}
+
+
+class IncubatorsViewSet(ApiViewSet):
+    queryset = Incubators.objects.all()
+    serializer_class = serializers.IncubatorsSerializer
+    lookup_field = 'code'
+    select_related = {'hatchery': 'hatchery'}
+
+
+class IncubatorCapacityViewSet(ApiViewSet):
+    queryset = IncubatorCapacity.objects.all()
+    serializer_class = serializers.IncubatorCapacitySerializer
+    select_related = {'incubator': 'incubator'}
+
+
+class EggSettingViewSet(ApiViewSet):
+    queryset = EggSetting.objects.all()
+    serializer_class = serializers.EggSettingSerializer
+    lookup_field = 'settingcode'
+    select_related = {'incubator': 'incubator', 'customer': 'customer'}
+
+
+class IncubationViewSet(ApiViewSet):
+    queryset = Incubation.objects.all()
+    serializer_class = serializers.IncubationSerializer
+    lookup_field = 'incubationcode'
+    select_related = {'eggsetting': 'eggsetting', 'customer': 'customer'}
+
+
+class CandlingViewSet(ApiViewSet):
+    queryset = Candling.objects.all()
+    serializer_class = serializers.CandlingSerializer
+    lookup_field = 'candlingcode'
+    select_related = {'incubation': 'incubation', 'customer': 'customer'}
+
+
+class HatchingViewSet(ApiViewSet):
+    queryset = Hatching.objects.all()
+    serializer_class = serializers.HatchingSerializer
+    lookup_field = 'hatchingcode'
+    select_related = {'candling': 'candling', 'customer': 'customer'}
+
+
+class HoldingViewSet(ApiViewSet):
+    queryset = Holding.objects.all()
+    serializer_class = serializers.HoldingSerializer
+    lookup_field = 'holdingcode'
+    select_related = {'hatching': 'hatching', 'customer': 'customer'}
+
+
+class ChicksViewSet(ApiViewSet):
+    queryset = Chicks.objects.all()
+    serializer_class = serializers.ChicksSerializer
+    lookup_field = 'batchnumber'
+
+
+class MortalityViewSet(ApiViewSet):
+    queryset = Mortality.objects.all()
+    serializer_class = serializers.MortalitySerializer
+    select_related = {'chicks': 'chicks'}
+
+
+class ChicksSoldViewSet(ApiViewSet):
+    queryset = ChicksSold.objects.all()
+    serializer_class = serializers.ChicksSoldSerializer
+    select_related = {'chicks': 'chicks'}
+
+
+class ChicksAvailableViewSet(ApiViewSet):
+    queryset = ChicksAvailable.objects.all()
+    serializer_class = serializers.ChicksAvailableSerializer
+
+
+class SyncView(APIView):
+    """
+    GET ``?eggs=<watermark>&candling=`` returns the changes of the named
+    models since their watermark, an empty one meaning from the start (all
+    models when none is named). POST ``{"changes": [...]}`` uploads a batch
+    of changes, see apps.api.sync.upload().
+    """
+    max_limit = 1000
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return gzip_page(super(SyncView, cls).as_view(**initkwargs))
+
+    def get(self, request):
+        names = [name for name in sync.SYNCED if name in request.query_params]
+        try:
+            limit = min(int(request.query_params.get('limit', 500)),
+                        self.max_limit)
+            return Response({'models': {
+                name: sync.changes(name, request.query_params.get(name),
+                                   limit=max(limit, 1))
+                for name in names or sync.SYNCED}})
+        except ValueError as e:
+            raise ParseError(str(e))
+
+    def post(self, request):
+        try:
+            changes = request.data.get('changes') \
+                if isinstance(request.data, dict) else None
+            results = sync.upload(changes,
+                                  user=request.user)
+        except sync.UploadError as e:
+            return Response({'errors': e.errors}, status=400)
+        return Response({'results': results})
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Synthetic multi-season datasets for the benchmarks.
+
+generate(intakes) writes ``intakes`` egg intakes spread over ``seasons``
+years up to today, busiest in the rain seasons (March to May, October to
+December), each followed through the pipeline:
+
+    Eggs -> EggSetting -> Incubation -> Candling (day 7)
+         -> Hatching (day 21) -> Holding (day 22)
+
+Stages falling after today are left out, so the latest intakes are still
+incubating and hold their incubator slots. About a third of the hatchings
+start a chicks batch, with mortality and sales records. Customers (one per
+ten intakes), breeds, breeder flocks, hatcheries and incubators are shared
+by the intakes.
+
+Instances come from the factories' build() and are bulk inserted
+batch_size intakes at a time with explicit ids, codes and timestamps, the
+way a migration of years of records would arrive. The hatch ledger, the
+search index and the dashboard rollups are rebuilt at the end.
+"""
+import contextlib
+import datetime
+import itertools
+
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.utils import timezone
+from factory.random import randgen, reseed_random
+
+from apps.benchmarks import factories
+from apps.breeders.models import Breed, Breeders
+from apps.chicks.models import Chicks, ChicksAvailable, ChicksSold, Mortality
+from apps.core.codes import format_code, last_number
+from apps.core.derived import compute_derived
+from apps.customer.models import Customer, Eggs
+from apps.dashboard.models import DailyRollup
+from apps.delivery.models import delivery_cost
+from apps.hatchery.models import (Candling, EggSetting, HatchCycle, Hatchery,
+                                  Hatching, Holding, Incubation,
+                                  IncubatorCapacity, Incubators)
+from apps.search import index
+
+SCALES = {'10k': 10000, '100k': 100000, '1m': 1000000}
+
+# Relative intake volume of each month, January first.
+MONTH_WEIGHTS = (4, 5, 9, 10, 8, 5, 4, 4, 6, 8, 9, 7)
+
+CANDLING_DAY = 7
+HATCHING_DAY = 21
+HOLDING_DAY = 22
+
+MODELS = (Breed, Breeders, Hatchery, Incubators, IncubatorCapacity, Customer,
+          Eggs, EggSetting, Incubation, Candling, Hatching, Holding, Chicks,
+          Mortality, ChicksSold, ChicksAvailable)
+
+
+def parse_scale(value):
+    """
+    Number of intakes of a scale: 10k, 100k, 1m or a plain number.
+    """
+    value = str(value).lower()
+    if value in SCALES:
+        return SCALES[value]
+    number = int(value)
+    if number <= 0:
+        raise ValueError('The scale must be positive.')
+    return number
+
+
+@contextlib.contextmanager
+def frozen_timestamps(*model_classes):
+    """
+    Let bulk_create() keep the given created and updated values:
+    auto_now_add and auto_now would overwrite them with the current time.
+    """
+    fields = [(field, field.auto_now, field.auto_now_add)
+              for model in model_classes for field in model._meta.fields
+              if isinstance(field, models.DateTimeField) and
+              (field.auto_now or field.auto_now_add)]
+    for field, _, _ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Ids(object):
+    """
+    The next ids and codes of the models, read once from the database.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.codes = {}
+
+    def id(self, model):
+        if model not in self.ids:
+            last = model._default_manager.aggregate(
+                last=models.Max('id'))['last']
+            self.ids[model] = itertools.count((last or 0) + 1)
+        return next(self.ids[model])
+
+    def code(self, model, field, prefix):
+        key = (model, field, prefix)
+        if key not in self.codes:
+            self.codes[key] = itertools.count(
+                last_number(model, field, prefix) + 1)
+        return format_code(prefix, next(self.codes[key]))
+
+
+def intake_dates(count, seasons, today):
+    """
+    ``count`` sorted datetimes of the last ``seasons`` years, weighted by
+    MONTH_WEIGHTS.
+    """
+    start = today - datetime.timedelta(days=365 * seasons)
+    days = [start + datetime.timedelta(days=n)
+            for n in range((today - start).days + 1)]
+    weights = [MONTH_WEIGHTS[day.month - 1] for day in days]
+    tz = timezone.get_current_timezone()
+    dates = []
+    for day in randgen.choices(days, weights, k=count):
+        dates.append(timezone.make_aware(datetime.datetime.combine(
+            day, datetime.time(randgen.randint(7, 17),
+                               randgen.randint(0, 59))), tz))
+    return sorted(dates)
+
+
+def _stamp(instance, created):
+    instance.created = created
+    if hasattr(instance, 'updated'):
+        instance.updated = created
+    return instance
+
+
+class Generator(object):
+
+    def __init__(self, intakes, seasons=3, batch_size=5000, now=None,
+                 log=None):
+        self.intakes = intakes
+        self.seasons = seasons
+        self.batch_size = batch_size
+        self.now = now or timezone.now()
+        self.log = log or (lambda message: None)
+        self.ids = Ids()
+        self.counts = dict.fromkeys(MODELS, 0)
+
+    def insert(self, model, instances):
+        if instances:
+            model._default_manager.bulk_create(instances,
+                                               batch_size=self.batch_size)
+            self.counts[model] += len(instances)
+
+    def new(self, factory, created, **kwargs):
+        # Relations given by id: the factory must not build them.
+        ids = {name: kwargs.pop(name) for name in list(kwargs)
+               if name.endswith('_id')}
+        kwargs.update((name[:-3], None) for name in ids)
+        instance = factory.build(id=self.ids.id(factory._meta.model),
+                                 **kwargs)
+        for name, value in ids.items():
+            setattr(instance, name, value)
+        if hasattr(instance, 'DERIVED'):
+            compute_derived(instance)
+        return _stamp(instance, created)
+
+    def run(self):
+        start = self.now - datetime.timedelta(days=365 * self.seasons)
+        with frozen_timestamps(*MODELS):
+            with transaction.atomic():
+                self.reference_data(start - datetime.timedelta(days=30))
+                self.customers(start - datetime.timedelta(days=30))
+            dates = intake_dates(self.intakes, self.seasons,
+                                 timezone.localdate(self.now))
+            for offset in range(0, self.intakes, self.batch_size):
+                with transaction.atomic():
+                    self.pipeline(dates[offset:offset + self.batch_size])
+                self.log('{} of {} intakes'.format(
+                    min(offset + self.batch_size, self.intakes),
+                    self.intakes))
+        self.finish()
+        return self.counts
+
+    def reference_data(self, created):
+        self.breeds = [self.new(factories.BreedFactory, created)
+                       for _ in factories.BREEDS]
+        self.insert(Breed, self.breeds)
+        self.flocks = {}
+        for breed in self.breeds:
+            self.flocks[breed.id] = [
+                self.new(factories.BreedersFactory, created, breed=breed)
+                for _ in range(4)]
+            self.insert(Breeders, self.flocks[breed.id])
+
+        hatcheries = [self.new(factories.HatcheryFactory, created)
+                      for _ in range(3)]
+        for hatchery in hatcheries:
+            # The names are unique, the factory's sequence restarts at 1.
+            hatchery.name = 'Hatchery {}'.format(hatchery.id)
+        self.insert(Hatchery, hatcheries)
+        self.incubators = [
+            self.new(factories.IncubatorsFactory, created, hatchery=hatchery,
+                     code=self.ids.code(Incubators, 'code', 'INC'))
+            for hatchery in hatcheries for _ in range(8)]
+        self.insert(Incubators, self.incubators)
+        # Room for every batch still incubating.
+        size = max(50000, self.intakes * 40)
+        self.capacities = {}
+        for incubator in self.incubators:
+            self.capacities[incubator.id] = self.new(
+                factories.IncubatorCapacityFactory, created,
+                incubator=incubator, capacity=size, occupied=0)
+        self.insert(IncubatorCapacity, list(self.capacities.values()))
+
+    def customers(self, created):
+        self.customer_ids = []
+        count = max(1, self.intakes // 10)
+        for offset in range(0, count, self.batch_size):
+            batch = [
+                self.new(factories.CustomerFactory, created,
+                         customercode=self.ids.code(Customer, 'customercode',
+                                                    'CUS'))
+                for _ in range(min(self.batch_size, count - offset))]
+            self.insert(Customer, batch)
+            self.customer_ids.extend((customer.id, customer.customercode)
+                                     for customer in batch)
+
+    def pipeline(self, dates):
+        rows = {model: [] for model in MODELS}
+        day = datetime.timedelta(days=1)
+        for created in dates:
+            created = min(created, self.now)
+            customer_id, customercode = randgen.choice(self.customer_ids)
+            breed = randgen.choice(self.breeds)
+            flock = randgen.choice(self.flocks[breed.id])
+            incubator = randgen.choice(self.incubators)
+            people = {'customer_id': customer_id, 'breeders': flock}
+
+            eggs = self.new(factories.EggsFactory, created,
+                            customer_id=customer_id, breed=breed,
+                            customercode=customercode)
+            rows[Eggs].append(eggs)
+            setting = self.new(
+                factories.EggSettingFactory, created + day,
+                incubator=incubator, eggs=eggs.received, reserved=0,
+                capacity=self.capacities[incubator.id],
+                settingcode=self.ids.code(EggSetting, 'settingcode', 'SET'),
+                **people)
+            rows[EggSetting].append(setting)
+            incubation = self.new(
+                factories.IncubationFactory, created + day,
+                eggsetting=setting, eggs=setting.eggs,
+                incubationcode=self.ids.code(Incubation, 'incubationcode',
+                                             'INB'),
+                **people)
+            rows[Incubation].append(incubation)
+
+            candled = created + day * CANDLING_DAY
+            if candled > self.now:
+                setting.reserved = setting.eggs
+                continue
+            candling = self.new(
+                factories.CandlingFactory, candled, incubation=incubation,
+                eggs=incubation.eggs, candled_date=candled,
+                candlingcode=self.ids.code(Candling, 'candlingcode', 'CAN'),
+                **people)
+            rows[Candling].append(candling)
+
+            hatched = created + day * HATCHING_DAY
+            if hatched > self.now:
+                setting.reserved = setting.eggs
+                continue
+            hatching = self.new(
+                factories.HatchingFactory, hatched, candling=candling,
+                hatchingcode=self.ids.code(Hatching, 'hatchingcode', 'HAT'),
+                **people)
+            rows[Hatching].append(hatching)
+
+            held = created + day * HOLDING_DAY
+            if held <= self.now:
+                holding = self.new(
+                    factories.HoldingFactory, held, hatching=hatching,
+                    holdingcode=self.ids.code(Holding, 'holdingcode', 'HOL'),
+                    **people)
+                holding.cost = delivery_cost(holding.distance)
+                rows[Holding].append(holding)
+
+            if hatching.chicks_hatched > 0 and randgen.random() < 0.3:
+                self.chicks(rows, hatching, breed, held)
+
+        for model in (Eggs, EggSetting, Incubation, Candling, Hatching,
+                      Holding, Chicks, Mortality, ChicksSold,
+                      ChicksAvailable):
+            self.insert(model, rows[model])
+
+    def chicks(self, rows, hatching, breed, created):
+        batch = self.new(
+            factories.ChicksFactory, created, breed=breed, source='Hatchery',
+            age=timezone.localdate(created), number=hatching.chicks_hatched,
+            batchnumber=self.ids.code(Chicks, 'batchnumber', 'CHK'))
+        rows[Chicks].append(batch)
+        for weeks in range(randgen.randint(0, 2)):
+            when = created + datetime.timedelta(weeks=weeks + 1)
+            if when <= self.now:
+                rows[Mortality].append(self.new(
+                    factories.MortalityFactory, when, chicks=batch))
+        for weeks in range(randgen.randint(1, 3)):
+            when = created + datetime.timedelta(weeks=weeks + 2)
+            if when <= self.now:
+                rows[ChicksSold].append(self.new(
+                    factories.ChicksSoldFactory, when, chicks=batch))
+        if randgen.random() < 0.2:
+            rows[ChicksAvailable].append(self.new(
+                factories.ChicksAvailableFactory, created, breed=breed,
+                batchnumber=batch.batchnumber, age=batch.age,
+                number=batch.number // 2))
+
+    def finish(self):
+        # The slots held by the batches still incubating.
+        occupied = EggSetting.objects.filter(reserved__gt=0)\
+            .values('capacity_id').order_by()\
+            .annotate(total=models.Sum('reserved'))
+        for row in occupied:
+            IncubatorCapacity.objects.filter(pk=row['capacity_id']).update(
+                occupied=row['total'],
+                available=models.F('capacity') - row['total'])
+
+        # Explicit ids leave the PostgreSQL sequences behind.
+        statements = connection.ops.sequence_reset_sql(no_style(), MODELS)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+        self.log('Rebuilding the hatch ledger')
+        HatchCycle.objects.rebuild()
+        self.log('Rebuilding the search index')
+        index.rebuild()
+        self.log('Refreshing the dashboard')
+        DailyRollup.objects.refresh(
+            start=timezone.localdate(self.now) -
+            datetime.timedelta(days=365 * self.seasons + 30))
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for model in MODELS:
+                    cursor.execute('ANALYZE %s' % connection.ops.quote_name(
+                        model._meta.db_table))
+
+
+def generate(intakes, seasons=3, seed=None, batch_size=5000, now=None,
+             log=None):
+    """
+    Write a dataset of ``intakes`` egg intakes. Returns the number of rows
+    written per model.
+    """
+    if seed is not None:
+        reseed_random(seed)
+    return Generator(intakes, seasons, batch_size, now, log).run()
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Factories of the customer, breeders, hatchery and chicks models.
+
+create() goes through the models' save(), codes and side effects included,
+and builds the records a factory depends on: HoldingFactory() makes a whole
+intake, setting, incubation, candling and hatching chain. The dataset
+generator (dataset.py) only uses build() and bulk inserts the instances.
+
+Random values come from factory.random, seeded with reseed_random().
+"""
+import datetime
+
+from django.utils import timezone
+import factory
+from factory import fuzzy
+from factory.random import randgen
+
+from apps.breeders.models import Breed, Breeders
+from apps.chicks.models import Chicks, ChicksAvailable, ChicksSold, Mortality
+from apps.customer.models import Customer, CustomerRequest, Eggs
+from apps.hatchery.models import (Candling, EggSetting, Hatchery, Hatching,
+                                  Holding, Incubation, IncubatorCapacity,
+                                  Incubators)
+
+BREEDS = (
+    ('Chicken', 'Kuroiler', 'Dual purpose', 180, 3.5),
+    ('Chicken', 'Kienyeji', 'Dual purpose', 100, 2.0),
+    ('Chicken', 'Rainbow Rooster', 'Dual purpose', 160, 3.8),
+    ('Chicken', 'Sasso', 'Dual purpose', 200, 3.0),
+    ('Chicken', 'Isa Brown', 'Eggs', 300, 2.0),
+    ('Chicken', 'Cobb 500', 'Meat', 80, 4.5),
+    ('Duck', 'Muscovy', 'Meat', 90, 4.0),
+    ('Duck', 'Pekin', 'Meat', 150, 3.6),
+    ('Turkey', 'Broad Breasted White', 'Meat', 90, 12.0),
+    ('Guinea fowl', 'Pearl', 'Dual purpose', 100, 1.6),
+    ('Quail', 'Japanese', 'Eggs', 280, 0.15),
+    ('Goose', 'Embden', 'Meat', 40, 9.0),
+)
+CUSTOMER_TYPES = ('Farmer', 'Farmer', 'Farmer', 'Trader', 'Cooperative')
+INCUBATOR_TYPES = ('Forced air', 'Still air', 'Cabinet', 'Hatcher')
+MANUFACTURERS = ('Brinsea', 'Petersime', 'Chick Master', 'Janoel', 'Octagon')
+DELIVERY_MODES = ('Pickup', 'Motorbike', 'Van', 'Bus parcel')
+MORTALITY_REASONS = ('Coccidiosis', 'Newcastle disease', 'Gumboro',
+                     'Cold stress', 'Predators', 'Unknown')
+
+
+def _days_before(date, low, high):
+    return date - datetime.timedelta(days=randgen.randint(low, high))
+
+
+class BreedFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Breed
+
+    code = factory.Sequence(lambda n: 'BRD-{:03d}'.format(n))
+    poultry_type = factory.Sequence(lambda n: BREEDS[n % len(BREEDS)][0])
+    breed = factory.Sequence(lambda n: BREEDS[n % len(BREEDS)][1] + (
+        ' {}'.format(n // len(BREEDS) + 1) if n >= len(BREEDS) else ''))
+    purpose = factory.Sequence(lambda n: BREEDS[n % len(BREEDS)][2])
+    eggs_year = factory.Sequence(lambda n: BREEDS[n % len(BREEDS)][3])
+    adult_weight = factory.Sequence(lambda n: BREEDS[n % len(BREEDS)][4])
+    description = factory.Faker('sentence', nb_words=12)
+
+
+class BreedersFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Breeders
+
+    batch = factory.Sequence(lambda n: 'FLK-{:05d}'.format(n))
+    breed = factory.SubFactory(BreedFactory)
+    hens = fuzzy.FuzzyInteger(50, 2000)
+    cocks = factory.LazyAttribute(lambda o: max(1, o.hens // 10))
+    mortality = factory.LazyAttribute(
+        lambda o: randgen.randint(0, o.hens // 20))
+    butchered = factory.LazyAttribute(
+        lambda o: randgen.randint(0, o.hens // 20))
+    sold = factory.LazyAttribute(lambda o: randgen.randint(0, o.hens // 10))
+
+
+class CustomerFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Customer
+
+    first_name = factory.Faker('first_name')
+    last_name = factory.Faker('last_name')
+    email = factory.LazyAttributeSequence(
+        lambda o, n: '{}.{}{}@example.com'.format(
+            o.first_name, o.last_name, n).lower()[:50])
+    phone = factory.Faker('numerify', text='+2547########')
+    address = factory.Faker('street_address')
+    latitude = fuzzy.FuzzyFloat(-1.5, 0.5)
+    longitude = fuzzy.FuzzyFloat(36.0, 37.5)
+    customertype = fuzzy.FuzzyChoice(CUSTOMER_TYPES)
+    notification_sms = factory.LazyFunction(lambda: randgen.random() < 0.7)
+    delivery = factory.LazyFunction(lambda: randgen.random() < 0.4)
+    followup = factory.LazyFunction(lambda: randgen.random() < 0.1)
+
+
+class EggsFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Eggs
+
+    batchnumber = factory.Sequence(lambda n: 'EGG-{:08d}'.format(n))
+    customer = factory.SubFactory(CustomerFactory)
+    breed = factory.SubFactory(BreedFactory)
+    customercode = factory.SelfAttribute('customer.customercode')
+    brought = fuzzy.FuzzyInteger(30, 600)
+    returned = factory.LazyAttribute(
+        lambda o: randgen.randint(0, o.brought // 20))
+
+
+class CustomerRequestFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = CustomerRequest
+
+    requestcode = factory.Sequence(lambda n: 'REQ-{:08d}'.format(n))
+    eggs = factory.SubFactory(EggsFactory)
+
+
+class HatcheryFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Hatchery
+
+    name = factory.Sequence(lambda n: 'Hatchery {}'.format(n + 1))
+    email = factory.Sequence(lambda n: 'hatchery{}@example.com'.format(n + 1))
+    phone = factory.Faker('numerify', text='+2547########')
+    address = factory.Faker('street_address')
+    latitude = fuzzy.FuzzyFloat(-1.5, 0.5)
+    longitude = fuzzy.FuzzyFloat(36.0, 37.5)
+    totalcapacity = fuzzy.FuzzyChoice((20000, 50000, 100000))
+
+
+class IncubatorsFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Incubators
+
+    hatchery = factory.SubFactory(HatcheryFactory)
+    incubatortype = fuzzy.FuzzyChoice(INCUBATOR_TYPES)
+    manufacturer = fuzzy.FuzzyChoice(MANUFACTURERS)
+    model = factory.Sequence(lambda n: 'M-{}'.format(100 + n % 900))
+    year = fuzzy.FuzzyChoice(('2014', '2016', '2018', '2019', '2020'))
+
+
+class IncubatorCapacityFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = IncubatorCapacity
+
+    incubator = factory.SubFactory(IncubatorsFactory)
+    breed = fuzzy.FuzzyChoice([breed[1] for breed in BREEDS])
+    capacity = 5000
+    occupied = 0
+
+
+class EggSettingFactory(factory.DjangoModelFactory):
+    """
+    A setting on a new incubator with a capacity row that has room for it.
+    """
+    class Meta:
+        model = EggSetting
+
+    incubator = factory.SubFactory(IncubatorsFactory)
+    customer = factory.SubFactory(CustomerFactory)
+    breeders = factory.SubFactory(BreedersFactory)
+    eggs = fuzzy.FuzzyInteger(30, 500)
+    capacity = factory.SubFactory(
+        IncubatorCapacityFactory, incubator=factory.SelfAttribute('..incubator'))
+
+
+class IncubationFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Incubation
+
+    eggsetting = factory.SubFactory(EggSettingFactory)
+    customer = factory.SelfAttribute('eggsetting.customer')
+    breeders = factory.SelfAttribute('eggsetting.breeders')
+    eggs = factory.SelfAttribute('eggsetting.eggs')
+
+
+class CandlingFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Candling
+
+    incubation = factory.SubFactory(IncubationFactory)
+    customer = factory.SelfAttribute('incubation.customer')
+    breeders = factory.SelfAttribute('incubation.breeders')
+    eggs = factory.SelfAttribute('incubation.eggs')
+    candled = True
+    candled_date = factory.LazyFunction(timezone.now)
+    spoilt_eggs = factory.LazyAttribute(
+        lambda o: int(o.eggs * randgen.uniform(0.03, 0.2)))
+
+
+class HatchingFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Hatching
+
+    candling = factory.SubFactory(CandlingFactory)
+    customer = factory.SelfAttribute('candling.customer')
+    breeders = factory.SelfAttribute('candling.breeders')
+    hatched = factory.LazyAttribute(
+        lambda o: int((o.candling.eggs - o.candling.spoilt_eggs) *
+                      randgen.uniform(0.75, 0.95)))
+    deformed = factory.LazyAttribute(
+        lambda o: int(o.hatched * randgen.uniform(0, 0.03)))
+    spoilt = factory.LazyAttribute(
+        lambda o: o.candling.eggs - o.candling.spoilt_eggs - o.hatched)
+    notify_customer = False
+
+
+class HoldingFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Holding
+
+    hatching = factory.SubFactory(HatchingFactory)
+    customer = factory.SelfAttribute('hatching.customer')
+    breeders = factory.SelfAttribute('hatching.breeders')
+    customer_delivery = factory.LazyFunction(lambda: randgen.random() < 0.4)
+    mode_delivery = fuzzy.FuzzyChoice(DELIVERY_MODES)
+    distance = factory.LazyFunction(
+        lambda: round(randgen.uniform(1, 80), 1))
+
+
+class ChicksFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Chicks
+
+    breed = factory.SubFactory(BreedFactory)
+    source = fuzzy.FuzzyChoice(('Hatchery', 'Hatchery', 'Purchased'))
+    age = factory.LazyFunction(lambda: _days_before(timezone.localdate(),
+                                                    0, 30))
+    number = fuzzy.FuzzyInteger(50, 1000)
+    description = factory.Faker('sentence', nb_words=8)
+
+
+class MortalityFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Mortality
+
+    chicks = factory.SubFactory(ChicksFactory)
+    batchnumber = factory.SelfAttribute('chicks.batchnumber')
+    mortalitynumber = factory.Sequence(lambda n: 'MOR-{:08d}'.format(n))
+    age = factory.SelfAttribute('chicks.age')
+    number = factory.SelfAttribute('chicks.number')
+    mortality = factory.LazyAttribute(
+        lambda o: randgen.randint(0, max(1, o.number // 25)))
+    reason = fuzzy.FuzzyChoice(MORTALITY_REASONS)
+    notify_vet = factory.LazyAttribute(lambda o: o.mortality > o.number // 50)
+
+
+class ChicksSoldFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = ChicksSold
+
+    chicks = factory.SubFactory(ChicksFactory)
+    batchnumber = factory.SelfAttribute('chicks.batchnumber')
+    salesnumber = factory.Sequence(lambda n: 'SAL-{:08d}'.format(n))
+    customer_type = fuzzy.FuzzyChoice(CUSTOMER_TYPES)
+    age = factory.SelfAttribute('chicks.age')
+    number = factory.LazyAttribute(
+        lambda o: randgen.randint(1, max(1, o.chicks.number // 3)))
+    price = fuzzy.FuzzyChoice((80.0, 100.0, 120.0, 150.0))
+
+
+class ChicksAvailableFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = ChicksAvailable
+
+    batchnumber = factory.Sequence(lambda n: 'AVL-{:08d}'.format(n))
+    breed = factory.SubFactory(BreedFactory)
+    age = factory.LazyFunction(lambda: _days_before(timezone.localdate(),
+                                                    0, 30))
+    number = fuzzy.FuzzyInteger(0, 500)
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.benchmarks import dataset
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with a synthetic multi-season dataset of the ' \
+           'customer, breeders, hatchery and chicks models for the ' \
+           'benchmarks. Meant for a scratch database: the rows are added ' \
+           'to the existing ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', default='10k',
+            help='Number of egg intakes: 10k, 100k, 1m or a number '
+                 '(default: 10k). The other tables grow with it.')
+        parser.add_argument(
+            '--seasons', type=int, default=3,
+            help='Number of yearly seasons the intakes are spread over.')
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed, the same seed gives the same dataset.')
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of intakes written per transaction.')
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false',
+            dest='interactive', help='Do not ask for confirmation.')
+
+    def handle(self, *args, **options):
+        try:
+            intakes = dataset.parse_scale(options['scale'])
+        except ValueError as e:
+            raise CommandError(e)
+        if options['interactive']:
+            answer = input('This adds %s egg intakes and their records to '
+                           'the database. Type "yes" to continue: ' % intakes)
+            if answer != 'yes':
+                raise CommandError('Cancelled.')
+
+        counts = dataset.generate(
+            intakes, seasons=options['seasons'], seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=lambda message: self.stdout.write(message + '\n'))
+        for model, count in counts.items():
+            self.stdout.write('%-30s %10s\n' % (model._meta.label, count))
@@ -0,0 +1,73 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.benchmarks import scenarios
+
+
+class Command(BaseCommand):
+    help = 'Time the pipeline scenarios (intake, candling, hatching, ' \
+           'dashboards, admin lists, ...) on the current database and ' \
+           'write the results as JSON. Writes are rolled back. Generate a ' \
+           'dataset with generate_dataset first.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenarios', nargs='*',
+            help='Scenarios to run (default: all): %s.' % ', '.join(
+                sorted(scenarios.SCENARIOS)))
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Number of timed runs per scenario.')
+        parser.add_argument(
+            '--warmup', type=int, default=2,
+            help='Number of untimed runs first, to warm the caches.')
+        parser.add_argument(
+            '--label', default='',
+            help='Stored in the results, e.g. the release or commit.')
+        parser.add_argument(
+            '--output', help='Write the results to this JSON file.')
+        parser.add_argument(
+            '--compare', metavar='BASELINE',
+            help='Compare the medians with the results in this JSON file.')
+        parser.add_argument(
+            '--threshold', type=float, default=20,
+            help='Percent growth of a median reported as a regression.')
+        parser.add_argument(
+            '--fail-on-regression', action='store_true',
+            help='Exit with an error when a scenario regressed.')
+
+    def handle(self, *args, **options):
+        try:
+            results = scenarios.run(options['scenarios'],
+                                    repeat=options['repeat'],
+                                    warmup=options['warmup'],
+                                    label=options['label'])
+        except (KeyError, LookupError) as e:
+            raise CommandError(e.args[0])
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+
+        self.stdout.write('%-28s %10s %10s %8s\n' % (
+            'scenario', 'median ms', 'p95 ms', 'queries'))
+        for name, result in sorted(results['scenarios'].items()):
+            self.stdout.write('%-28s %10.1f %10.1f %8d\n' % (
+                name, result['median_ms'], result['p95_ms'],
+                result['queries']))
+
+        if not options['compare']:
+            return
+        with open(options['compare']) as baseline:
+            rows = scenarios.compare(json.load(baseline), results,
+                                     options['threshold'] / 100)
+        self.stdout.write('\n%-28s %10s %10s %8s\n' % (
+            'scenario', 'before ms', 'after ms', 'change'))
+        for name, before, after, change, regressed in rows:
+            self.stdout.write('%-28s %10.1f %10.1f %+7.0f%%%s\n' % (
+                name, before, after, change * 100,
+                '  REGRESSED' if regressed else ''))
+        regressions = [row[0] for row in rows if row[4]]
+        if regressions and options['fail_on_regression']:
+            raise CommandError('Regressed: %s.' % ', '.join(regressions))
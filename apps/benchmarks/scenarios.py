@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Timed scenarios of the hatchery pipeline, run on the current database.
+
+Each scenario is one operation as a clerk or a client would perform it -
+through the models' save() for the writes, through the test client for the
+pages - on records picked at random. run() times ``repeat`` runs of each
+after ``warmup`` untimed ones and reports the median, 95th percentile and
+extremes in milliseconds with the SQL query count. Writes are rolled back
+after every run, and the whole run in the end, so the dataset is left as
+it was and every release is measured on the same data.
+
+Results are plain dicts, written as JSON by the run_benchmarks command and
+compared with compare().
+"""
+import platform
+import statistics
+import time
+
+import django
+from django.contrib.auth.models import User
+from django.db import connection, models, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from factory.random import randgen
+
+from apps.benchmarks import dataset
+from apps.core.paginator import approximate_count
+from apps.customer.models import Customer, Eggs
+from apps.hatchery.models import (Candling, EggSetting, Hatching, Incubation,
+                                  IncubatorCapacity)
+
+# name: (function, writes)
+SCENARIOS = {}
+
+
+def scenario(name, writes=False):
+    def register(func):
+        SCENARIOS[name] = (func, writes)
+        return func
+    return register
+
+
+class Rollback(Exception):
+    pass
+
+
+class Bench(object):
+    """
+    What the scenarios share: a logged in superuser's client and random
+    picks among the existing rows.
+    """
+
+    def __init__(self):
+        self.user = User.objects.create_superuser(
+            'benchmark-{}'.format(time.time_ns()), 'benchmark@example.com',
+            None)
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.ranges = {}
+
+    def pick(self, model, **filters):
+        """
+        A random row, found with an index seek from a random id.
+        """
+        if model not in self.ranges:
+            self.ranges[model] = model._default_manager.aggregate(
+                low=models.Min('id'), high=models.Max('id'))
+        low, high = self.ranges[model]['low'], self.ranges[model]['high']
+        if low is None:
+            raise LookupError('No {} to benchmark, generate a dataset '
+                              'first.'.format(model._meta.verbose_name))
+        qs = model._default_manager.filter(**filters).order_by('id')
+        return qs.filter(id__gte=randgen.randint(low, high)).first() or \
+            qs.first()
+
+    def get(self, url, data=None):
+        response = self.client.get(url, data)
+        if response.status_code != 200:
+            raise AssertionError('GET {} answered {}.'.format(
+                url, response.status_code))
+        return response
+
+
+@scenario('intake', writes=True)
+def intake(bench):
+    customer = bench.pick(Customer)
+    eggs = Eggs.objects.create(
+        customer=customer, customercode=customer.customercode,
+        breed_id=bench.pick(Eggs).breed_id, brought=200, returned=6)
+    capacity = bench.pick(IncubatorCapacity, available__gte=eggs.received)
+    EggSetting.objects.create(customer=customer, incubator=capacity.incubator,
+                              eggs=eggs.received)
+
+
+@scenario('candling', writes=True)
+def candling(bench):
+    incubation = bench.pick(Incubation)
+    Candling.objects.create(
+        incubation=incubation, customer_id=incubation.customer_id,
+        breeders_id=incubation.breeders_id, eggs=incubation.eggs or 0,
+        candled=True, candled_date=timezone.now(),
+        spoilt_eggs=(incubation.eggs or 0) // 10)
+
+
+@scenario('hatching', writes=True)
+def hatching(bench):
+    candling = bench.pick(Candling)
+    Hatching.objects.create(
+        candling=candling, customer_id=candling.customer_id,
+        breeders_id=candling.breeders_id,
+        hatched=(candling.fertile_eggs or 0) * 9 // 10, deformed=1, spoilt=0)
+
+
+@scenario('dashboard')
+def dashboard(bench):
+    bench.get(reverse('dashboard'))
+
+
+@scenario('breed_analytics')
+def breed_analytics(bench):
+    bench.get(reverse('analytics_breed_list'))
+
+
+@scenario('admin_eggsetting_list')
+def admin_eggsetting_list(bench):
+    bench.get(reverse('admin:hatchery_eggsetting_changelist'))
+
+
+@scenario('admin_candling_list')
+def admin_candling_list(bench):
+    bench.get(reverse('admin:hatchery_candling_changelist'))
+
+
+@scenario('admin_chicks_list')
+def admin_chicks_list(bench):
+    bench.get(reverse('admin:chicks_chicks_changelist'))
+
+
+@scenario('admin_customer_search')
+def admin_customer_search(bench):
+    customer = bench.pick(Customer)
+    bench.get(reverse('admin:customer_customer_changelist'),
+              {'q': customer.last_name})
+
+
+@scenario('admin_customercode_filter')
+def admin_customercode_filter(bench):
+    customer = bench.pick(Customer)
+    bench.get(reverse('admin:hatchery_hatching_changelist'),
+              {'customercode': customer.customercode})
+
+
+@scenario('eggs_records')
+def eggs_records(bench):
+    bench.get(reverse('eggs_records'), {
+        'draw': 1, 'start': 0, 'length': 50, 'order[0][column]': 0,
+        'order[0][dir]': 'desc', 'columns[0][data]': 'batchnumber'})
+
+
+@scenario('api_hatchings')
+def api_hatchings(bench):
+    bench.get(reverse('hatching-list'))
+
+
+def summarize(timings, queries):
+    timings = sorted(timings)
+    return {
+        'repeat': len(timings),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1,
+                                    int(len(timings) * 0.95))], 3),
+        'min_ms': round(timings[0], 3),
+        'max_ms': round(timings[-1], 3),
+        'queries': int(statistics.median(queries)),
+    }
+
+
+def measure(bench, func, writes, repeat, warmup):
+    timings, queries = [], []
+    for run in range(warmup + repeat):
+        try:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    func(bench)
+                    elapsed = (time.perf_counter() - started) * 1000
+                if writes:
+                    raise Rollback
+        except Rollback:
+            pass
+        if run >= warmup:
+            timings.append(elapsed)
+            queries.append(len(captured))
+    return summarize(timings, queries)
+
+
+def run(names=None, repeat=5, warmup=1, label='', seed=0):
+    """
+    Run the scenarios (all by default). Returns the results.
+    """
+    names = names or sorted(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise KeyError('Unknown scenario(s): {}.'.format(
+            ', '.join(sorted(unknown))))
+
+    randgen.seed(seed)
+    results = {
+        'label': label,
+        'created': timezone.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+        },
+        'rows': {model._meta.label: approximate_count(
+            model._default_manager.all()) for model in dataset.MODELS},
+        'scenarios': {},
+    }
+    try:
+        with transaction.atomic():
+            bench = Bench()
+            for name in names:
+                func, writes = SCENARIOS[name]
+                results['scenarios'][name] = measure(bench, func, writes,
+                                                     repeat, warmup)
+            raise Rollback
+    except Rollback:
+        pass
+    return results
+
+
+def compare(baseline, results, threshold=0.2):
+    """
+    (name, baseline median, median, relative change, regressed) of the
+    scenarios in both results. A scenario regressed when its median grew
+    by more than ``threshold``.
+    """
+    rows = []
+    for name, current in sorted(results['scenarios'].items()):
+        before = baseline.get('scenarios', {}).get(name)
+        if before is None:
+            continue
+        change = (current['median_ms'] - before['median_ms']) / \
+            max(before['median_ms'], 1e-6)
+        rows.append((name, before['median_ms'], current['median_ms'], change,
+                     change > threshold))
+    return rows
@@ -0,0 +1,139 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.db.models import F, Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.benchmarks import dataset, factories, scenarios
+from apps.chicks.models import Chicks, ChicksSold
+from apps.core.codes import parse_code
+from apps.customer.models import Customer, Eggs
+from apps.dashboard.models import DailyRollup
+from apps.hatchery.models import (Candling, EggSetting, HatchCycle, Hatching,
+                                  Holding, IncubatorCapacity)
+from apps.search.backends import get_backend
+
+
+class FactoryTest(TestCase):
+
+    def test_holding_chain(self):
+        holding = factories.HoldingFactory()
+        setting = holding.hatching.candling.incubation.eggsetting
+        setting.refresh_from_db()
+        self.assertTrue(holding.holdingcode.startswith('HOL-'))
+        self.assertEqual(holding.customer, setting.customer)
+        self.assertIsNotNone(holding.cost)
+        # Reserved when set, given back when hatched.
+        self.assertIsNotNone(setting.capacity_id)
+        self.assertEqual(setting.reserved, 0)
+        cycle = HatchCycle.objects.get(eggsetting_id=setting.id)
+        self.assertEqual(cycle.chicks_hatched, holding.hatching.chicks_hatched)
+        self.assertIsNotNone(cycle.held_at)
+
+    def test_chicks_records(self):
+        sale = factories.ChicksSoldFactory()
+        self.assertEqual(sale.batchnumber, sale.chicks.batchnumber)
+        self.assertEqual(sale.sales, sale.price * sale.number)
+        self.assertTrue(factories.MortalityFactory().chicks.batchnumber
+                        .startswith('CHK-'))
+
+
+class DatasetTest(TestCase):
+
+    def test_generate(self):
+        # The rebuilt index outlives the test's transaction in memory.
+        self.addCleanup(get_backend().reset)
+        factories.EggSettingFactory()
+        counts = dataset.generate(300, seasons=2, seed=1, batch_size=120)
+        self.assertEqual(counts[Eggs], 300)
+        self.assertEqual(counts[Customer], 30)
+        self.assertEqual(Eggs.objects.count(), 300)
+        self.assertEqual(EggSetting.objects.count(), 301)
+        self.assertGreater(counts[Candling], 250)
+        self.assertGreaterEqual(counts[Candling], counts[Hatching])
+        self.assertGreaterEqual(counts[Hatching], counts[Holding])
+        self.assertGreater(counts[Chicks], 0)
+        self.assertEqual(ChicksSold.objects.count(), counts[ChicksSold])
+
+        # Consecutive codes after the existing ones, derived fields set.
+        numbers = sorted(parse_code('SET', code) for code in
+                         EggSetting.objects.values_list('settingcode',
+                                                        flat=True))
+        self.assertEqual(numbers, list(range(1, 302)))
+        self.assertFalse(Candling.objects.exclude(
+            fertile_eggs=F('eggs') - F('spoilt_eggs')).exists())
+
+        # Spread over the seasons, the latest batches still incubating.
+        first = Eggs.objects.order_by('created').first().created
+        self.assertGreater(timezone.now() - first,
+                           timezone.timedelta(days=300))
+        self.assertLessEqual(Eggs.objects.latest('created').created,
+                             timezone.now())
+        reserved = EggSetting.objects.aggregate(total=Sum('reserved'))
+        occupied = IncubatorCapacity.objects.aggregate(total=Sum('occupied'))
+        self.assertEqual(occupied, reserved)
+        self.assertGreater(EggSetting.objects.filter(
+            reserved__gt=0).count(), 1)
+
+        self.assertEqual(HatchCycle.objects.count(), 301)
+        self.assertTrue(DailyRollup.objects.exists())
+        self.assertEqual(factories.EggSettingFactory().settingcode,
+                         'SET-00000302')
+
+    def test_parse_scale(self):
+        self.assertEqual(dataset.parse_scale('100K'), 100000)
+        self.assertEqual(dataset.parse_scale('250'), 250)
+        with self.assertRaises(ValueError):
+            dataset.parse_scale('0')
+
+
+class ScenarioTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset.generate(120, seasons=1, seed=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        super(ScenarioTest, cls).tearDownClass()
+        get_backend().reset()
+
+    def test_run(self):
+        eggs = Eggs.objects.count()
+        results = scenarios.run(repeat=2, warmup=0, label='test')
+        self.assertEqual(set(results['scenarios']), set(scenarios.SCENARIOS))
+        self.assertEqual(results['rows']['customer.Eggs'], eggs)
+        intake = results['scenarios']['intake']
+        self.assertEqual(intake['repeat'], 2)
+        self.assertGreater(intake['queries'], 0)
+        self.assertLessEqual(intake['min_ms'], intake['median_ms'])
+        # The writes were rolled back.
+        self.assertEqual(Eggs.objects.count(), eggs)
+
+    def test_command_compares_with_a_baseline(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(lambda: [os.remove(os.path.join(directory, name))
+                                 for name in os.listdir(directory)] and
+                        os.rmdir(directory))
+        baseline = os.path.join(directory, 'baseline.json')
+        call_command('run_benchmarks', 'dashboard', 'candling', repeat=1,
+                     warmup=0, output=baseline, stdout=io.StringIO())
+        with open(baseline) as stream:
+            results = json.load(stream)
+        self.assertEqual(set(results['scenarios']), {'dashboard', 'candling'})
+
+        results['scenarios']['dashboard']['median_ms'] = 1e-3
+        with open(baseline, 'w') as stream:
+            json.dump(results, stream)
+        out = io.StringIO()
+        call_command('run_benchmarks', 'dashboard', repeat=1, warmup=0,
+                     compare=baseline, stdout=out)
+        self.assertIn('REGRESSED', out.getvalue())
+        with self.assertRaisesMessage(CommandError, 'Regressed: dashboard.'):
+            call_command('run_benchmarks', 'dashboard', repeat=1, warmup=0,
+                         compare=baseline, fail_on_regression=True,
+                         stdout=io.StringIO())
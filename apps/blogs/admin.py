@@ -1,18 +1,16 @@
-from datetime import datetime
-
 from django import forms
 from django.contrib import admin
+from django.utils import timezone
 
-from redactor.widgets import RedactorEditor
-
-from blogs.models import Blog, BlogAd
+from apps.blogs.models import Blog, BlogAd
 
 
 class BlogAdminForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(BlogAdminForm, self).__init__(*args, **kwargs)
 
-        self.fields['content'].widget = RedactorEditor()
+        self.fields['content'].widget = forms.Textarea(
+            attrs={'rows': 30, 'cols': 100})
 
 
 class BlogAdmin(admin.ModelAdmin):
@@ -22,7 +20,7 @@ class BlogAdmin(admin.ModelAdmin):
     readonly_fields = ('created', 'modified')
     list_display = ('title', 'author', 'status', 'date_published', 'created',
                     'modified', 'tag_list',)
-    list_select_related = ('author', 'tags',)
+    list_select_related = ('author',)
     list_filter = ('status', 'author', 'tags',)
     search_fields = (
         'title',
@@ -38,6 +36,10 @@ class BlogAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super(BlogAdmin, self).get_queryset(request)\
+            .prefetch_related('tags')
+
     def tag_list(self, obj):
         """
         Retrieve the tags separated by comma.
@@ -61,13 +63,14 @@ class BlogAdmin(admin.ModelAdmin):
         and the status is set to 'published'.
         """
         if not obj.date_published and obj.status == 'published':
-            obj.date_published = datetime.now()
+            obj.date_published = timezone.now()
 
         super(BlogAdmin, self).save_model(request, obj, form, change)
 
 
 class BlogAdAdmin(admin.ModelAdmin):
-    list_display = ('description', 'position', 'created', 'modified')
+    list_display = ('description', 'position', 'weight', 'created',
+                    'modified')
 
 
 admin.site.register(Blog, BlogAdmin)
@@ -0,0 +1,58 @@
+"""
+In-memory ad rotation for blog pages.
+
+Every process keeps the ads grouped by position and picks one at random,
+weighted by BlogAd.weight, without touching the database. The ads are
+reloaded when the version of BlogAd in the cache (see apps.core.cache),
+bumped by the signal handlers in apps.blogs.signals, no longer matches the
+version they were loaded at.
+"""
+import bisect
+import random
+import threading
+
+from apps.core import cache
+
+from .models import BlogAd
+
+
+class AdRotation(object):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._positions = {}
+
+    def _load(self):
+        positions = {}
+        for ad in BlogAd.objects.exclude(position__isnull=True)\
+                .filter(weight__gt=0).order_by('id'):
+            ads, totals = positions.setdefault(ad.position, ([], []))
+            ads.append(ad)
+            totals.append((totals[-1] if totals else 0) + ad.weight)
+        return positions
+
+    def _get_positions(self):
+        version = cache.model_versions((BlogAd,))[0]
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._positions = self._load()
+                    self._version = version
+        return self._positions
+
+    def pick(self, position):
+        """
+        Return a random ad for the position, or None if it has none.
+        """
+        ads, totals = self._get_positions().get(position, ((), ()))
+        if not ads:
+            return None
+        index = bisect.bisect_right(totals, random.random() * totals[-1])
+        return ads[min(index, len(ads) - 1)]
+
+    def invalidate(self):
+        cache.invalidate(BlogAd)
+
+
+rotation = AdRotation()
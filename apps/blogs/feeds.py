@@ -1,16 +1,22 @@
 from django.conf import settings
 from django.contrib.syndication.views import Feed
+from django.utils.decorators import method_decorator
 from django.utils.text import Truncator
 
-from blogs.models import Blog
+from apps.blogs.models import Blog
+from apps.core.cache import cache_page_for
 
 
 class LatestBlogsFeed(Feed):
     site_name = settings.SITE_NAME
-    title = 'Simple Glucose Management App | %s' % site_name
-    link = '/'
+    title = 'Blog | %s' % site_name
+    link = '/blog/'
     description = 'Updates on changes and additions to %s' % site_name
 
+    @method_decorator(cache_page_for(Blog))
+    def __call__(self, request, *args, **kwargs):
+        return super(LatestBlogsFeed, self).__call__(request, *args, **kwargs)
+
     def items(self):
         return Blog.objects.recent_posts()
 
@@ -0,0 +1,41 @@
+"""
+Cached blog sidebar: the tag cloud and the list of recent posts.
+
+Both are cached under the version of the Blog model (see apps.core.cache). The
+signal handlers in apps.blogs.signals move it to a new version whenever a blog
+post or a tag changes, which also drops the cached blog pages showing the
+sidebar. The timeout picks up posts whose publication date passes without
+any save.
+"""
+from taggit.models import TaggedItem
+
+from apps.core import cache
+
+from .models import Blog
+
+
+SIDEBAR_KEY = 'blogs:sidebar'
+SIDEBAR_TIMEOUT = 60 * 15
+
+
+def invalidate():
+    """
+    Move the sidebar, and the blog pages, to a new version.
+    """
+    cache.invalidate(Blog)
+
+
+def _build_sidebar():
+    return {
+        'blog_tags': list(TaggedItem.tags_for(Blog).order_by('name')),
+        'recent_blog_list': list(Blog.objects.recent_posts()),
+    }
+
+
+def get_sidebar():
+    """
+    Return a dict with 'blog_tags' and 'recent_blog_list', reading the
+    database only when the cached copy is missing.
+    """
+    return cache.cached(SIDEBAR_KEY, _build_sidebar, (Blog,),
+                        timeout=SIDEBAR_TIMEOUT)
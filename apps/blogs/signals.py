@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from taggit.models import Tag, TaggedItem
+
+from apps.blogs import sidebar
+from apps.blogs.ads import rotation
+from apps.blogs.models import Blog, BlogAd
+
+
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_blog_sidebar(sender, **kwargs):
+    """
+    Drop the cached sidebar when a post or a tag changes.
+    """
+    sidebar.invalidate()
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def invalidate_blog_sidebar_on_tagging(sender, **kwargs):
+    """
+    Drop the cached sidebar when a blog post is tagged or untagged.
+    """
+    instance = kwargs['instance']
+    if instance.content_type.model_class() is Blog:
+        sidebar.invalidate()
+
+
+@receiver(post_save, sender=BlogAd)
+@receiver(post_delete, sender=BlogAd)
+def reload_blog_ads(sender, **kwargs):
+    """
+    Make every process reload its ads on the next page view.
+    """
+    rotation.invalidate()
@@ -1,3 +1,117 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.blogs.ads import AdRotation
+from apps.blogs.models import Blog, BlogAd
+from apps.blogs.sidebar import get_sidebar
+
+
+class SidebarTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user('author')
+        self.blog = Blog.objects.create(
+            author=self.author, title='First hatch', content='Chicks',
+            status='published',
+            date_published=timezone.now() - timedelta(days=1))
+        self.blog.tags.add('layers')
+
+    def test_cached_until_a_post_or_tag_changes(self):
+        sidebar = get_sidebar()
+        self.assertEqual(sidebar['recent_blog_list'], [self.blog])
+        self.assertEqual([tag.name for tag in sidebar['blog_tags']],
+                         ['layers'])
+        with self.assertNumQueries(0):
+            get_sidebar()
+
+        self.blog.tags.add('broilers')
+        self.assertEqual([tag.name for tag in get_sidebar()['blog_tags']],
+                         ['broilers', 'layers'])
+
+        self.blog.status = 'draft'
+        self.blog.save()
+        self.assertEqual(get_sidebar()['recent_blog_list'], [])
+
+    def test_pages(self):
+        response = self.client.get('/blog/')
+        self.assertContains(response, 'First hatch')
+        with self.assertNumQueries(0):
+            self.client.get('/blog/')
+
+        response = self.client.get('/blog/tag/layers/')
+        self.assertEqual(list(response.context['blog_list']), [self.blog])
+        response = self.client.get('/blog/tag/broilers/')
+        self.assertEqual(list(response.context['blog_list']), [])
+
+        response = self.client.get(self.blog.get_absolute_url())
+        self.assertContains(response, '<div>Chicks</div>', html=True)
+
+        Blog.objects.create(author=self.author, title='Draft', content='')
+        self.assertEqual(self.client.get('/blog/draft/').status_code, 404)
+
+
+class AdRotationTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.top = BlogAd.objects.create(
+            description='Feeds', code='<p>feeds</p>', position=BlogAd.TOP,
+            weight=3)
+        self.other = BlogAd.objects.create(
+            description='Vaccines', code='<p>vaccines</p>',
+            position=BlogAd.TOP)
+        BlogAd.objects.create(description='Paused', code='',
+                              position=BlogAd.TOP, weight=0)
+        BlogAd.objects.create(description='Nowhere', code='')
+
+    def test_pick_is_weighted_and_read_once(self):
+        rotation = AdRotation()
+        with mock.patch('random.random', return_value=0.5):
+            self.assertEqual(rotation.pick(BlogAd.TOP), self.top)
+        with mock.patch('random.random', return_value=0.9):
+            self.assertEqual(rotation.pick(BlogAd.TOP), self.other)
+        with self.assertNumQueries(0):
+            self.assertIsNone(rotation.pick(BlogAd.BOTTOM))
+
+    def test_reloaded_when_an_ad_changes(self):
+        rotation = AdRotation()
+        rotation.pick(BlogAd.TOP)
+        self.top.position = BlogAd.BOTTOM
+        self.top.save()
+        self.assertEqual(rotation.pick(BlogAd.BOTTOM), self.top)
+        self.other.delete()
+        self.assertIsNone(rotation.pick(BlogAd.TOP))
+
+    def test_detail_page_shows_ads(self):
+        blog = Blog.objects.create(
+            author=User.objects.create_user('author'), title='Ads',
+            content='', status='published', date_published=timezone.now())
+        with mock.patch('random.random', return_value=0.0):
+            response = self.client.get(blog.get_absolute_url())
+        self.assertContains(response, '<p>feeds</p>', html=True)
+
+
+class FeedTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user('author')
+
+    def test_cached_until_a_post_changes(self):
+        Blog.objects.create(
+            author=self.author, title='Brooding', content='Warmth',
+            status='published', date_published=timezone.now())
+        self.assertContains(self.client.get('/blog/feed/'), 'Brooding')
+        with self.assertNumQueries(0):
+            self.client.get('/blog/feed/')
 
-# Create your tests here.
+        Blog.objects.create(
+            author=self.author, title='Vaccination', content='Marek',
+            status='published', date_published=timezone.now())
+        self.assertContains(self.client.get('/blog/feed/'), 'Vaccination')
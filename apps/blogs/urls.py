@@ -1,22 +1,17 @@
-from django.conf.urls import patterns, url
+from django.urls import path
 
+from apps.core.cache import cache_page_for
+
+from .feeds import LatestBlogsFeed
+from .models import Blog
 from .views import BlogDetailView, BlogListView, BlogTagListView
 
 
-urlpatterns = patterns('',
-    url(
-        regex=r'^$',
-        view=BlogListView.as_view(),
-        name='blog_list_view',
-    ),
-    url(
-        regex=r'^tag/(?P<tag>[\w ]+)/$',
-        view=BlogTagListView.as_view(),
-        name='blog_tag_list_view',
-    ),
-    url(
-        regex=r'^(?P<slug>[\w-]+)/$',
-        view=BlogDetailView.as_view(),
-        name='blog_detail_view',
-    ),
-)
+urlpatterns = [
+    path('', cache_page_for(Blog)(BlogListView.as_view()),
+         name='blog_list_view'),
+    path('feed/', LatestBlogsFeed(), name='blog_feed_view'),
+    path('tag/<str:tag>/', cache_page_for(Blog)(BlogTagListView.as_view()),
+         name='blog_tag_list_view'),
+    path('<slug:slug>/', BlogDetailView.as_view(), name='blog_detail_view'),
+]
@@ -1,17 +1,16 @@
 from django.views.generic.base import ContextMixin
 from django.views.generic import DetailView, ListView
 
-from taggit.models import TaggedItem
-
+from .ads import rotation
 from .models import Blog, BlogAd
+from .sidebar import get_sidebar
 
 
 class BlogBaseView(ContextMixin):
 
     def get_context_data(self, **kwargs):
         context = super(BlogBaseView, self).get_context_data(**kwargs)
-        context['blog_tags'] = TaggedItem.tags_for(Blog).order_by('name')
-        context['recent_blog_list'] = Blog.objects.recent_posts()
+        context.update(get_sidebar())
 
         return context
 
@@ -23,7 +22,7 @@ class BlogDetailView(DetailView, BlogBaseView):
         """
         Only return the object if it's public, unless the user is a superuser.
         """
-        if self.request.user.is_authenticated() and \
+        if self.request.user.is_authenticated and \
                 self.request.user.is_superuser:
             return Blog.objects.all()
         else:
@@ -31,12 +30,9 @@ class BlogDetailView(DetailView, BlogBaseView):
 
     def get_context_data(self, **kwargs):
         context = super(BlogDetailView, self).get_context_data(**kwargs)
-        context['ad_top'] = BlogAd.objects.filter(position=BlogAd.TOP)\
-            .order_by('?').first()
-        context['ad_middle'] = BlogAd.objects.filter(position=BlogAd.MIDDLE)\
-            .order_by('?').first()
-        context['ad_bottom'] = BlogAd.objects.filter(position=BlogAd.BOTTOM)\
-            .order_by('?').first()
+        context['ad_top'] = rotation.pick(BlogAd.TOP)
+        context['ad_middle'] = rotation.pick(BlogAd.MIDDLE)
+        context['ad_bottom'] = rotation.pick(BlogAd.BOTTOM)
 
         return context
 
@@ -7,6 +7,23 @@
 #########################################################################
 from django.contrib import admin
 from apps.breeders.models import Breed, Breeders
+from apps.hatchery.admin import RecordAdmin
+from apps.images.renditions import thumbnail
 
-admin.site.register(Breed)
-admin.site.register(Breeders)
\ No newline at end of file
+
+@admin.register(Breed)
+class BreedAdmin(RecordAdmin):
+    list_display = (thumbnail('front_photo'), 'code', 'breed', 'poultry_type',
+                    'purpose', 'eggs_year', 'adult_weight')
+    search_fields = ('code', 'breed')
+
+
+@admin.register(Breeders)
+class BreedersAdmin(RecordAdmin):
+    list_display = (thumbnail('hens_photo'), 'batch', 'breed', 'hens',
+                    'cocks', 'mortality', 'current_number', 'created')
+    list_select_related = ('breed',)
+    list_filter = ('breed',)
+    search_fields = ('=batch',)
+    autocomplete_fields = ('breed',)
+    readonly_fields = ('current_number',)
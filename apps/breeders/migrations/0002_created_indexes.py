@@ -0,0 +1,33 @@
+# Generated by Django 3.1.2 on 2020-11-04 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='breed',
+            options={'managed': True, 'verbose_name': 'Breed', 'verbose_name_plural': 'Breed'},
+        ),
+        migrations.AlterModelOptions(
+            name='breeders',
+            options={'managed': True, 'verbose_name': 'Breeders', 'verbose_name_plural': 'Breeders'},
+        ),
+        migrations.AddIndex(
+            model_name='breed',
+            index=models.Index(fields=['created'], name='breed_created'),
+        ),
+        migrations.AddIndex(
+            model_name='breeders',
+            index=models.Index(fields=['created'], name='breeders_created'),
+        ),
+        migrations.AddIndex(
+            model_name='breeders',
+            index=models.Index(fields=['breed', 'created'], name='breeders_breed_created'),
+        ),
+    ]
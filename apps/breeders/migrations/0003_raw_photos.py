@@ -0,0 +1,38 @@
+# Generated by Django 3.1.2 on 2020-11-09 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeders', '0002_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='breed',
+            name='back_photo',
+            field=models.ImageField(blank=True, null=True, upload_to='breed_photos'),
+        ),
+        migrations.AlterField(
+            model_name='breed',
+            name='front_photo',
+            field=models.ImageField(blank=True, null=True, upload_to='breed_photos'),
+        ),
+        migrations.AlterField(
+            model_name='breed',
+            name='side_photo',
+            field=models.ImageField(blank=True, null=True, upload_to='breed_photos'),
+        ),
+        migrations.AlterField(
+            model_name='breeders',
+            name='cocks_photo',
+            field=models.ImageField(blank=True, null=True, upload_to='breeders_photos'),
+        ),
+        migrations.AlterField(
+            model_name='breeders',
+            name='hens_photo',
+            field=models.ImageField(blank=True, null=True, upload_to='breeders_photos'),
+        ),
+    ]
@@ -16,10 +16,9 @@ from django.utils.safestring import mark_safe
 from django.template.defaultfilters import truncatechars, slugify  # or truncatewords
 from django.contrib.gis.db import models as gismodels
 
-from imagekit.models import ProcessedImageField
-from imagekit.processors import ResizeToFit
-
 from telelbirds import settings
+from apps.core.derived import Derived, DerivedQuerySet, compute_derived
+from apps.core.ordering import ChronologicalQuerySet
 
 
 class Breed(models.Model):
@@ -34,17 +33,21 @@ class Breed(models.Model):
     eggs_year=models.IntegerField(null=True,blank=True,max_length=50)
     adult_weight=models.FloatField(null=True,blank=True,max_length=50)
     description=models.TextField(null=True,blank=True,max_length=250)
-    front_photo = ProcessedImageField(upload_to='breed_photos',null=True,blank=True, processors=[ResizeToFit(1280)], format='JPEG', options={'quality': 70})
-    side_photo = ProcessedImageField(upload_to='breed_photos',null=True,blank=True, processors=[ResizeToFit(1280)], format='JPEG', options={'quality': 70})
-    back_photo = ProcessedImageField(upload_to='breed_photos',null=True,blank=True, processors=[ResizeToFit(1280)], format='JPEG', options={'quality': 70})
+    front_photo = models.ImageField(upload_to='breed_photos',null=True,blank=True)
+    side_photo = models.ImageField(upload_to='breed_photos',null=True,blank=True)
+    back_photo = models.ImageField(upload_to='breed_photos',null=True,blank=True)
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = ChronologicalQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "breed"
         verbose_name = 'Breed'
         verbose_name_plural = "Breed"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='breed_created'),
+        ]
     
     def get_absolute_url(self):
         return '/breed/{}'.format(self.code)
@@ -65,19 +68,32 @@ class Breeders(models.Model):
     butchered = models.IntegerField(null=True,blank=True,max_length=50)
     sold = models.IntegerField(null=True,blank=True,max_length=50)
     current_number = models.IntegerField(null=True,blank=True,max_length=50)
-    hens_photo = ProcessedImageField(upload_to='breeders_photos',null=True,blank=True, processors=[ResizeToFit(1280)], format='JPEG', options={'quality': 70})
-    cocks_photo = ProcessedImageField(upload_to='breeders_photos',null=True,blank=True, processors=[ResizeToFit(1280)], format='JPEG', options={'quality': 70})
+    hens_photo = models.ImageField(upload_to='breeders_photos',null=True,blank=True)
+    cocks_photo = models.ImageField(upload_to='breeders_photos',null=True,blank=True)
     created = models.DateTimeField(auto_now_add=True)
 
+    DERIVED = {
+        'current_number': Derived(
+            ('cocks', 'hens', 'butchered', 'sold', 'mortality'),
+            lambda cocks, hens, butchered, sold, mortality:
+                cocks + hens - butchered - sold - mortality),
+    }
+
+    objects = DerivedQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "breeders"
         verbose_name = 'Breeders'
         verbose_name_plural = "Breeders"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='breeders_created'),
+            models.Index(fields=['breed', 'created'],
+                         name='breeders_breed_created'),
+        ]
 
     def save(self, *args, **kwargs):
-        self.current_number = self.cocks + self.hens - self.butchered - self.sold - self.mortality
+        compute_derived(self)
         super(Breeders, self).save(*args, **kwargs)
     
     def get_absolute_url(self):
@@ -7,8 +7,46 @@
 #########################################################################
 from django.contrib import admin
 from apps.chicks.models import Chicks,Mortality,ChicksSold,ChicksAvailable
+from apps.hatchery.admin import RecordAdmin
+from apps.search.admin import SearchIndexMixin
 
-admin.site.register(Chicks)
-admin.site.register(Mortality)
-admin.site.register(ChicksSold)
-admin.site.register(ChicksAvailable)
\ No newline at end of file
+
+@admin.register(Chicks)
+class ChicksAdmin(SearchIndexMixin, RecordAdmin):
+    list_display = ('batchnumber', 'breed', 'source', 'age', 'number',
+                    'created')
+    list_select_related = ('breed',)
+    list_filter = ('breed',)
+    search_fields = ('=batchnumber',)
+    search_kind = 'chicks'
+    autocomplete_fields = ('breed',)
+
+
+@admin.register(Mortality)
+class MortalityAdmin(RecordAdmin):
+    list_display = ('mortalitynumber', 'chicks', 'number', 'mortality',
+                    'notify_vet', 'created')
+    list_select_related = ('chicks',)
+    list_filter = ('chicks__breed', 'notify_vet')
+    search_fields = ('=mortalitynumber', '=batchnumber')
+    autocomplete_fields = ('chicks',)
+
+
+@admin.register(ChicksSold)
+class ChicksSoldAdmin(RecordAdmin):
+    list_display = ('salesnumber', 'chicks', 'customer_type', 'number',
+                    'price', 'sales', 'created')
+    list_select_related = ('chicks',)
+    list_filter = ('chicks__breed',)
+    search_fields = ('=salesnumber', '=batchnumber')
+    autocomplete_fields = ('chicks',)
+    readonly_fields = ('sales',)
+
+
+@admin.register(ChicksAvailable)
+class ChicksAvailableAdmin(RecordAdmin):
+    list_display = ('batchnumber', 'breed', 'age', 'number', 'created')
+    list_select_related = ('breed',)
+    list_filter = ('breed',)
+    search_fields = ('=batchnumber',)
+    autocomplete_fields = ('breed',)
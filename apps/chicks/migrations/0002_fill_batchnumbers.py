@@ -0,0 +1,20 @@
+# Generated by Django 3.1.2 on 2020-10-31 10:12
+
+from django.db import migrations
+
+from apps.core.codes import fill_codes
+
+
+def fill(apps, schema_editor):
+    fill_codes(apps.get_model('chicks', 'Chicks'), 'batchnumber', 'CHK')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chicks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
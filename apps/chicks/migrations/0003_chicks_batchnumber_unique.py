@@ -0,0 +1,18 @@
+# Generated by Django 3.1.2 on 2020-10-31 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chicks', '0002_fill_batchnumbers'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chicks',
+            name='batchnumber',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+    ]
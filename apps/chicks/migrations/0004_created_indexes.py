@@ -0,0 +1,61 @@
+# Generated by Django 3.1.2 on 2020-11-04 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chicks', '0003_chicks_batchnumber_unique'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='chicks',
+            options={'managed': True, 'verbose_name': 'Chick', 'verbose_name_plural': 'Chicks'},
+        ),
+        migrations.AlterModelOptions(
+            name='chicksavailable',
+            options={'managed': True, 'verbose_name': 'ChicksAvailable', 'verbose_name_plural': 'ChicksAvailable'},
+        ),
+        migrations.AlterModelOptions(
+            name='chickssold',
+            options={'managed': True, 'verbose_name': 'ChicksSold', 'verbose_name_plural': 'ChicksSold'},
+        ),
+        migrations.AlterModelOptions(
+            name='mortality',
+            options={'managed': True, 'verbose_name': 'Mortality', 'verbose_name_plural': 'Mortality'},
+        ),
+        migrations.AddIndex(
+            model_name='chicks',
+            index=models.Index(fields=['created'], name='chicks_created'),
+        ),
+        migrations.AddIndex(
+            model_name='chicks',
+            index=models.Index(fields=['breed', 'created'], name='chicks_breed_created'),
+        ),
+        migrations.AddIndex(
+            model_name='chicksavailable',
+            index=models.Index(fields=['created'], name='chicksavailable_created'),
+        ),
+        migrations.AddIndex(
+            model_name='chicksavailable',
+            index=models.Index(fields=['breed', 'created'], name='chicksavailable_breed_created'),
+        ),
+        migrations.AddIndex(
+            model_name='chickssold',
+            index=models.Index(fields=['created'], name='chickssold_created'),
+        ),
+        migrations.AddIndex(
+            model_name='chickssold',
+            index=models.Index(fields=['chicks', 'created'], name='chickssold_chicks_created'),
+        ),
+        migrations.AddIndex(
+            model_name='mortality',
+            index=models.Index(fields=['created'], name='mortality_created'),
+        ),
+        migrations.AddIndex(
+            model_name='mortality',
+            index=models.Index(fields=['chicks', 'created'], name='mortality_chicks_created'),
+        ),
+    ]
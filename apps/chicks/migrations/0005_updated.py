@@ -0,0 +1,31 @@
+# Generated by Django 3.1.2 on 2020-11-06 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chicks', '0004_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chickssold',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='mortality',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='chickssold',
+            index=models.Index(fields=['updated', 'id'], name='chickssold_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='mortality',
+            index=models.Index(fields=['updated', 'id'], name='mortality_updated'),
+        ),
+    ]
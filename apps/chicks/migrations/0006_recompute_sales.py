@@ -0,0 +1,28 @@
+# Generated by Django 3.1.2 on 2026-10-18 15:02
+
+from django.db import migrations
+from django.db.models import F
+
+
+def price_times_number(apps, schema_editor):
+    ChicksSold = apps.get_model('chicks', 'ChicksSold')
+    ChicksSold.objects.update(sales=F('price') * F('number'))
+
+
+def price_minus_number(apps, schema_editor):
+    ChicksSold = apps.get_model('chicks', 'ChicksSold')
+    ChicksSold.objects.update(sales=F('price') - F('number'))
+
+
+class Migration(migrations.Migration):
+    """
+    ChicksSold.sales used to be saved as price - number.
+    """
+
+    dependencies = [
+        ('chicks', '0005_updated'),
+    ]
+
+    operations = [
+        migrations.RunPython(price_times_number, price_minus_number),
+    ]
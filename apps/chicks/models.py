@@ -23,6 +23,9 @@ from telelbirds import settings
 from apps.breeders.models import Breeders, Breed
 from apps.hatchery.models import Hatchery
 from apps.customer.models import Customer, Eggs
+from apps.core.codes import save_with_code
+from apps.core.derived import Derived, DerivedQuerySet, compute_derived
+from apps.core.ordering import ChronologicalQuerySet
 
 
 class Chicks(models.Model):
@@ -30,7 +33,7 @@ class Chicks(models.Model):
     Chicks Model
     """
     id = models.AutoField(primary_key=True)
-    batchnumber=models.CharField(null=True,blank=True,max_length=50)
+    batchnumber=models.CharField(null=True,blank=True,max_length=50,unique=True)
     source=models.CharField(null=True,blank=True,max_length=50)
     breed=models.ForeignKey(Breed,
         related_name="breed_chicks", blank=True, null=True,
@@ -40,13 +43,23 @@ class Chicks(models.Model):
     description=models.TextField(null=True,blank=True) 
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = ChronologicalQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "chicks"
         verbose_name = 'Chick'
         verbose_name_plural = "Chicks"
         managed = True
-    
+        indexes = [
+            models.Index(fields=['created'], name='chicks_created'),
+            models.Index(fields=['breed', 'created'],
+                         name='chicks_breed_created'),
+        ]
+
+    def save(self, *args, **kwargs):
+        save_with_code(self, 'batchnumber', 'CHK',
+                       lambda: super(Chicks, self).save(*args, **kwargs))
+
     def get_absolute_url(self):
         return '/chicks/{}'.format(self.batchnumber)
 
@@ -67,13 +80,21 @@ class Mortality(models.Model):
     reason=models.TextField(null=True,blank=True)
     notify_vet=models.BooleanField(null=True,blank=True,max_length=50) 
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = ChronologicalQuerySet.as_manager()
 
     class Meta:
-        ordering = ['created']
         db_table = "mortality"
         verbose_name = 'Mortality'
         verbose_name_plural = "Mortality"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='mortality_created'),
+            models.Index(fields=['updated', 'id'], name='mortality_updated'),
+            models.Index(fields=['chicks', 'created'],
+                         name='mortality_chicks_created'),
+        ]
     
     def get_absolute_url(self):
         return '/mortality/{}'.format(self.mortalitynumber)
@@ -95,16 +116,29 @@ class ChicksSold(models.Model):
     price=models.FloatField(null=True,blank=True)
     sales=models.FloatField(null=True,blank=True)  
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    DERIVED = {
+        'sales': Derived(('price', 'number'),
+                         lambda price, number: price * number),
+    }
+
+    objects = DerivedQuerySet.as_manager()
 
     class Meta:
-        ordering = ['created']
         db_table = "chickssold"
         verbose_name = 'ChicksSold'
         verbose_name_plural = "ChicksSold"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='chickssold_created'),
+            models.Index(fields=['updated', 'id'], name='chickssold_updated'),
+            models.Index(fields=['chicks', 'created'],
+                         name='chickssold_chicks_created'),
+        ]
     
     def save(self, *args, **kwargs):
-        self.sales = self.price - self.number
+        compute_derived(self)
         super(ChicksSold, self).save(*args, **kwargs)
 
     def get_absolute_url(self):
@@ -124,12 +158,18 @@ class ChicksAvailable(models.Model):
     number=models.IntegerField(null=True,blank=True,max_length=50)
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = ChronologicalQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "chicksavailable"
         verbose_name = 'ChicksAvailable'
         verbose_name_plural = "ChicksAvailable"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='chicksavailable_created'),
+            models.Index(fields=['breed', 'created'],
+                         name='chicksavailable_breed_created'),
+        ]
     
     def get_absolute_url(self):
         return '/chicks_available/{}'.format(self.batchnumber)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from apps.chicks.views import (ChicksDatatableView, ChicksDetailView,
+                               MortalityDatatableView)
+
+urlpatterns = [
+    path('chicks/<str:code>', ChicksDetailView.as_view(),
+         name='chicks_detail'),
+    path('records/chicks', ChicksDatatableView.as_view(),
+         name='chicks_records'),
+    path('records/mortality', MortalityDatatableView.as_view(),
+         name='mortality_records'),
+]
@@ -1,3 +1,31 @@
-from django.shortcuts import render
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from apps.chicks.models import Chicks, Mortality
+from apps.core.datatables import KeysetDatatableView
+from apps.hatchery.views import CodeDetailView
 
-# Create your views here.
+
+class ChicksDetailView(CodeDetailView):
+    model = Chicks
+    slug_field = 'batchnumber'
+
+
+class ChicksDatatableView(KeysetDatatableView):
+    model = Chicks
+    columns = ['batchnumber', 'breed__breed', 'source', 'age', 'number',
+               'created']
+    search_columns = ['batchnumber']
+    lookups = {'breed__breed': 'iexact', 'source': 'iexact'}
+    detail_url_name = 'chicks_detail'
+
+
+class MortalityDatatableView(KeysetDatatableView):
+    model = Mortality
+    columns = ['mortalitynumber', 'chicks__batchnumber', 'age', 'number',
+               'mortality', 'notify_vet', 'created']
+    search_columns = ['mortalitynumber', 'chicks__batchnumber']
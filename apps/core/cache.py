@@ -0,0 +1,130 @@
+"""
+Cached values and pages that go stale when a model changes.
+
+Every model watched with invalidate_on_change() has a version number in
+the cache, bumped whenever one of its rows is saved or deleted. Keys built
+with versioned_key() carry the versions of the models the value is computed
+from:
+
+    totals = cached('dashboard:totals', DailyRollup.objects.totals,
+                    models=(DailyRollup,))
+
+so one write moves every key built on the model at once; the stale entries
+are never read again and expire on their own. The versions of all the
+models are read in a single round trip. Writes that send no signals -
+bulk_create(), QuerySet.update() - call invalidate() themselves.
+
+cache_page_for() is cache_page whose entries are versioned the same way,
+and models_version() gives the value to vary a ``{% cache %}`` template
+fragment on.
+"""
+import functools
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.views.decorators.cache import cache_page
+
+VERSION_KEY = 'version:{}'
+DEFAULT_TIMEOUT = 60 * 60
+
+_MISSING = object()
+
+
+def _version_key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def _initial_version():
+    # Above any version a counter evicted from the cache may have reached.
+    return int(time.time() * 1000)
+
+
+def model_versions(models):
+    """
+    The current versions of the models, in their order.
+    """
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def models_version(*models):
+    """
+    The versions of the models as one string, e.g. to vary a template
+    fragment on.
+    """
+    return '.'.join(str(version) for version in model_versions(models))
+
+
+def versioned_key(key, models):
+    return '{}:{}'.format(key, models_version(*models))
+
+
+def invalidate(*models):
+    """
+    Move the models to a new version.
+    """
+    for model in models:
+        try:
+            cache.incr(_version_key(model))
+        except ValueError:
+            # The version key is missing (first use or evicted).
+            cache.add(_version_key(model), _initial_version(), None)
+
+
+def cached(key, compute, models, timeout=DEFAULT_TIMEOUT):
+    """
+    The value cached under the key and the models' versions, calling
+    compute() on a miss.
+    """
+    key = versioned_key(key, models)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+def _invalidate_sender(sender, **kwargs):
+    invalidate(sender)
+
+
+def invalidate_on_change(*models):
+    """
+    Bump the version of the models whenever one of their rows is saved or
+    deleted.
+    """
+    for model in models:
+        for signal in (post_save, post_delete):
+            signal.connect(_invalidate_sender, sender=model, weak=False,
+                           dispatch_uid='core.cache.' + _version_key(model))
+
+
+def cache_page_for(*models, timeout=None, key_prefix='page'):
+    """
+    cache_page for views showing the models' rows: their pages are cached
+    for ``timeout`` seconds (PUBLIC_PAGE_CACHE_TIMEOUT by default) or until
+    one of the models changes, as told by invalidate_on_change() or
+    invalidate().
+
+    As with cache_page, responses varying on the cookie - those of logged
+    in users - are cached per session, and never for a request that sets
+    a new cookie.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            seconds = timeout
+            if seconds is None:
+                seconds = getattr(settings, 'PUBLIC_PAGE_CACHE_TIMEOUT', 600)
+            prefix = versioned_key(key_prefix, models)
+            return cache_page(seconds, key_prefix=prefix)(view)(
+                request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,100 @@
+"""
+Sequential lookup codes, e.g. ``SET-00000042`` for egg settings.
+
+Models keep their code in a unique, indexed column and call save_with_code()
+from save(). The next number is read from the highest existing code with
+the same prefix, an index seek on the unique column. Two writers can pick
+the same number; the loser hits the unique constraint and retries with the
+next one, so codes never collide.
+"""
+from django.db import IntegrityError, transaction
+
+# Zero padded so that codes sort in numeric order.
+WIDTH = 8
+ATTEMPTS = 5
+
+
+def format_code(prefix, number):
+    return '{}-{:0{}d}'.format(prefix, number, WIDTH)
+
+
+def parse_code(prefix, code):
+    """
+    Number of a code generated for ``prefix``, or None for any other value.
+    """
+    start = prefix + '-'
+    if not code or not code.startswith(start):
+        return None
+    number = code[len(start):]
+    if len(number) != WIDTH or not number.isdigit():
+        return None
+    return int(number)
+
+
+def last_number(model, field, prefix):
+    codes = model._default_manager.filter(
+        **{field + '__startswith': prefix + '-'}) \
+        .order_by('-' + field).values_list(field, flat=True)
+    # Hand typed codes sharing the prefix sort first only if they are
+    # longer than generated ones, skip past them.
+    for code in codes[:100]:
+        number = parse_code(prefix, code)
+        if number is not None:
+            return number
+    return 0
+
+
+def next_code(model, field, prefix):
+    return format_code(prefix, last_number(model, field, prefix) + 1)
+
+
+def save_with_code(instance, field, prefix, save):
+    """
+    Call ``save`` after filling an empty ``field`` with the next code,
+    retrying with a new code when another writer took it first.
+    """
+    if getattr(instance, field):
+        return save()
+    model = type(instance)
+    for attempt in range(ATTEMPTS):
+        code = next_code(model, field, prefix)
+        setattr(instance, field, code)
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            setattr(instance, field, None)
+            taken = model._default_manager.filter(**{field: code}).exists()
+            if not taken or attempt == ATTEMPTS - 1:
+                raise
+
+
+def fill_codes(model, field, prefix, batch_size=1000):
+    """
+    Give a code to every row without one and to every row but the first of
+    a group sharing a code. Used by the data migrations adding the unique
+    constraints. Returns the number of rows changed.
+    """
+    manager = model._default_manager
+    manager.filter(**{field: ''}).update(**{field: None})
+
+    seen, changed = set(), []
+    rows = manager.order_by('id').values_list('id', field)
+    for row_id, code in rows.iterator(chunk_size=batch_size):
+        if code is not None and code not in seen:
+            seen.add(code)
+        else:
+            changed.append(row_id)
+
+    number = last_number(model, field, prefix)
+    batch = []
+    for row_id in changed:
+        number += 1
+        while format_code(prefix, number) in seen:
+            number += 1
+        batch.append(model(id=row_id, **{field: format_code(prefix, number)}))
+        if len(batch) >= batch_size:
+            manager.bulk_update(batch, [field])
+            batch = []
+    manager.bulk_update(batch, [field])
+    return len(changed)
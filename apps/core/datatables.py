@@ -0,0 +1,240 @@
+"""
+Server-side processing for DataTables over large tables.
+
+KeysetDatatableView answers the DataTables 1.10 protocol
+(https://datatables.net/manual/server-side) with:
+
+- only the listed ``columns`` read, through values();
+- the global search and the column searches turned into indexable
+  lookups on the listed columns, and the ordering restricted to them;
+- keyset pagination: every response carries a ``next`` cursor holding the
+  sort key of its last row. A request passing it back as ``after`` seeks
+  past that row instead of skipping ``start`` rows with OFFSET, so the
+  cost of a page does not grow with its position. Requests without a
+  cursor (jumping to a page) fall back to OFFSET, up to ``max_offset``;
+- recordsTotal from the planner estimate on large tables and
+  recordsFiltered counted up to ``count_limit``.
+
+A plain GET without the ``draw`` parameter renders the browsing page, which
+loads its rows from the same URL.
+"""
+import base64
+import datetime
+import json
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.html import escape
+from django_datatables_view.base_datatable_view import BaseDatatableView
+
+from apps.core.paginator import approximate_count
+
+
+def resolve_field(model, path):
+    """
+    The field a values() path such as ``customer__customercode`` ends on.
+    """
+    parts = path.split(LOOKUP_SEP)
+    for part in parts[:-1]:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(parts[-1])
+
+
+def encode_cursor(column, descending, value, pk):
+    data = json.dumps([column, descending, value, pk], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        column, descending, value, pk = json.loads(
+            base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (TypeError, ValueError):
+        raise ValueError('Invalid cursor.')
+    return column, descending, value, pk
+
+
+def seek(column, descending, value, pk, nulls_largest):
+    """
+    Condition selecting the rows after (value, pk) in the order
+    ``column, id``, both descending or both ascending.
+    """
+    after = 'lt' if descending else 'gt'
+    tie = Q(**{'id__' + after: pk})
+    if column == 'id':
+        return tie
+    # Where the NULLs sort depends on the database and the direction.
+    nulls_last = nulls_largest != descending
+    if value is None:
+        condition = Q(**{column + '__isnull': True}) & tie
+        if not nulls_last:
+            condition |= Q(**{column + '__isnull': False})
+        return condition
+    condition = Q(**{column + '__' + after: value}) | \
+        (Q(**{column: value}) & tie)
+    if nulls_last:
+        condition |= Q(**{column + '__isnull': True})
+    return condition
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class KeysetDatatableView(BaseDatatableView):
+    """
+    Subclasses set ``model`` and ``columns``, the values() paths sent to
+    the table, the first being the record's code. ``search_columns`` are
+    prefix-matched by the global search, ``lookups`` maps columns to the
+    lookup of their column search ('exact' by default).
+    """
+    http_method_names = ['get']
+    template_name = 'hatchery/datatable.html'
+    model = None
+    columns = []
+    search_columns = []
+    lookups = {}
+    detail_url_name = None
+    max_display_length = 100
+    max_offset = 10000
+    count_limit = 10000
+    query_budget = 6
+
+    def get(self, request, *args, **kwargs):
+        if 'draw' not in request.GET:
+            return TemplateResponse(request, self.template_name,
+                                    self.get_page_context())
+        return super(KeysetDatatableView, self).get(request, *args, **kwargs)
+
+    def get_page_context(self):
+        detail_url = None
+        if self.detail_url_name:
+            detail_url = reverse(self.detail_url_name, args=['__code__'])
+        return {
+            'verbose_name_plural': self.model._meta.verbose_name_plural,
+            'columns': [(column, column.replace(LOOKUP_SEP, ' '))
+                        for column in self.columns],
+            'detail_url': detail_url,
+            'page_length': 50,
+        }
+
+    def get_initial_queryset(self):
+        return self.model._default_manager.all()
+
+    def get_context_data(self, *args, **kwargs):
+        self.initialize(*args, **kwargs)
+        self.columns_data = self.extract_datatables_column_data()
+        try:
+            draw = int(self._querydict.get('draw', 0))
+        except ValueError:
+            draw = 0
+        try:
+            return dict(self.get_page(), draw=draw)
+        except (ValueError, ValidationError) as e:
+            message = '; '.join(e.messages) if isinstance(
+                e, ValidationError) else str(e)
+            return {'draw': draw, 'error': message}
+
+    def get_page(self):
+        qs = self.get_initial_queryset()
+        total = approximate_count(qs)
+        filtered = self.filter_queryset(qs)
+        if filtered.query.where:
+            count = filtered[:self.count_limit].count()
+        else:
+            count = total
+
+        column, descending = self.get_sort()
+        qs = filtered.order_by(*self.get_order_by(column, descending))
+        length = self.get_length()
+        cursor = self._querydict.get('after')
+        if cursor:
+            qs = qs.filter(self.get_seek(cursor, column, descending))
+        else:
+            start = int(self._querydict.get('start', 0))
+            if start > self.max_offset:
+                raise ValueError(
+                    'Pages past row {} are only reachable with the Next '
+                    'button.'.format(self.max_offset))
+            qs = qs[start:]
+        rows = list(qs.values('id', *self.columns)[:length])
+
+        next_cursor = None
+        if len(rows) == length:
+            last = rows[-1]
+            next_cursor = encode_cursor(column, descending, last[column],
+                                        last['id'])
+        return {
+            'recordsTotal': total,
+            'recordsFiltered': count,
+            'data': [self.prepare_row(row) for row in rows],
+            'next': next_cursor,
+        }
+
+    def get_length(self):
+        length = int(self._querydict.get('length', 10))
+        if length <= 0:
+            return self.max_display_length
+        return min(length, self.max_display_length)
+
+    def get_sort(self):
+        # Only the first sort column is honoured, the id breaks the ties.
+        try:
+            index = int(self._querydict.get('order[0][column]', ''))
+            column = self.columns_data[index]['data']
+        except (ValueError, IndexError):
+            return 'id', True
+        if column not in self.columns:
+            return 'id', True
+        return column, self._querydict.get('order[0][dir]') == 'desc'
+
+    def get_order_by(self, column, descending):
+        prefix = '-' if descending else ''
+        if column == 'id':
+            return [prefix + 'id']
+        return [prefix + column, prefix + 'id']
+
+    def get_seek(self, cursor, column, descending):
+        cursor_column, cursor_descending, value, pk = decode_cursor(cursor)
+        if (cursor_column, cursor_descending) != (column, descending):
+            raise ValueError('The cursor belongs to another ordering.')
+        if value is not None and column != 'id':
+            value = resolve_field(self.model, column).to_python(value)
+        nulls_largest = connections[self.model._default_manager.db]\
+            .features.nulls_order_largest
+        return seek(column, descending, value, pk, nulls_largest)
+
+    def filter_queryset(self, qs):
+        search = self._querydict.get('search[value]', '').strip()
+        if search and self.search_columns:
+            condition = Q()
+            for column in self.search_columns:
+                condition |= Q(**{column + '__startswith': search})
+            qs = qs.filter(condition)
+        for column_data in self.columns_data:
+            column = column_data['data']
+            value = (column_data['search.value'] or '').strip()
+            if value and column in self.columns:
+                qs = qs.filter(self.get_column_filter(column, value))
+        return qs
+
+    def get_column_filter(self, column, value):
+        field = resolve_field(self.model, column)
+        if isinstance(field, models.DateTimeField):
+            # A day, as a range on the column rather than a cast of it.
+            day = models.DateField().to_python(value)
+            start = timezone.make_aware(
+                datetime.datetime.combine(day, datetime.time()))
+            return Q(**{column + '__gte': start,
+                        column + '__lt': start + datetime.timedelta(days=1)})
+        lookup = self.lookups.get(column, 'exact')
+        return Q(**{column + LOOKUP_SEP + lookup: field.to_python(value)})
+
+    def prepare_row(self, row):
+        return {name: escape(value) if isinstance(value, str) else value
+                for name, value in row.items()}
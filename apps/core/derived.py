@@ -0,0 +1,107 @@
+"""
+Columns computed from other columns of the same row.
+
+Models list their derived columns in a ``DERIVED`` dict and use
+DerivedQuerySet as their manager. The values are then kept right by save(),
+bulk_create(), bulk_update() and QuerySet.update(), and can be recomputed
+for a whole table with a single UPDATE through recompute_derived().
+"""
+from django.db import models
+from django.db.models import ExpressionWrapper, F, Value
+
+from apps.core.ordering import ChronologicalQuerySet
+
+
+class Derived(object):
+    """
+    A derived column.
+
+    ``compute`` receives the source values, in the order of ``sources``, and
+    must work both on plain Python values and on query expressions. When
+    ``strict`` is set the result is None as soon as one source is None,
+    which mirrors NULL propagation in SQL arithmetic.
+    """
+
+    def __init__(self, sources, compute, expression=None, strict=True):
+        self.sources = tuple(sources)
+        self.compute = compute
+        self.expression = expression or compute
+        self.strict = strict
+
+    def value(self, instance):
+        values = [getattr(instance, source) for source in self.sources]
+        if self.strict and any(value is None for value in values):
+            return None
+        return self.compute(*values)
+
+    def as_expression(self, field, overrides=None):
+        """
+        SQL expression of the column. ``overrides`` maps source names to the
+        values or expressions they are being updated to, so the result
+        reflects the row after the update.
+        """
+        overrides = overrides or {}
+        arguments = []
+        for source in self.sources:
+            value = overrides.get(source, F(source))
+            if not hasattr(value, 'resolve_expression'):
+                value = Value(value)
+            arguments.append(value)
+        return ExpressionWrapper(self.expression(*arguments),
+                                 output_field=field.__class__())
+
+
+def compute_derived(instance):
+    """
+    Set every derived column of an instance from its current values.
+    """
+    for name, derived in instance.DERIVED.items():
+        value = derived.value(instance)
+        field = instance._meta.get_field(name)
+        if value is not None and isinstance(field, models.IntegerField):
+            value = int(round(value))
+        setattr(instance, name, value)
+
+
+class DerivedQuerySet(ChronologicalQuerySet):
+
+    def _derived_expressions(self, overrides=None):
+        expressions = {}
+        for name, derived in self.model.DERIVED.items():
+            if overrides is not None and (
+                    name in overrides or
+                    not set(derived.sources).intersection(overrides)):
+                continue
+            field = self.model._meta.get_field(name)
+            expressions[name] = derived.as_expression(field, overrides)
+        return expressions
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            compute_derived(obj)
+        return super(DerivedQuerySet, self).bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        fields = list(fields)
+        for name, derived in self.model.DERIVED.items():
+            if name not in fields and set(derived.sources).intersection(fields):
+                fields.append(name)
+        for obj in objs:
+            compute_derived(obj)
+        return super(DerivedQuerySet, self).bulk_update(
+            objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        kwargs.update(self._derived_expressions(overrides=kwargs))
+        return super(DerivedQuerySet, self).update(**kwargs)
+    update.alters_data = True
+
+    def recompute_derived(self):
+        """
+        Recompute every derived column of the selected rows in one UPDATE.
+        """
+        return super(DerivedQuerySet, self).update(
+            **self._derived_expressions())
+    recompute_derived.alters_data = True
@@ -0,0 +1,24 @@
+"""
+Opt-in ordering for the record models.
+
+The models of breeders, customer, chicks and hatchery have no default
+Meta.ordering, so plain querysets, counts and admin changelists do not sort
+the whole table. Code that needs rows in creation order asks for it, and
+the (created) and (foreign key, created) indexes of the models serve it:
+
+    Candling.objects.chronological()
+    customer.eggsetting_customer.latest_first()[:10]
+
+ChronologicalQuerySet builds on TimestampedQuerySet (apps.core.timestamps),
+whose update() and bulk_update() keep the auto_now columns right.
+"""
+from apps.core.timestamps import TimestampedQuerySet
+
+
+class ChronologicalQuerySet(TimestampedQuerySet):
+
+    def chronological(self):
+        return self.order_by('created')
+
+    def latest_first(self):
+        return self.order_by('-created')
@@ -0,0 +1,53 @@
+"""
+Pagination of large tables without COUNT(*).
+
+EstimatedCountPaginator answers the count of an unfiltered queryset on
+PostgreSQL from the planner statistics in pg_class, which costs nothing,
+once the table is past ``threshold`` rows. Filtered querysets, small tables
+and other databases fall back to an exact count.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+
+def estimated_count(model, using='default'):
+    """
+    Planner estimate of the number of rows of a model's table, or None
+    where no estimate is available.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class '
+                       'WHERE oid = to_regclass(%s)',
+                       [connection.ops.quote_name(model._meta.db_table)])
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def approximate_count(queryset, threshold=100000):
+    """
+    The planner estimate for an unfiltered queryset over a table past
+    ``threshold`` rows, the exact count otherwise.
+    """
+    query = queryset.query
+    if not query.where and not query.distinct and not query.is_sliced:
+        estimate = estimated_count(queryset.model, using=queryset.db)
+        if estimate is not None and estimate >= threshold:
+            return estimate
+    return queryset.count()
+
+
+class EstimatedCountPaginator(Paginator):
+    threshold = 100000
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            return approximate_count(self.object_list, self.threshold)
+        return super(EstimatedCountPaginator, self).count
@@ -1,5 +1,5 @@
 """
-We need this module when storing files in S3 as the S3BotoStorage backend
+We need this module when storing files in S3 as the S3Boto3Storage backend
 always uses the bucket name as the root by default, but we don't want to create
 two separate buckets for static and media files.
 
@@ -7,20 +7,66 @@ We basically want:
     /bucket-name/media/ for media files
     /bucket-name/static/ for static files
 
+Media files are content-addressed (see apps/core/storage.py): an upload
+whose content is already in the bucket is not sent again. Large files go
+up in parallel multipart chunks, over the connection pool of the storage's
+client, which is kept for the life of the thread.
+
+Any S3-compatible service works, e.g. a local MinIO with
+AWS_S3_ENDPOINT_URL=http://localhost:9000 and AWS_S3_ADDRESSING_STYLE=path.
+
 Source: http://stackoverflow.com/questions/10390244/how-to-set-up-a-django-\
         project-with-django-storages-and-amazon-s3-but-with-diff
 """
+import os
+
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from django.utils.deconstruct import deconstructible
+from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import setting
+
+from apps.core.storage import ContentAddressedStorageMixin
+
+MB = 1024 * 1024
+
+
+@deconstructible
+class ContentAddressedS3Storage(ContentAddressedStorageMixin, S3Boto3Storage):
+    """
+    S3Boto3Storage naming the files after their content.
+    """
+    # Content-addressed names are only ever written with the same content.
+    file_overwrite = True
+    max_pool_connections = setting('AWS_S3_MAX_POOL_CONNECTIONS', 20)
+    transfer_config = TransferConfig(
+        multipart_threshold=8 * MB, multipart_chunksize=8 * MB,
+        max_concurrency=4)
+    immutable_cache_control = 'max-age=31536000, public, immutable'
+
+    def __init__(self, *args, **kwargs):
+        super(ContentAddressedS3Storage, self).__init__(*args, **kwargs)
+        # Room for the multipart uploads' threads, which share the client.
+        self.config = self.config.merge(
+            Config(max_pool_connections=self.max_pool_connections))
 
-from django.conf import settings
+    def _save(self, name, content):
+        cleaned_name = self._clean_name(name)
+        name = self._normalize_name(cleaned_name)
+        params = self._get_write_parameters(name, content)
+        if self.is_content_addressed(cleaned_name):
+            params.setdefault('CacheControl', self.immutable_cache_control)
+        content.seek(0, os.SEEK_SET)
+        self.bucket.Object(self._encode_name(name)).upload_fileobj(
+            content, ExtraArgs=params, Config=self.transfer_config)
+        return cleaned_name
 
-from storages.backends.s3boto import S3BotoStorage
 
+@deconstructible
+class MediaRootS3BotoStorage(ContentAddressedS3Storage):
+    location = 'media'
 
-MediaRootS3BotoStorage = lambda: S3BotoStorage(
-    location=settings.MEDIA_ROOT,
-    file_overwrite=False
-)
 
-StaticRootS3BotoStorage = lambda: S3BotoStorage(
-    location=settings.STATIC_ROOT
-)
\ No newline at end of file
+@deconstructible
+class StaticRootS3BotoStorage(S3Boto3Storage):
+    location = 'static'
@@ -0,0 +1,89 @@
+"""
+Content-addressed file storage.
+
+Uploads are stored under the SHA-256 of their content instead of the name
+they were sent with:
+
+    customer_photos/jane.jpg -> customer_photos/3f/a2/3fa2...e1.jpg
+
+so the same photo uploaded for a thousand records is written, and sent to
+the bucket, once: when the name already exists the upload is skipped. The
+directory of the field's upload_to and the lower-cased extension are kept.
+
+As several records may point at one file, delete() leaves content-addressed
+files alone; purge() removes them, once nothing refers to them (see the
+purge_media command). Names under ``exempt_prefixes`` - the renditions,
+whose names are derived from the content-addressed original - are saved and
+deleted as usual.
+"""
+import hashlib
+import posixpath
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+def file_digest(content):
+    """
+    SHA-256 hex digest of a File, read in chunks.
+    """
+    sha = hashlib.sha256()
+    for chunk in content.chunks():
+        sha.update(chunk)
+    content.seek(0)
+    return sha.hexdigest()
+
+
+class ContentAddressedStorageMixin(object):
+    """
+    Mixed in before a Storage class to name the saved files after their
+    content.
+    """
+    exempt_prefixes = ('renditions/',)
+
+    def is_content_addressed(self, name):
+        return not name.replace('\\', '/').startswith(self.exempt_prefixes)
+
+    def content_name(self, name, digest):
+        directory, filename = posixpath.split(name.replace('\\', '/'))
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest[:2], digest[2:4],
+                              digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not self.is_content_addressed(name):
+            return super(ContentAddressedStorageMixin, self).save(
+                name, content, max_length=max_length)
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.content_name(name, file_digest(content))
+        if max_length is not None and len(name) > max_length:
+            raise SuspiciousFileOperation(
+                'Storage can not find an available filename for "%s". '
+                'Please make sure that the corresponding file field '
+                'allows sufficient "max_length".' % name)
+        if self.exists(name):
+            return name
+        return self._save(name, content)
+
+    def delete(self, name):
+        # Other records may hold the same file.
+        if not self.is_content_addressed(name):
+            super(ContentAddressedStorageMixin, self).delete(name)
+
+    def purge(self, name):
+        """
+        Delete a file, content-addressed or not.
+        """
+        super(ContentAddressedStorageMixin, self).delete(name)
+
+
+class ContentAddressedFileSystemStorage(ContentAddressedStorageMixin,
+                                        FileSystemStorage):
+    """
+    Content-addressed storage in MEDIA_ROOT, for development and for
+    deployments without a bucket.
+    """
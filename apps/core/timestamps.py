@@ -0,0 +1,49 @@
+"""
+Bulk writes that keep the auto_now columns right.
+
+Django only sets auto_now columns (``updated``) in save(). The update() and
+bulk_update() of TimestampedQuerySet set them too, so change tracking - the
+delta sync, the dashboard refresh - sees every write. As these writes send
+no signals, they also move the model to a new cache version (see
+apps.core.cache) once the transaction commits.
+"""
+from functools import partial
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from apps.core import cache
+
+
+class TimestampedQuerySet(models.QuerySet):
+
+    def _invalidate(self):
+        transaction.on_commit(partial(cache.invalidate, self.model))
+
+    def _auto_now_fields(self):
+        return [field.name for field in self.model._meta.concrete_fields
+                if getattr(field, 'auto_now', False)]
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs, fields = list(objs), list(fields)
+        now = timezone.now()
+        for name in self._auto_now_fields():
+            if name not in fields:
+                fields.append(name)
+            for obj in objs:
+                setattr(obj, name, now)
+        result = super(TimestampedQuerySet, self).bulk_update(
+            objs, fields, *args, **kwargs)
+        if objs:
+            self._invalidate()
+        return result
+
+    def update(self, **kwargs):
+        now = timezone.now()
+        for name in self._auto_now_fields():
+            kwargs.setdefault(name, now)
+        rows = super(TimestampedQuerySet, self).update(**kwargs)
+        if rows:
+            self._invalidate()
+        return rows
+    update.alters_data = True
@@ -2,10 +2,8 @@ import logging
 
 from django.views.generic import TemplateView, FormView, View
 from django.contrib import messages
-from django.core.mail import EmailMessage
 from django.conf import settings
 
-import mailchimp
 from braces.views import (
     AjaxResponseMixin,
     JSONResponseMixin,
@@ -14,6 +12,8 @@ from braces.views import (
 
 from glucoses.models import Glucose
 
+from apps.subscribers import tasks
+
 from .forms import ContactForm
 
 
@@ -65,14 +65,12 @@ class HelpPageView(LoginRequiredMixin, FormView):
                 self.request.user.username,
                 form.cleaned_data['message'])
 
-            email = EmailMessage(
-                from_email=support_email,
+            tasks.send_email.delay(
                 subject='[Help] %s ' % form.cleaned_data['subject'],
                 body=message,
+                from_email=support_email,
                 to=[support_email])
 
-            email.send()
-
             return self.form_valid(form)
         else:
             return self.form_invalid(form)
@@ -84,7 +82,7 @@ class MailingListSignupAjaxView(JSONResponseMixin, AjaxResponseMixin, View):
     """
 
     def post_ajax(self, request, *args, **kwargs):
-        email = request.POST.get('email').strip().lower()
+        email = request.POST.get('email', '').strip().lower()
         mailchimp_list_id = settings.MAILCHIMP_LIST_ID
 
         response_dict = {
@@ -92,21 +90,11 @@ class MailingListSignupAjaxView(JSONResponseMixin, AjaxResponseMixin, View):
                 email, mailchimp_list_id),
         }
 
-        mc = mailchimp.Mailchimp(settings.MAILCHIMP_API_KEY)
-
-        try:
-            mc.lists.subscribe(
-                id=mailchimp_list_id,
-                email={'email': email},
-                update_existing=True,
-                double_optin=True,
-            )
-            logger.info('%s successfully subscribed to %s', email,
-                        mailchimp_list_id)
-        except mailchimp.Error, e:
-            logger.error('A MailChimp error occurred: %s', e)
-
-            response_dict['message'] = 'Sorry, an error occurred.'
-            return self.render_json_response(response_dict, status=500)
+        if not email:
+            response_dict['message'] = 'Please enter an email address.'
+            return self.render_json_response(response_dict, status=400)
+
+        # The MailChimp call happens in a worker, errors are logged there.
+        tasks.mailchimp_subscribe.delay(email, mailchimp_list_id)
 
         return self.render_json_response(response_dict)
\ No newline at end of file
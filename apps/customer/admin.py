@@ -1,3 +1,83 @@
-from django.contrib import admin
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.contrib import admin, messages
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 
-# Register your models here.
+from apps.customer.forms import EggsImportForm
+from apps.customer.importers import import_eggs
+from apps.customer.models import Customer, CustomerRequest, Eggs
+from apps.hatchery.admin import CustomerCodeFilter, RecordAdmin
+from apps.images.renditions import thumbnail
+from apps.search.admin import SearchIndexMixin
+
+
+@admin.register(Customer)
+class CustomerAdmin(SearchIndexMixin, RecordAdmin):
+    list_display = (thumbnail('photo'), 'customercode', 'full_name', 'phone',
+                    'email', 'customertype', 'created')
+    search_fields = ('=customercode', 'full_name', 'phone', 'email')
+    search_kind = 'customer'
+    readonly_fields = ('full_name',)
+
+
+@admin.register(Eggs)
+class EggsAdmin(SearchIndexMixin, RecordAdmin):
+    list_display = (thumbnail('photo'), 'batchnumber', 'customer', 'breed',
+                    'brought', 'returned', 'received', 'created')
+    list_select_related = ('customer', 'breed')
+    list_filter = (CustomerCodeFilter, 'breed')
+    search_fields = ('=batchnumber',)
+    search_kind = 'eggs'
+    autocomplete_fields = ('customer', 'breed')
+    readonly_fields = ('received',)
+
+    def get_urls(self):
+        urls = [
+            path('import/', self.admin_site.admin_view(self.import_view),
+                 name='customer_eggs_import'),
+        ]
+        return urls + super(EggsAdmin, self).get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            return redirect('admin:customer_eggs_changelist')
+
+        form = EggsImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                result = import_eggs(upload.file, upload.name,
+                                     dry_run=form.cleaned_data['dry_run'])
+            except ValueError as e:
+                messages.error(request, e)
+            else:
+                level = messages.WARNING if result.skipped else \
+                    messages.SUCCESS
+                messages.add_message(request, level, 'Import: %s.' % result)
+                for error in result.errors:
+                    messages.warning(request, error)
+                return redirect('admin:customer_eggs_changelist')
+
+        context = dict(
+            self.admin_site.each_context(request),
+            opts=self.model._meta,
+            form=form,
+            title='Import eggs',
+        )
+        return TemplateResponse(
+            request, 'admin/customer/eggs/import.html', context)
+
+
+@admin.register(CustomerRequest)
+class CustomerRequestAdmin(RecordAdmin):
+    list_display = ('requestcode', 'eggs', 'created')
+    list_select_related = ('eggs',)
+    search_fields = ('=requestcode',)
+    autocomplete_fields = ('eggs',)
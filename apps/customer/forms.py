@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django import forms
+
+
+class EggsImportForm(forms.Form):
+    file = forms.FileField(
+        help_text='CSV or XLSX file with the columns batchnumber, customer, '
+                  'customercode, breed, brought and returned.')
+    dry_run = forms.BooleanField(
+        required=False, help_text='Validate the file without saving.')
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Bulk import of egg intake records from CSV or XLSX files.
+
+Files are read row by row, so memory use does not grow with the size of the
+upload. Customers and breeds are resolved through dictionaries loaded once
+per import and valid rows are written with bulk_create in batches, then
+added to the search index.
+
+Expected columns (see static/samples/eggs_import_template.csv):
+    batchnumber, customer, customercode, breed, brought, returned
+
+``customer`` is the customer's full name, email or phone number and
+``breed`` is the breed code or name.
+"""
+import csv
+import io
+import os
+
+from django.db import transaction
+from django.db.models import Max
+
+from apps.breeders.models import Breed
+from apps.customer.models import Customer, Eggs
+from apps.search import index
+
+COLUMNS = ('batchnumber', 'customer', 'customercode', 'breed', 'brought',
+           'returned')
+
+# Stop collecting error messages past this point, the count keeps going.
+MAX_ERRORS = 100
+
+
+class ImportResult(object):
+
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append('Line {}: {}'.format(line, message))
+
+    def __str__(self):
+        return '{} created, {} skipped'.format(self.created, self.skipped)
+
+
+def _normalize(value):
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def iter_csv(fileobj):
+    if isinstance(fileobj, io.TextIOBase):
+        text = fileobj
+    else:
+        text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [_normalize(column).lower() for column in header]
+    for values in reader:
+        yield dict(zip(header, values))
+
+
+def iter_xlsx(fileobj):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [_normalize(column).lower() for column in header]
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_rows(fileobj, filename):
+    """
+    Yield each data row of a CSV or XLSX file as a dict keyed by the
+    lower-cased header.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        return iter_xlsx(fileobj)
+    if extension in ('.csv', '.txt', ''):
+        return iter_csv(fileobj)
+    raise ValueError('Unsupported file type: {}'.format(extension))
+
+
+def customer_lookup():
+    """
+    Map lower-cased full names, emails and phone numbers to customer ids.
+    """
+    lookup = {}
+    rows = Customer.objects.order_by().values_list(
+        'id', 'full_name', 'email', 'phone')
+    for customer_id, full_name, email, phone in rows.iterator():
+        for key in (full_name, email, phone):
+            key = _normalize(key).lower()
+            if key:
+                lookup.setdefault(key, customer_id)
+    return lookup
+
+
+def breed_lookup():
+    """
+    Map lower-cased breed codes and names to breed ids.
+    """
+    lookup = {}
+    rows = Breed.objects.order_by().values_list('id', 'code', 'breed')
+    for breed_id, code, name in rows.iterator():
+        for key in (code, name):
+            key = _normalize(key).lower()
+            if key:
+                lookup.setdefault(key, breed_id)
+    return lookup
+
+
+class EggsImporter(object):
+    """
+    Validate rows and bulk create Eggs records in batches of batch_size.
+    """
+
+    def __init__(self, batch_size=1000, dry_run=False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.customers = customer_lookup()
+        self.breeds = breed_lookup()
+
+    def build(self, row):
+        """
+        Return an unsaved Eggs for a row, or raise ValueError.
+        """
+        batchnumber = _normalize(row.get('batchnumber'))
+        if not batchnumber:
+            raise ValueError('batchnumber is required.')
+
+        customer_id = None
+        customer = _normalize(row.get('customer')).lower()
+        if customer:
+            customer_id = self.customers.get(customer)
+            if customer_id is None:
+                raise ValueError('unknown customer "{}".'.format(customer))
+
+        breed_id = None
+        breed = _normalize(row.get('breed')).lower()
+        if breed:
+            breed_id = self.breeds.get(breed)
+            if breed_id is None:
+                raise ValueError('unknown breed "{}".'.format(breed))
+
+        counts = {}
+        for column in ('brought', 'returned'):
+            value = _normalize(row.get(column)) or '0'
+            try:
+                counts[column] = int(float(value))
+            except ValueError:
+                raise ValueError('{} must be a number.'.format(column))
+            if counts[column] < 0:
+                raise ValueError('{} cannot be negative.'.format(column))
+        if counts['returned'] > counts['brought']:
+            raise ValueError('returned cannot exceed brought.')
+
+        return Eggs(
+            batchnumber=batchnumber,
+            customer_id=customer_id,
+            breed_id=breed_id,
+            customercode=_normalize(row.get('customercode')) or None,
+            brought=counts['brought'],
+            returned=counts['returned'],
+        )
+
+    def run(self, rows):
+        result = ImportResult()
+        batch = []
+        # Line 1 is the header.
+        for line, row in enumerate(rows, 2):
+            if not any(_normalize(value) for value in row.values()):
+                continue
+            try:
+                batch.append(self.build(row))
+            except ValueError as e:
+                result.add_error(line, e)
+                continue
+            if len(batch) >= self.batch_size:
+                self.flush(batch, result)
+                batch = []
+        self.flush(batch, result)
+        return result
+
+    def flush(self, batch, result):
+        if not batch:
+            return
+        if not self.dry_run:
+            with transaction.atomic():
+                # bulk_create does not return the ids on every database.
+                last_id = Eggs.objects.aggregate(last=Max('id'))['last'] or 0
+                Eggs.objects.bulk_create(batch, batch_size=self.batch_size)
+            # Indexing rows another writer added meanwhile does no harm.
+            index.update_objects(Eggs.objects.filter(id__gt=last_id),
+                                 batch_size=self.batch_size)
+        result.created += len(batch)
+
+
+def import_eggs(fileobj, filename, batch_size=1000, dry_run=False):
+    """
+    Import egg intake records from an open CSV or XLSX file.
+    """
+    importer = EggsImporter(batch_size=batch_size, dry_run=dry_run)
+    return importer.run(iter_rows(fileobj, filename))
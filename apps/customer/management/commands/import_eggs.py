@@ -0,0 +1,31 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.customer.importers import import_eggs
+
+
+class Command(BaseCommand):
+    help = 'Import egg intake records from a CSV or XLSX file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file to import.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of rows written per INSERT.')
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Validate the file without saving anything.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as fileobj:
+                result = import_eggs(fileobj, options['path'],
+                                     batch_size=options['batch_size'],
+                                     dry_run=options['dry_run'])
+        except (IOError, ValueError) as e:
+            raise CommandError(e)
+
+        for error in result.errors:
+            sys.stderr.write('%s\n' % error)
+        self.stdout.write('Import: %s.\n' % result)
@@ -0,0 +1,30 @@
+# Generated by Django 3.1.2 on 2020-10-31 10:12
+
+from django.db import migrations, models
+
+from apps.core.codes import fill_codes
+
+
+def fill(apps, schema_editor):
+    fill_codes(apps.get_model('customer', 'Customer'), 'customercode', 'CUS')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='customercode',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='full_name',
+            field=models.CharField(blank=True, db_index=True, max_length=50, null=True),
+        ),
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
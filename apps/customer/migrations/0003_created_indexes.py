@@ -0,0 +1,49 @@
+# Generated by Django 3.1.2 on 2020-11-04 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0002_customer_customercode'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='customer',
+            options={'managed': True, 'verbose_name': 'Customer', 'verbose_name_plural': 'Customers'},
+        ),
+        migrations.AlterModelOptions(
+            name='customerrequest',
+            options={'managed': True, 'verbose_name': 'CustomerRequest', 'verbose_name_plural': 'CustomerRequests'},
+        ),
+        migrations.AlterModelOptions(
+            name='eggs',
+            options={'managed': True, 'verbose_name': 'Egg', 'verbose_name_plural': 'Eggs'},
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['created'], name='customers_created'),
+        ),
+        migrations.AddIndex(
+            model_name='customerrequest',
+            index=models.Index(fields=['created'], name='customerrequests_created'),
+        ),
+        migrations.AddIndex(
+            model_name='customerrequest',
+            index=models.Index(fields=['eggs', 'created'], name='customerrequests_eggs_created'),
+        ),
+        migrations.AddIndex(
+            model_name='eggs',
+            index=models.Index(fields=['created'], name='eggs_created'),
+        ),
+        migrations.AddIndex(
+            model_name='eggs',
+            index=models.Index(fields=['customer', 'created'], name='eggs_customer_created'),
+        ),
+        migrations.AddIndex(
+            model_name='eggs',
+            index=models.Index(fields=['breed', 'created'], name='eggs_breed_created'),
+        ),
+    ]
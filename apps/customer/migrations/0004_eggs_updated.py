@@ -0,0 +1,22 @@
+# Generated by Django 3.1.2 on 2020-11-06 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0003_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eggs',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='eggs',
+            index=models.Index(fields=['updated', 'id'], name='eggs_updated'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.1.2 on 2020-11-09 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0004_eggs_updated'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, upload_to='customer_photos'),
+        ),
+        migrations.AlterField(
+            model_name='eggs',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, upload_to='eggs_photos'),
+        ),
+    ]
@@ -11,16 +11,17 @@ import datetime
 from django.core.validators import MaxValueValidator, MinValueValidator
 
 from django.db import models
-from django.db.models import ImageField
+from django.db.models import ImageField, Value
+from django.db.models.functions import Concat
 from django.utils.safestring import mark_safe
 from django.template.defaultfilters import truncatechars, slugify  # or truncatewords
 from django.contrib.gis.db import models as gismodels
 
-from imagekit.models import ProcessedImageField
-from imagekit.processors import ResizeToFit
-
 from telelbirds import settings
 from apps.breeders.models import Breeders, Breed
+from apps.core.codes import save_with_code
+from apps.core.derived import Derived, DerivedQuerySet, compute_derived
+from apps.core.ordering import ChronologicalQuerySet
 
 
 class Customer(models.Model):
@@ -30,8 +31,9 @@ class Customer(models.Model):
     id = models.AutoField(primary_key=True)
     first_name=models.CharField(null=True,blank=True,max_length=50)
     last_name=models.CharField(null=True,blank=True,max_length=50)
-    full_name=models.CharField(null=True,blank=True,max_length=50)
-    photo = ProcessedImageField(upload_to='customer_photos',null=True,blank=True, processors=[ResizeToFit(1280)], format='JPEG', options={'quality': 70})
+    full_name=models.CharField(null=True,blank=True,max_length=50,db_index=True)
+    customercode=models.CharField(null=True,blank=True,max_length=50,unique=True)
+    photo = models.ImageField(upload_to='customer_photos',null=True,blank=True)
     email=models.EmailField(null=True,blank=True,max_length=50)
     phone=models.CharField(null=True,blank=True,max_length=15)
     address=models.CharField(null=True,blank=True,max_length=50)
@@ -50,22 +52,35 @@ class Customer(models.Model):
     followup=models.BooleanField(null=True,blank=True,max_length=50)
     created = models.DateTimeField(auto_now_add=True)
 
+    DERIVED = {
+        'full_name': Derived(
+            ('first_name', 'last_name'),
+            lambda first, last: (first or '') + ' ' + (last or ''),
+            expression=lambda first, last: Concat(first, Value(' '), last),
+            strict=False),
+    }
+
+    objects = DerivedQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "customers"
         verbose_name = 'Customer'
         verbose_name_plural = "Customers"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='customers_created'),
+        ]
 
     def save(self, *args, **kwargs):
-        self.full_name = self.first_name + " " + self.last_name
-        super(Customer, self).save(*args, **kwargs)
+        compute_derived(self)
+        save_with_code(self, 'customercode', 'CUS',
+                       lambda: super(Customer, self).save(*args, **kwargs))
 
     def __str__(self):
-        return self.last_name + ", " + self.first_name
+        return '{}, {}'.format(self.last_name or '', self.first_name or '')
     
     def get_absolute_url(self):
-        return '/customer/{}'.format(self.full_name)
+        return '/customer/{}'.format(self.customercode)
 
 
 class Eggs(models.Model):
@@ -81,25 +96,40 @@ class Eggs(models.Model):
         related_name="eggs_breed", blank=True, null=True,
         on_delete=models.SET_NULL)
     customercode = models.CharField(null=True,blank=True,max_length=50)
-    photo = ProcessedImageField(upload_to='eggs_photos',null=True,blank=True, processors=[ResizeToFit(1280)], format='JPEG', options={'quality': 70})
+    photo = models.ImageField(upload_to='eggs_photos',null=True,blank=True)
     brought = models.IntegerField(null=True,blank=True)
     returned = models.IntegerField(null=True,blank=True)
     received=models.IntegerField(null=True,blank=True,max_length=50) 
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    DERIVED = {
+        'received': Derived(('brought', 'returned'),
+                            lambda brought, returned: brought - returned),
+    }
+
+    objects = DerivedQuerySet.as_manager()
 
     class Meta:
-        ordering = ['created']
         db_table = "eggs"
         verbose_name = 'Egg'
         verbose_name_plural = "Eggs"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='eggs_created'),
+            models.Index(fields=['updated', 'id'], name='eggs_updated'),
+            models.Index(fields=['customer', 'created'],
+                         name='eggs_customer_created'),
+            models.Index(fields=['breed', 'created'],
+                         name='eggs_breed_created'),
+        ]
 
     def save(self, *args, **kwargs):
-        self.received = self.brought - self.returned
+        compute_derived(self)
         super(Eggs, self).save(*args, **kwargs)
 
     def __str__(self):
-        return self.batchnumber
+        return self.batchnumber or ''
     
     def get_absolute_url(self):
         return '/customer_eggs/{}'.format(self.batchnumber)
@@ -116,12 +146,18 @@ class CustomerRequest(models.Model):
         on_delete=models.SET_NULL) 
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = ChronologicalQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "CustomerRequests"
         verbose_name = 'CustomerRequest'
         verbose_name_plural = "CustomerRequests"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='customerrequests_created'),
+            models.Index(fields=['eggs', 'created'],
+                         name='customerrequests_eggs_created'),
+        ]
     
     def get_absolute_url(self):
         return '/customer_request/{}'.format(self.requestcode)
\ No newline at end of file
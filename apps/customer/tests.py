@@ -1,3 +1,92 @@
+import io
+
+from django.db.models import F
 from django.test import TestCase
 
-# Create your tests here.
+from apps.breeders.models import Breed
+from apps.customer.importers import import_eggs
+from apps.customer.models import Customer, Eggs
+from apps.search import index
+from apps.search.backends import get_backend
+
+
+class EggsImportTest(TestCase):
+
+    def setUp(self):
+        self.customer = Customer.objects.create(
+            first_name='Jane', last_name='Doe', email='jane@example.com')
+        self.breed = Breed.objects.create(code='KUR', breed='Kuroiler')
+        # Imported rows go to the search backend, which outlives the test.
+        self.addCleanup(get_backend().reset)
+
+    def import_csv(self, text, **kwargs):
+        return import_eggs(io.BytesIO(text.encode('utf-8')), 'eggs.csv',
+                           **kwargs)
+
+    def test_import_resolves_lookups_in_batches(self):
+        lines = ['batchnumber,customer,customercode,breed,brought,returned']
+        lines += ['EGG-{0},Jane Doe,C-1,kur,{0},1'.format(i)
+                  for i in range(1, 26)]
+        result = self.import_csv('\n'.join(lines), batch_size=10)
+
+        self.assertEqual(result.created, 25)
+        self.assertEqual(result.skipped, 0)
+        eggs = Eggs.objects.get(batchnumber='EGG-10')
+        self.assertEqual(eggs.customer, self.customer)
+        self.assertEqual(eggs.breed, self.breed)
+        self.assertEqual(eggs.received, 9)
+
+    def test_imported_rows_are_searchable(self):
+        self.import_csv('batchnumber,brought,returned\nEGG-77,5,0\n'
+                        'EGG-78,5,0\n', batch_size=1)
+        self.assertEqual(
+            [entry.title for entry in index.search('egg-7', kinds=['eggs'])],
+            ['EGG-77', 'EGG-78'])
+
+    def test_invalid_rows_are_reported(self):
+        result = self.import_csv(
+            'batchnumber,customer,breed,brought,returned\n'
+            'EGG-1,jane@example.com,Kuroiler,10,2\n'
+            'EGG-2,Nobody,KUR,10,2\n'
+            'EGG-3,,KUR,2,10\n'
+            ',,,,\n')
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.skipped, 2)
+        self.assertIn('Line 3', result.errors[0])
+        self.assertIn('Line 4', result.errors[1])
+
+    def test_dry_run_saves_nothing(self):
+        result = self.import_csv('batchnumber,brought,returned\nEGG-1,5,0\n',
+                                 dry_run=True)
+        self.assertEqual(result.created, 1)
+        self.assertFalse(Eggs.objects.exists())
+
+
+class DerivedFieldsTest(TestCase):
+
+    def test_bulk_create_and_update_keep_received(self):
+        Eggs.objects.bulk_create([
+            Eggs(batchnumber='A', brought=10, returned=1),
+            Eggs(batchnumber='B', brought=20, returned=None),
+        ])
+        self.assertEqual(Eggs.objects.get(batchnumber='A').received, 9)
+        self.assertIsNone(Eggs.objects.get(batchnumber='B').received)
+
+        Eggs.objects.filter(batchnumber='B').update(returned=5)
+        self.assertEqual(Eggs.objects.get(batchnumber='B').received, 15)
+
+        Eggs.objects.update(brought=F('brought') + 10)
+        self.assertEqual(
+            list(Eggs.objects.order_by('batchnumber')
+                 .values_list('received', flat=True)), [19, 25])
+
+    def test_recompute_derived(self):
+        customer = Customer.objects.create(first_name='Jane', last_name='Doe')
+        Customer.objects.filter(pk=customer.pk).update(last_name='Roe')
+        self.assertEqual(Customer.objects.get(pk=customer.pk).full_name,
+                         'Jane Roe')
+
+        Customer.objects.all().recompute_derived()
+        self.assertEqual(Customer.objects.get(pk=customer.pk).full_name,
+                         'Jane Roe')
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from apps.customer.views import CustomerDetailView, EggsDatatableView
+
+urlpatterns = [
+    path('customer/<str:code>', CustomerDetailView.as_view(),
+         name='customer_detail'),
+    path('records/eggs', EggsDatatableView.as_view(), name='eggs_records'),
+]
@@ -1,3 +1,23 @@
-from django.shortcuts import render
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from apps.core.datatables import KeysetDatatableView
+from apps.customer.models import Customer, Eggs
+from apps.hatchery.views import CodeDetailView
 
-# Create your views here.
+
+class CustomerDetailView(CodeDetailView):
+    model = Customer
+    slug_field = 'customercode'
+
+
+class EggsDatatableView(KeysetDatatableView):
+    model = Eggs
+    columns = ['batchnumber', 'customer__customercode', 'customer__full_name',
+               'breed__breed', 'brought', 'returned', 'received', 'created']
+    search_columns = ['batchnumber', 'customer__customercode']
+    lookups = {'customer__full_name': 'istartswith', 'breed__breed': 'iexact'}
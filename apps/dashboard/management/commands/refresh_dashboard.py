@@ -0,0 +1,27 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.models import DailyRollup
+
+
+class Command(BaseCommand):
+    help = 'Refresh the daily dashboard rollups. Celery beat runs the same ' \
+           'refresh every few minutes; only the recent days and the days ' \
+           'with edited records are recomputed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since', type=datetime.date.fromisoformat, default=None,
+            help='Recompute every day from this one (YYYY-MM-DD) instead '
+                 'of the recent and edited days.')
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Recompute every day from the first record.')
+
+    def handle(self, *args, **options):
+        start = options['since']
+        if options['rebuild']:
+            DailyRollup.objects.all().delete()
+        days = DailyRollup.objects.refresh(start=start)
+        self.stdout.write('Refreshed %s day(s).\n' % days)
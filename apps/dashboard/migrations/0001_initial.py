@@ -0,0 +1,37 @@
+# Generated by Django 3.1.2 on 2020-10-27 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField(unique=True)),
+                ('eggs_received', models.IntegerField(default=0)),
+                ('eggs_candled', models.IntegerField(default=0)),
+                ('fertile_eggs', models.IntegerField(default=0)),
+                ('eggs_hatched', models.IntegerField(default=0)),
+                ('chicks_hatched', models.IntegerField(default=0)),
+                ('mortality', models.IntegerField(default=0)),
+                ('chicks_sold', models.IntegerField(default=0)),
+                ('sales', models.FloatField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'DailyRollup',
+                'verbose_name_plural': 'DailyRollups',
+                'db_table': 'daily_rollup',
+                'ordering': ['date'],
+                'managed': True,
+            },
+        ),
+    ]
@@ -1,3 +1,203 @@
-from django.db import models
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from __future__ import unicode_literals
+import datetime
+from collections import defaultdict
 
-# Create your models here.
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.chicks.models import Mortality, ChicksSold
+from apps.core import cache
+from apps.customer.models import Eggs
+from apps.hatchery import archive
+from apps.hatchery.models import ArchivedRecord, Candling, Hatching
+
+
+class DailyRollupManager(models.Manager):
+    # (model, {rollup field: summed column}) for every source table.
+    SOURCES = (
+        (Eggs, {'eggs_received': 'received'}),
+        (Candling, {'eggs_candled': 'eggs', 'fertile_eggs': 'fertile_eggs'}),
+        (Hatching, {'eggs_hatched': 'hatched',
+                    'chicks_hatched': 'chicks_hatched'}),
+        (Mortality, {'mortality': 'mortality'}),
+        (ChicksSold, {'chicks_sold': 'number', 'sales': 'sales'}),
+    )
+
+    def refresh(self, start=None, end=None):
+        """
+        Recompute the rollups of the days from start to end (inclusive).
+
+        By default the refresh covers the last DASHBOARD_REFRESH_DAYS days
+        up to today, or every day when nothing is rolled up yet, plus the
+        older days whose records were edited since the previous refresh.
+        Deletions are picked up within the trailing window only. Returns
+        the number of days written.
+        """
+        end = end or timezone.localdate()
+        if start is not None:
+            return self._refresh_days(start, end)
+
+        last = self.aggregate(last=models.Max('date'), refreshed=models.Max(
+            'updated'))
+        if last['last'] is None:
+            start = self._first_day() or end
+            return self._refresh_days(start, end)
+
+        window = getattr(settings, 'DASHBOARD_REFRESH_DAYS', 7)
+        start = min(last['last'], end - datetime.timedelta(days=window - 1))
+        written = self._refresh_days(start, end)
+        for day in self._edited_days(last['refreshed'], start):
+            written += self._refresh_days(day, day)
+        return written
+
+    def _edited_days(self, since, before):
+        """
+        Days before ``before`` holding records updated since ``since``.
+        """
+        tz = timezone.get_current_timezone()
+        days = set()
+        for model, _ in self.SOURCES:
+            days.update(
+                model.objects.filter(updated__gte=since)
+                .annotate(day=TruncDate('created', tzinfo=tz))
+                .filter(day__lt=before)
+                .values_list('day', flat=True).order_by().distinct())
+        return sorted(days)
+
+    def _refresh_days(self, start, end):
+        if start > end:
+            return 0
+
+        tz = timezone.get_current_timezone()
+        since = timezone.make_aware(
+            datetime.datetime.combine(start, datetime.time.min), tz)
+        until = timezone.make_aware(
+            datetime.datetime.combine(end + datetime.timedelta(days=1),
+                                      datetime.time.min), tz)
+
+        days = defaultdict(dict)
+        for model, columns in self.SOURCES:
+            rows = model.objects.filter(created__gte=since, created__lt=until)\
+                .annotate(day=TruncDate('created', tzinfo=tz))\
+                .values('day').order_by().annotate(**{
+                    field: Sum(column) for field, column in columns.items()})
+            for row in rows:
+                days[row.pop('day')].update(row)
+            if archive.is_archived(model):
+                self._add_archived(days, model, columns, since, until)
+
+        with transaction.atomic():
+            self.filter(date__gte=start, date__lte=end).delete()
+            self.bulk_create([
+                DailyRollup(date=day, **{
+                    field: value or 0 for field, value in values.items()})
+                for day, values in sorted(days.items())])
+            transaction.on_commit(lambda: cache.invalidate(DailyRollup))
+        return len(days)
+
+    def _add_archived(self, days, model, columns, since, until):
+        """
+        Add the archived rows of a source table to the days being refreshed,
+        so that archiving a cycle leaves its days unchanged.
+        """
+        for data in ArchivedRecord.objects.rows(model, since, until):
+            created = model._meta.get_field('created').to_python(
+                data['created'])
+            values = days[timezone.localtime(created).date()]
+            for field, column in columns.items():
+                values[field] = (values.get(field) or 0) + \
+                    (data.get(column) or 0)
+
+    def _first_day(self):
+        first = None
+        for model, _ in self.SOURCES:
+            created = model.objects.aggregate(
+                first=models.Min('created'))['first']
+            if archive.is_archived(model):
+                archived = ArchivedRecord.objects.for_model(model).aggregate(
+                    first=models.Min('created'))['first']
+                created = min(filter(None, (created, archived)), default=None)
+            if created is not None:
+                day = timezone.localtime(created).date()
+                first = day if first is None else min(first, day)
+        return first
+
+    def totals(self, start=None):
+        """
+        Sum the rollups from start (all days by default).
+        """
+        qs = self.all()
+        if start is not None:
+            qs = qs.filter(date__gte=start)
+        totals = qs.aggregate(**{
+            field: Sum(field) for field in DailyRollup.COUNT_FIELDS})
+        return DailyRollup(**{field: value or 0
+                              for field, value in totals.items()})
+
+
+class DailyRollup(models.Model):
+    """
+    DailyRollup Model
+
+    Per-day totals of the transactional tables feeding the dashboard,
+    refreshed by the refresh_dashboard task and management command.
+    """
+    COUNT_FIELDS = (
+        'eggs_received', 'eggs_candled', 'fertile_eggs', 'eggs_hatched',
+        'chicks_hatched', 'mortality', 'chicks_sold', 'sales',
+    )
+
+    id = models.AutoField(primary_key=True)
+    date=models.DateField(unique=True)
+    eggs_received=models.IntegerField(default=0)
+    eggs_candled=models.IntegerField(default=0)
+    fertile_eggs=models.IntegerField(default=0)
+    eggs_hatched=models.IntegerField(default=0)
+    chicks_hatched=models.IntegerField(default=0)
+    mortality=models.IntegerField(default=0)
+    chicks_sold=models.IntegerField(default=0)
+    sales=models.FloatField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = DailyRollupManager()
+
+    class Meta:
+        ordering = ['date']
+        db_table = "daily_rollup"
+        verbose_name = 'DailyRollup'
+        verbose_name_plural = "DailyRollups"
+        managed = True
+
+    def __str__(self):
+        return str(self.date)
+
+    @property
+    def fertility_rate(self):
+        return percent(self.fertile_eggs, self.eggs_candled)
+
+    @property
+    def hatch_rate(self):
+        return percent(self.chicks_hatched, self.fertile_eggs)
+
+    @property
+    def mortality_rate(self):
+        return percent(self.mortality, self.chicks_hatched)
+
+
+def percent(part, whole):
+    """
+    Percentage of part in whole, rounded to 1 decimal place (0 if whole is 0).
+    """
+    if not whole:
+        return 0
+    return round(100.0 * part / whole, 1)
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from celery import shared_task
+
+from apps.dashboard.models import DailyRollup
+
+
+@shared_task(ignore_result=True)
+def refresh_dashboard():
+    """
+    Recompute the recent and the edited days of the dashboard rollups.
+    """
+    return DailyRollup.objects.refresh()
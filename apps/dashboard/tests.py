@@ -1,3 +1,102 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from apps.chicks.models import ChicksSold, Mortality
+from apps.core.cache import cached, invalidate_on_change, models_version
+from apps.customer.models import Eggs
+from apps.dashboard.models import DailyRollup
+from apps.dashboard.tasks import refresh_dashboard
+from apps.hatchery.models import Candling, Hatching
+
+
+class DailyRollupTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        Eggs.objects.create(batchnumber='A', brought=100, returned=0)
+        Candling.objects.create(eggs=100, spoilt_eggs=20)
+        Hatching.objects.create(hatched=60, deformed=0)
+        Mortality.objects.create(mortality=3)
+        ChicksSold.objects.create(number=10, price=2.5)
+
+    def test_refresh_and_rates(self):
+        self.assertEqual(DailyRollup.objects.refresh(), 1)
+        rollup = DailyRollup.objects.get(date=timezone.localdate())
+        self.assertEqual(rollup.eggs_received, 100)
+        self.assertEqual(rollup.fertility_rate, 80.0)
+        self.assertEqual(rollup.hatch_rate, 75.0)
+        self.assertEqual(rollup.mortality_rate, 5.0)
+        self.assertEqual(rollup.sales, 25.0)
+
+    def test_refresh_is_incremental(self):
+        DailyRollup.objects.refresh()
+        Eggs.objects.create(batchnumber='B', brought=50, returned=0)
+        DailyRollup.objects.refresh()
+        self.assertEqual(DailyRollup.objects.count(), 1)
+        self.assertEqual(DailyRollup.objects.totals().eggs_received, 150)
+
+    def test_refresh_follows_edits_and_deletes(self):
+        today = timezone.localdate()
+        old = Eggs.objects.create(batchnumber='OLD', brought=40, returned=0)
+        recent = Eggs.objects.create(batchnumber='NEW', brought=5,
+                                     returned=0)
+        Eggs.objects.filter(pk=old.pk).update(
+            created=timezone.now() - timedelta(days=30))
+        Eggs.objects.filter(pk=recent.pk).update(
+            created=timezone.now() - timedelta(days=3))
+        refresh_dashboard.delay()
+        self.assertEqual(DailyRollup.objects.count(), 3)
+
+        old.refresh_from_db()
+        old.returned = 10
+        old.save()
+        recent.delete()
+        refresh_dashboard.delay()
+        self.assertEqual(
+            list(DailyRollup.objects.values_list('date', 'eggs_received')),
+            [(today - timedelta(days=30), 30), (today, 100)])
+
+    def test_dashboard_page(self):
+        DailyRollup.objects.refresh()
+        user = User.objects.create_user('staff', password='secret')
+        self.client.force_login(user)
+        with self.assertNumQueries(5):
+            response = self.client.get('/')
+        self.assertContains(response, '80.0%')
+
+
+class DashboardCacheTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        Eggs.objects.create(batchnumber='A', brought=100, returned=0)
+        DailyRollup.objects.refresh()
+        self.client.force_login(User.objects.create_user('staff'))
+
+    def test_cached_until_refresh(self):
+        with self.assertNumQueries(5):
+            self.client.get('/')
+        # Only the session and the user are read.
+        with self.assertNumQueries(2):
+            response = self.client.get('/')
+        self.assertContains(response, '<td>100</td>')
+
+        Eggs.objects.create(batchnumber='B', brought=50, returned=0)
+        DailyRollup.objects.refresh()
+        self.assertContains(self.client.get('/'), '<td>150</td>')
+
+    def test_versioned_cache(self):
+        invalidate_on_change(Eggs)
+        version = models_version(Eggs)
+        self.assertEqual(cached('eggs', Eggs.objects.count, (Eggs,)), 1)
+        # update() sends no signal but moves the version itself.
+        Eggs.objects.filter(batchnumber='A').update(brought=10)
+        self.assertNotEqual(models_version(Eggs), version)
+        version = models_version(Eggs)
+        Eggs.objects.create(batchnumber='B', brought=50, returned=0)
+        self.assertNotEqual(models_version(Eggs), version)
+        self.assertEqual(cached('eggs', Eggs.objects.count, (Eggs,)), 2)
@@ -1,3 +1,39 @@
-from django.shortcuts import render
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+import datetime
 
-# Create your views here.
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.utils import timezone
+from django.views.generic import TemplateView
+
+from apps.core import cache
+from apps.dashboard.models import DailyRollup
+
+
+class DashboardView(LoginRequiredMixin, TemplateView):
+    """
+    Hatchery KPIs, read from the precomputed daily rollups only. The totals
+    and the rendered daily table are cached until the next refresh.
+    """
+    template_name = 'dashboard/index.html'
+    days = 30
+
+    def get_context_data(self, **kwargs):
+        context = super(DashboardView, self).get_context_data(**kwargs)
+        start = timezone.localdate() - datetime.timedelta(days=self.days - 1)
+        context['days'] = self.days
+        context['start'] = start
+        context['rollups_version'] = cache.models_version(DailyRollup)
+        # Only queried when the table's fragment is not cached.
+        context['daily_rollups'] = DailyRollup.objects.filter(date__gte=start)
+        context['period_totals'] = cache.cached(
+            'dashboard:totals:{}'.format(start),
+            lambda: DailyRollup.objects.totals(start=start), (DailyRollup,))
+        context['totals'] = cache.cached(
+            'dashboard:totals', DailyRollup.objects.totals, (DailyRollup,))
+        return context
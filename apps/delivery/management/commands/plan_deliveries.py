@@ -0,0 +1,27 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.delivery.models import DeliveryRoute
+
+
+class Command(BaseCommand):
+    help = 'Plan and cost the delivery routes for the Holding records ' \
+           'flagged for customer delivery on a given day (today by default).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date', type=datetime.date.fromisoformat,
+            default=None, help='Day to plan, as YYYY-MM-DD.')
+        parser.add_argument(
+            '--max-stops', type=int, default=25,
+            help='Maximum number of stops per route.')
+
+    def handle(self, *args, **options):
+        day = options['date'] or timezone.localdate()
+        routes = DeliveryRoute.objects.plan_day(
+            day, max_stops=options['max_stops'])
+        stops = sum(route.stops for route in routes)
+        self.stdout.write('Planned %s route(s) with %s stop(s) for %s.\n'
+                          % (len(routes), stops, day))
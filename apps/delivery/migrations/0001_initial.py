@@ -0,0 +1,55 @@
+# Generated by Django 3.1.2 on 2020-10-26 08:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('hatchery', '0003_eggsetting_reservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeliveryRoute',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('code', models.CharField(blank=True, db_index=True, max_length=50, null=True)),
+                ('date', models.DateField(db_index=True)),
+                ('stops', models.IntegerField(default=0)),
+                ('distance', models.FloatField(default=0)),
+                ('cost', models.FloatField(default=0)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('hatchery', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deliveryroute_hatchery', to='hatchery.hatchery')),
+            ],
+            options={
+                'verbose_name': 'DeliveryRoute',
+                'verbose_name_plural': 'DeliveryRoutes',
+                'db_table': 'delivery_route',
+                'ordering': ['date', 'code'],
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='DeliveryStop',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('sequence', models.IntegerField()),
+                ('leg_distance', models.FloatField(default=0)),
+                ('cost', models.FloatField(default=0)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('holding', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliverystop_holding', to='hatchery.holding')),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliverystop_route', to='delivery.deliveryroute')),
+            ],
+            options={
+                'verbose_name': 'DeliveryStop',
+                'verbose_name_plural': 'DeliveryStops',
+                'db_table': 'delivery_stop',
+                'ordering': ['route', 'sequence'],
+                'managed': True,
+            },
+        ),
+    ]
@@ -1,3 +1,162 @@
-from django.db import models
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from __future__ import unicode_literals
+from collections import defaultdict
 
-# Create your models here.
+from django.conf import settings
+from django.db import models, transaction
+
+from apps.hatchery.models import Hatchery, Holding
+from apps.delivery import routing
+
+# Path from a Holding back to the hatchery that dispatches it.
+HOLDING_HATCHERY_PATH = \
+    'hatching__candling__incubation__eggsetting__incubator__hatchery'
+
+
+def cost_per_km():
+    return getattr(settings, 'DELIVERY_COST_PER_KM', 1.0)
+
+
+def cost_per_stop():
+    return getattr(settings, 'DELIVERY_COST_PER_STOP', 0.0)
+
+
+def delivery_cost(distance):
+    """
+    Cost of delivering a single holding over the given distance in km.
+    """
+    if distance is None:
+        return None
+    return cost_per_stop() + cost_per_km() * distance
+
+
+def _coordinates(point, longitude, latitude):
+    if point is not None:
+        return point.x, point.y
+    if longitude is not None and latitude is not None:
+        return longitude, latitude
+    return None
+
+
+class DeliveryRouteManager(models.Manager):
+
+    def plan_day(self, day, max_stops=25):
+        """
+        Plan the routes for every Holding flagged for customer delivery on
+        ``day``, replacing any routes already planned for that day.
+
+        Holdings are grouped by the hatchery they are dispatched from, split
+        into routes of at most max_stops and costed per stop, and each
+        holding is charged the cost of its stop. Holdings with no known
+        location are left unplanned. Returns the routes created.
+        """
+        holdings = Holding.objects.filter(
+            created__date=day, customer_delivery=True).values(
+            'id', 'location', 'customer__location', 'customer__longitude',
+            'customer__latitude', HOLDING_HATCHERY_PATH,
+            HOLDING_HATCHERY_PATH + '__location',
+            HOLDING_HATCHERY_PATH + '__longitude',
+            HOLDING_HATCHERY_PATH + '__latitude').order_by('id')
+
+        depots = {}
+        stops = defaultdict(list)
+        for row in holdings.iterator():
+            hatchery_id = row[HOLDING_HATCHERY_PATH]
+            depot = _coordinates(
+                row[HOLDING_HATCHERY_PATH + '__location'],
+                row[HOLDING_HATCHERY_PATH + '__longitude'],
+                row[HOLDING_HATCHERY_PATH + '__latitude'])
+            stop = _coordinates(
+                row['location'] or row['customer__location'],
+                row['customer__longitude'], row['customer__latitude'])
+            if depot is None or stop is None:
+                continue
+            depots[hatchery_id] = depot
+            stops[hatchery_id].append((row['id'], stop[0], stop[1]))
+
+        per_km, per_stop = cost_per_km(), cost_per_stop()
+        routes = []
+        with transaction.atomic():
+            self.filter(date=day).delete()
+            for hatchery_id in sorted(stops):
+                planned = routing.plan_routes(
+                    depots[hatchery_id], stops[hatchery_id], max_stops)
+                for number, (legs, return_km) in enumerate(planned, 1):
+                    costs = routing.stop_costs(legs, return_km, per_km,
+                                               per_stop)
+                    route = self.create(
+                        code='{}-{}-{}'.format(day.isoformat(), hatchery_id,
+                                               number),
+                        hatchery_id=hatchery_id, date=day, stops=len(legs),
+                        distance=sum(km for _, km in legs) + return_km,
+                        cost=sum(costs))
+                    DeliveryStop.objects.bulk_create([
+                        DeliveryStop(route=route, holding_id=stop[0],
+                                     sequence=sequence, leg_distance=leg_km,
+                                     cost=cost)
+                        for sequence, ((stop, leg_km), cost)
+                        in enumerate(zip(legs, costs), 1)])
+                    Holding.objects.bulk_update(
+                        [Holding(id=stop[0], cost=cost)
+                         for (stop, _), cost in zip(legs, costs)], ['cost'])
+                    routes.append(route)
+        return routes
+
+
+class DeliveryRoute(models.Model):
+    """
+    DeliveryRoute Model
+    """
+    id = models.AutoField(primary_key=True)
+    code=models.CharField(null=True,blank=True,max_length=50,db_index=True)
+    hatchery=models.ForeignKey(Hatchery,
+        related_name="deliveryroute_hatchery", blank=True, null=True,
+        on_delete=models.SET_NULL)
+    date=models.DateField(db_index=True)
+    stops=models.IntegerField(default=0)
+    distance=models.FloatField(default=0)
+    cost=models.FloatField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = DeliveryRouteManager()
+
+    class Meta:
+        ordering = ['date', 'code']
+        db_table = "delivery_route"
+        verbose_name = 'DeliveryRoute'
+        verbose_name_plural = "DeliveryRoutes"
+        managed = True
+
+    def __str__(self):
+        return self.code
+
+    def get_absolute_url(self):
+        return '/delivery_route/{}'.format(self.code)
+
+
+class DeliveryStop(models.Model):
+    """
+    DeliveryStop Model
+    """
+    id = models.AutoField(primary_key=True)
+    route=models.ForeignKey(DeliveryRoute,
+        related_name="deliverystop_route", on_delete=models.CASCADE)
+    holding=models.ForeignKey(Holding,
+        related_name="deliverystop_holding", on_delete=models.CASCADE)
+    sequence=models.IntegerField()
+    leg_distance=models.FloatField(default=0)
+    cost=models.FloatField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['route', 'sequence']
+        db_table = "delivery_stop"
+        verbose_name = 'DeliveryStop'
+        verbose_name_plural = "DeliveryStops"
+        managed = True
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Route building for chick deliveries.
+
+Stops are ``(key, longitude, latitude)`` tuples and the depot is a
+``(longitude, latitude)`` pair. Stops are first split into routes with a
+sweep around the depot, then each route is ordered with nearest-neighbour
+and improved with 2-opt. Routes are kept short, so the quadratic steps run
+on small distance matrices and a few thousand stops plan in well under a
+second.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine(a, b):
+    """
+    Great-circle distance in km between two (longitude, latitude) pairs.
+    """
+    lon1, lat1 = math.radians(a[0]), math.radians(a[1])
+    lon2, lat2 = math.radians(b[0]), math.radians(b[1])
+    h = math.sin((lat2 - lat1) / 2) ** 2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def sweep_clusters(depot, stops, max_stops):
+    """
+    Split stops into clusters of at most max_stops by sorting them on their
+    bearing from the depot and cutting the sweep into consecutive slices.
+    """
+    def bearing(stop):
+        return math.atan2(stop[2] - depot[1], stop[1] - depot[0])
+
+    ordered = sorted(stops, key=bearing)
+    return [ordered[i:i + max_stops]
+            for i in range(0, len(ordered), max_stops)]
+
+
+def route_length(order, matrix):
+    """
+    Length of a closed tour, starting and ending at index 0 (the depot).
+    """
+    tour = [0] + order + [0]
+    return sum(matrix[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
+
+
+def nearest_neighbour(matrix):
+    """
+    Greedy tour over the stops of a distance matrix whose index 0 is the
+    depot. Returns the stop indexes in visiting order.
+    """
+    unvisited = set(range(1, len(matrix)))
+    order = []
+    current = 0
+    while unvisited:
+        current = min(unvisited, key=matrix[current].__getitem__)
+        unvisited.remove(current)
+        order.append(current)
+    return order
+
+
+def two_opt(order, matrix, max_passes=50):
+    """
+    Improve a tour by reversing segments while that shortens it.
+    """
+    tour = [0] + list(order) + [0]
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, len(tour) - 2):
+            for j in range(i + 1, len(tour) - 1):
+                a, b = tour[i - 1], tour[i]
+                c, d = tour[j], tour[j + 1]
+                delta = matrix[a][c] + matrix[b][d] - \
+                    matrix[a][b] - matrix[c][d]
+                if delta < -1e-9:
+                    tour[i:j + 1] = reversed(tour[i:j + 1])
+                    improved = True
+        if not improved:
+            break
+    return tour[1:-1]
+
+
+def plan_route(depot, stops):
+    """
+    Order one cluster of stops. Returns ``[(stop, leg_km), ...]`` in
+    visiting order and the km of the final leg back to the depot.
+    """
+    points = [depot] + [(stop[1], stop[2]) for stop in stops]
+    matrix = [[haversine(a, b) for b in points] for a in points]
+    order = two_opt(nearest_neighbour(matrix), matrix)
+
+    legs = []
+    previous = 0
+    for index in order:
+        legs.append((stops[index - 1], matrix[previous][index]))
+        previous = index
+    return legs, matrix[previous][0]
+
+
+def plan_routes(depot, stops, max_stops=25):
+    """
+    Split stops into routes from depot and order each one.
+
+    Returns a list of ``(legs, return_km)`` as produced by plan_route.
+    """
+    if max_stops < 1:
+        raise ValueError('max_stops must be at least 1.')
+    return [plan_route(depot, cluster)
+            for cluster in sweep_clusters(depot, stops, max_stops)]
+
+
+def stop_costs(legs, return_km, cost_per_km, cost_per_stop):
+    """
+    Cost of each stop of a route: a fixed amount per stop plus its own leg,
+    with the drive back to the depot shared evenly between the stops.
+    """
+    if not legs:
+        return []
+    shared = return_km / len(legs)
+    return [cost_per_stop + cost_per_km * (leg_km + shared)
+            for _, leg_km in legs]
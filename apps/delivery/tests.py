@@ -1,3 +1,103 @@
-from django.test import TestCase
+import random
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.customer.models import Customer
+from apps.delivery import routing
+from apps.delivery.models import DeliveryRoute, DeliveryStop
+from apps.hatchery.models import (Hatchery, Incubators, EggSetting,
+                                  Incubation, Candling, Hatching, Holding)
+
+
+class RoutingTest(SimpleTestCase):
+
+    depot = (36.82, -1.29)
+
+    def random_stops(self, count, seed=1):
+        rng = random.Random(seed)
+        return [(i, 36.82 + rng.uniform(-0.5, 0.5),
+                 -1.29 + rng.uniform(-0.5, 0.5)) for i in range(count)]
+
+    def test_haversine(self):
+        # One degree of latitude is roughly 111 km.
+        self.assertAlmostEqual(routing.haversine((0, 0), (0, 1)), 111.2,
+                               places=1)
+
+    def test_every_stop_is_routed_once(self):
+        stops = self.random_stops(230)
+        routes = routing.plan_routes(self.depot, stops, max_stops=25)
+        self.assertEqual(len(routes), 10)
+        routed = [stop[0] for legs, _ in routes for stop, _ in legs]
+        self.assertEqual(sorted(routed), list(range(230)))
+
+    def test_two_opt_never_lengthens_the_tour(self):
+        stops = self.random_stops(25, seed=7)
+        points = [self.depot] + [(s[1], s[2]) for s in stops]
+        matrix = [[routing.haversine(a, b) for b in points] for a in points]
+        greedy = routing.nearest_neighbour(matrix)
+        improved = routing.two_opt(greedy, matrix)
+        self.assertEqual(sorted(improved), sorted(greedy))
+        self.assertLessEqual(routing.route_length(improved, matrix),
+                             routing.route_length(greedy, matrix))
+
+    def test_stop_costs_share_the_return_leg(self):
+        legs = [('a', 10.0), ('b', 5.0)]
+        costs = routing.stop_costs(legs, 15.0, cost_per_km=2.0,
+                                   cost_per_stop=1.0)
+        self.assertEqual(costs, [36.0, 26.0])
+        self.assertEqual(sum(costs), 2 * 1.0 + 2.0 * 30.0)
+
+
+@override_settings(DELIVERY_COST_PER_KM=2.0, DELIVERY_COST_PER_STOP=1.0)
+class PlanDayTest(TestCase):
+
+    def setUp(self):
+        hatchery = Hatchery.objects.create(name='Main', longitude=36.82,
+                                           latitude=-1.29)
+        incubator = Incubators.objects.create(hatchery=hatchery,
+                                              code='INC-1')
+        setting = EggSetting.objects.create(incubator=incubator, eggs=100)
+        incubation = Incubation.objects.create(eggsetting=setting, eggs=100)
+        candling = Candling.objects.create(incubation=incubation, eggs=100,
+                                           spoilt_eggs=0)
+        self.hatching = Hatching.objects.create(candling=candling,
+                                                hatched=100, deformed=0)
+        self.holdings = [self.holding(36.9, -1.2), self.holding(37.0, -1.1)]
+        # No location: left unplanned.
+        self.holding(None, None)
+
+    def holding(self, longitude, latitude):
+        customer = Customer.objects.create(
+            first_name='Jane', last_name='Doe', longitude=longitude,
+            latitude=latitude)
+        return Holding.objects.create(hatching=self.hatching,
+                                      customer=customer,
+                                      customer_delivery=True)
+
+    def test_holdings_are_charged_their_stop(self):
+        route, = DeliveryRoute.objects.plan_day(timezone.localdate())
+        self.assertEqual(route.stops, 2)
+        costs = dict(DeliveryStop.objects.values_list('holding', 'cost'))
+        self.assertAlmostEqual(sum(costs.values()), route.cost)
+        for holding in self.holdings:
+            holding.refresh_from_db()
+            self.assertEqual(holding.cost, costs[holding.id])
+            # Kept by saves that do not move the holding.
+            holding.mode_delivery = 'van'
+            holding.save()
+            holding.refresh_from_db()
+            self.assertEqual(holding.cost, costs[holding.id])
+
+        # Planning the day again replaces its routes.
+        DeliveryRoute.objects.plan_day(timezone.localdate())
+        self.assertEqual(DeliveryRoute.objects.count(), 1)
+        self.assertEqual(DeliveryStop.objects.count(), 2)
+
+    def test_distance_change_costs_the_holding_again(self):
+        DeliveryRoute.objects.plan_day(timezone.localdate())
+        holding = Holding.objects.get(id=self.holdings[0].id)
+        holding.distance = 10.0
+        holding.save()
+        holding.refresh_from_db()
+        self.assertEqual(holding.cost, 21.0)
@@ -1,3 +1,152 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
 from django.contrib import admin
 
-# Register your models here.
+from apps.core.paginator import EstimatedCountPaginator
+from apps.images.renditions import thumbnail
+from apps.hatchery.models import (Candling, EggSetting, Hatchery, Hatching,
+                                  Holding, Incubation, IncubatorCapacity,
+                                  Incubators)
+
+
+class InputFilter(admin.SimpleListFilter):
+    """
+    A list filter taking a typed value, for relations too large to list.
+    """
+    template = 'admin/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        # Never shown, but the filter is hidden without lookups.
+        return ((),)
+
+    def choices(self, changelist):
+        all_choice = next(super(InputFilter, self).choices(changelist))
+        all_choice['query_parts'] = (
+            (name, value) for name, value in changelist.get_filters_params()
+            .items() if name != self.parameter_name)
+        yield all_choice
+
+
+class CustomerCodeFilter(InputFilter):
+    """
+    Filter on the customer's unique customercode.
+    """
+    title = 'customer code'
+    parameter_name = 'customercode'
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(customer__customercode=self.value().strip())
+
+
+class RecordAdmin(admin.ModelAdmin):
+    """
+    Base admin of the record models, usable on tables of millions of rows:
+    the page count comes from an estimate instead of COUNT(*), foreign keys
+    are edited with autocomplete widgets and the changelist is sorted on the
+    primary key, which follows created. There is no date_hierarchy: it
+    scans the whole table for the distinct dates.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    ordering = ('-id',)
+
+
+@admin.register(Hatchery)
+class HatcheryAdmin(RecordAdmin):
+    list_display = (thumbnail('photo'), 'name', 'phone', 'email',
+                    'totalcapacity', 'created')
+    search_fields = ('name',)
+
+
+@admin.register(Incubators)
+class IncubatorsAdmin(RecordAdmin):
+    list_display = ('code', 'hatchery', 'incubatortype', 'manufacturer',
+                    'model', 'created')
+    list_select_related = ('hatchery',)
+    list_filter = ('hatchery',)
+    search_fields = ('code',)
+    autocomplete_fields = ('hatchery',)
+
+
+@admin.register(IncubatorCapacity)
+class IncubatorCapacityAdmin(RecordAdmin):
+    list_display = ('id', 'incubator', 'breed', 'capacity', 'occupied',
+                    'available', 'created')
+    list_select_related = ('incubator',)
+    list_filter = ('incubator__hatchery',)
+    search_fields = ('incubator__code', 'breed')
+    autocomplete_fields = ('incubator',)
+    # Kept by occupancy.reserve() and release().
+    readonly_fields = ('occupied', 'available')
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            # Lock the row and keep the slots reserved since it was read.
+            obj.occupied = IncubatorCapacity.objects.select_for_update()\
+                .values_list('occupied', flat=True).get(pk=obj.pk)
+        super(IncubatorCapacityAdmin, self).save_model(
+            request, obj, form, change)
+
+
+@admin.register(EggSetting)
+class EggSettingAdmin(RecordAdmin):
+    list_display = ('settingcode', 'customer', 'breeders', 'incubator',
+                    'eggs', 'reserved', 'created')
+    list_select_related = ('customer', 'breeders', 'incubator')
+    list_filter = (CustomerCodeFilter, 'breeders__breed',
+                   'incubator__hatchery')
+    search_fields = ('=settingcode',)
+    autocomplete_fields = ('customer', 'breeders', 'incubator')
+    # Chosen by occupancy.reserve() when the eggs are set.
+    readonly_fields = ('capacity', 'reserved')
+
+
+@admin.register(Incubation)
+class IncubationAdmin(RecordAdmin):
+    list_display = ('incubationcode', 'eggsetting', 'customer', 'breeders',
+                    'eggs', 'created')
+    list_select_related = ('eggsetting', 'customer', 'breeders')
+    list_filter = (CustomerCodeFilter, 'breeders__breed')
+    search_fields = ('=incubationcode',)
+    autocomplete_fields = ('eggsetting', 'customer', 'breeders')
+
+
+@admin.register(Candling)
+class CandlingAdmin(RecordAdmin):
+    list_display = ('candlingcode', 'incubation', 'customer', 'breeders',
+                    'eggs', 'spoilt_eggs', 'fertile_eggs', 'candled_date')
+    list_select_related = ('incubation', 'customer', 'breeders')
+    list_filter = (CustomerCodeFilter, 'breeders__breed', 'candled')
+    search_fields = ('=candlingcode',)
+    autocomplete_fields = ('incubation', 'customer', 'breeders')
+    readonly_fields = ('fertile_eggs',)
+
+
+@admin.register(Hatching)
+class HatchingAdmin(RecordAdmin):
+    list_display = ('hatchingcode', 'candling', 'customer', 'breeders',
+                    'hatched', 'deformed', 'spoilt', 'chicks_hatched',
+                    'created')
+    list_select_related = ('candling', 'customer', 'breeders')
+    list_filter = (CustomerCodeFilter, 'breeders__breed', 'notify_customer')
+    search_fields = ('=hatchingcode',)
+    autocomplete_fields = ('candling', 'customer', 'breeders')
+    readonly_fields = ('chicks_hatched',)
+
+
+@admin.register(Holding)
+class HoldingAdmin(RecordAdmin):
+    list_display = ('holdingcode', 'hatching', 'customer', 'customer_delivery',
+                    'mode_delivery', 'distance', 'cost', 'created')
+    list_select_related = ('hatching', 'customer')
+    list_filter = (CustomerCodeFilter, 'breeders__breed', 'customer_delivery')
+    search_fields = ('=holdingcode',)
+    autocomplete_fields = ('hatching', 'customer', 'breeders')
+    readonly_fields = ('cost',)
@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 
 class HatcheryConfig(AppConfig):
-    name = 'hatchery'
+    name = 'apps.hatchery'
+    label = 'hatchery'
+
+    def ready(self):
+        from apps.hatchery import signals  # noqa
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Archiving of delivered hatch cycles.
+
+Once a cycle has been held for delivery more than HATCHERY_ARCHIVE_MONTHS
+months ago (default 12), archive_cycles() copies its setting, incubation,
+candling, hatching and holding rows (and the notifications and delivery
+stops hanging off them) into ArchivedRecord, partitioned by month, and
+deletes them from the hot tables. The HatchCycle ledger row is kept and
+marked archived.
+
+Reports read archived rows back with ArchivedRecord.objects.rows() or
+instances(); export_period() writes one month of the archive to gzipped
+CSV files for cold storage.
+"""
+import csv
+import gzip
+import os
+
+from dateutil.relativedelta import relativedelta
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.hatchery.models import (SETTING_PATHS, ArchivedRecord, HatchCycle,
+                                  month_of)
+
+# (model, path to the EggSetting id), children first: rows are deleted in
+# this order.
+ARCHIVED_MODELS = (
+    ('delivery.DeliveryStop', 'holding__' + SETTING_PATHS['Holding']),
+    ('hatchery.HatchNotification', 'hatching__' + SETTING_PATHS['Hatching']),
+    ('hatchery.Holding', SETTING_PATHS['Holding']),
+    ('hatchery.Hatching', SETTING_PATHS['Hatching']),
+    ('hatchery.Candling', SETTING_PATHS['Candling']),
+    ('hatchery.Incubation', SETTING_PATHS['Incubation']),
+    ('hatchery.EggSetting', SETTING_PATHS['EggSetting']),
+)
+
+
+def archive_months():
+    return getattr(settings, 'HATCHERY_ARCHIVE_MONTHS', 12)
+
+
+def archived_models():
+    for label, path in ARCHIVED_MODELS:
+        try:
+            yield apps.get_model(label), path
+        except LookupError:
+            continue
+
+
+def is_archived(model):
+    """
+    Whether rows of ``model`` may have been moved to the archive.
+    """
+    return model._meta.label in dict(ARCHIVED_MODELS)
+
+
+def _serialize(value):
+    # Geometries are stored as EWKT, everything else is handled by the
+    # DjangoJSONEncoder of ArchivedRecord.data.
+    return getattr(value, 'ewkt', value)
+
+
+def archivable(cutoff):
+    """
+    Ids of the EggSettings of the cycles held for delivery before cutoff.
+    """
+    return HatchCycle.objects.filter(
+        archived_at__isnull=True, eggsetting__isnull=False,
+        held_at__lt=cutoff).order_by('held_at')\
+        .values_list('eggsetting_id', flat=True)
+
+
+def archive_settings(setting_ids, now=None):
+    """
+    Move the pipeline rows of the given EggSettings to the archive.
+    Returns the number of rows archived.
+    """
+    now = now or timezone.now()
+    total = 0
+    with transaction.atomic():
+        # Deleting the settings detaches the ledger rows, which are kept.
+        HatchCycle.objects.filter(eggsetting_id__in=setting_ids)\
+            .update(archived_at=now)
+        for model, path in archived_models():
+            qs = model.objects.filter(**{path + '__in': setting_ids})\
+                .order_by().annotate(archived_setting_id=F(path))
+            records = []
+            for row in qs.values().iterator():
+                setting_id = row.pop('archived_setting_id')
+                created = row.get('created') or now
+                records.append(ArchivedRecord(
+                    model=model._meta.label_lower,
+                    record_id=row['id'],
+                    eggsetting_id=setting_id,
+                    created=row.get('created'),
+                    period=month_of(created),
+                    data={name: _serialize(value)
+                          for name, value in row.items()}))
+            ArchivedRecord.objects.bulk_create(records, batch_size=500)
+            model.objects.filter(
+                id__in=[record.record_id for record in records]).delete()
+            total += len(records)
+    return total
+
+
+def archive_cycles(months=None, batch_size=200, now=None):
+    """
+    Archive every cycle held for delivery more than ``months`` months ago,
+    batch_size cycles per transaction. Returns (cycles, rows) archived.
+    """
+    now = now or timezone.now()
+    months = archive_months() if months is None else months
+    cutoff = now - relativedelta(months=months)
+    cycles = rows = 0
+    while True:
+        setting_ids = list(archivable(cutoff)[:batch_size])
+        if not setting_ids:
+            return cycles, rows
+        rows += archive_settings(setting_ids, now=now)
+        cycles += len(setting_ids)
+
+
+def export_period(period, directory):
+    """
+    Write the archived rows of one month to <directory>/<model>-YYYY-MM.csv.gz,
+    one file per model. Returns the paths written.
+    """
+    period = period.replace(day=1)
+    paths = []
+    for model, _ in archived_models():
+        label = model._meta.label_lower
+        qs = ArchivedRecord.objects.filter(model=label, period=period)
+        if not qs.exists():
+            continue
+        columns = [field.attname for field in model._meta.concrete_fields]
+        path = os.path.join(directory, '{}-{:%Y-%m}.csv.gz'.format(
+            label, period))
+        with gzip.open(path, 'wt', newline='') as stream:
+            writer = csv.DictWriter(stream, columns, extrasaction='ignore')
+            writer.writeheader()
+            for data in qs.order_by('record_id').values_list(
+                    'data', flat=True).iterator(chunk_size=2000):
+                writer.writerow(data)
+        paths.append(path)
+    return paths
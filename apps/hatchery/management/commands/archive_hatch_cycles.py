@@ -0,0 +1,36 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from apps.hatchery import archive
+
+
+class Command(BaseCommand):
+    help = 'Move the rows of hatch cycles delivered more than ' \
+           'HATCHERY_ARCHIVE_MONTHS months ago to the archive table, and ' \
+           'optionally export one month of the archive to gzipped CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int, default=None,
+            help='Archive cycles held for delivery more than this many '
+                 'months ago (default: HATCHERY_ARCHIVE_MONTHS).')
+        parser.add_argument(
+            '--batch-size', type=int, default=200,
+            help='Number of cycles archived per transaction.')
+        parser.add_argument(
+            '--export', metavar='YYYY-MM', default=None,
+            help='Export the archived rows of this month instead.')
+        parser.add_argument(
+            '--directory', default='.',
+            help='Directory the exported files are written to.')
+
+    def handle(self, *args, **options):
+        if options['export']:
+            period = datetime.date.fromisoformat(options['export'] + '-01')
+            for path in archive.export_period(period, options['directory']):
+                self.stdout.write('Wrote %s\n' % path)
+            return
+        cycles, rows = archive.archive_cycles(
+            months=options['months'], batch_size=options['batch_size'])
+        self.stdout.write('Archived %s cycle(s), %s row(s).\n' % (cycles, rows))
@@ -0,0 +1,112 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Time the admin changelist queries of a model on a large table, ' \
+           'with a plain ModelAdmin (exact counts, the former default ' \
+           'ordering on created) and no created index ("before") and with ' \
+           'the registered admin and the current indexes ("after"). Runs in ' \
+           'a transaction that is rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', default='hatchery.Candling',
+            help='app_label.Model to benchmark.')
+        parser.add_argument(
+            '--rows', type=int, default=1000000,
+            help='Number of rows inserted before timing.')
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Number of timed requests per case, the median is shown.')
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+        try:
+            with transaction.atomic():
+                self.fill(model, options['rows'])
+                after = self.measure(
+                    self.current_admin(model), options['repeat'])
+                self.drop_created_indexes(model)
+                before = self.measure(
+                    self.baseline_admin(model), options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write('%s, %s rows\n' % (model._meta.label,
+                                            options['rows']))
+        self.stdout.write('%-8s %10s\n' % ('', 'median ms'))
+        self.stdout.write('%-8s %10.1f\n' % ('before', before))
+        self.stdout.write('%-8s %10.1f\n' % ('after', after))
+
+    def fill(self, model, rows, batch_size=10000):
+        # Spread created over two years, auto_now_add would give every row
+        # the same timestamp.
+        field = model._meta.get_field('created')
+        now = timezone.now()
+        span = 2 * 365 * 24 * 60 * 60
+        field.auto_now_add = False
+        try:
+            for start in range(0, rows, batch_size):
+                model._default_manager.bulk_create([
+                    model(created=now - datetime.timedelta(
+                        seconds=random.randrange(span)))
+                    for _ in range(min(batch_size, rows - start))])
+        finally:
+            field.auto_now_add = True
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE %s' % connection.ops.quote_name(
+                    model._meta.db_table))
+
+    def drop_created_indexes(self, model):
+        # Only the SQL of the editor is used: SQLite refuses to open one
+        # inside a transaction.
+        schema_editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for index in model._meta.indexes:
+                if 'created' in index.fields:
+                    cursor.execute(str(index.remove_sql(model, schema_editor)))
+
+    def current_admin(self, model):
+        return admin.site._registry.get(model) or \
+            admin.ModelAdmin(model, admin.site)
+
+    def baseline_admin(self, model):
+        # Django's Paginator and full result count, and the ordering the
+        # models had in Meta before it was made opt-in.
+        return type('BaselineAdmin', (admin.ModelAdmin,), {
+            'ordering': ('created',)})(model, admin.site)
+
+    def measure(self, model_admin, repeat):
+        user = User(username='benchmark', is_active=True, is_staff=True,
+                    is_superuser=True)
+        factory = RequestFactory()
+        timings = []
+        for _ in range(repeat):
+            request = factory.get('/admin/')
+            request.user = user
+            started = time.perf_counter()
+            # The counts and the first page, as run by changelist_view().
+            changelist = model_admin.get_changelist_instance(request)
+            list(changelist.result_list)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
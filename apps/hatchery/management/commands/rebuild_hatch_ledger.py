@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.hatchery.models import HatchCycle
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the hatch-cycle ledger from the EggSetting, Incubation, ' \
+           'Candling, Hatching and Holding tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Number of egg settings aggregated per batch.')
+
+    def handle(self, *args, **options):
+        total = HatchCycle.objects.rebuild(batch_size=options['batch_size'])
+        self.stdout.write('Rebuilt %s hatch cycle(s).\n' % total)
@@ -0,0 +1,33 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.derived import DerivedQuerySet
+
+
+class Command(BaseCommand):
+    help = 'Recompute the derived columns (Eggs.received, ' \
+           'Candling.fertile_eggs, Hatching.chicks_hatched, ...) with one ' \
+           'UPDATE per model, e.g. after raw SQL or bulk writes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.Model',
+            help='Models to recompute, all of them by default.')
+
+    def handle(self, *args, **options):
+        if options['models']:
+            try:
+                models = [apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+        else:
+            models = [model for model in apps.get_models()
+                      if hasattr(model, 'DERIVED')]
+
+        for model in models:
+            if not isinstance(model._default_manager.all(), DerivedQuerySet):
+                raise CommandError('%s has no derived columns.'
+                                   % model._meta.label)
+            updated = model._default_manager.all().recompute_derived()
+            self.stdout.write('%s: %s row(s) updated.\n'
+                              % (model._meta.label, updated))
@@ -0,0 +1,56 @@
+# Generated by Django 3.1.2 on 2020-10-25 09:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breeders', '0001_initial'),
+        ('customer', '0001_initial'),
+        ('hatchery', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HatchCycle',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('settingcode', models.CharField(blank=True, db_index=True, max_length=50, null=True)),
+                ('eggs_set', models.IntegerField(default=0)),
+                ('eggs_incubated', models.IntegerField(default=0)),
+                ('eggs_candled', models.IntegerField(default=0)),
+                ('spoilt_eggs', models.IntegerField(default=0)),
+                ('fertile_eggs', models.IntegerField(default=0)),
+                ('hatched', models.IntegerField(default=0)),
+                ('deformed', models.IntegerField(default=0)),
+                ('chicks_hatched', models.IntegerField(default=0)),
+                ('delivered', models.IntegerField(default=0)),
+                ('set_at', models.DateTimeField(blank=True, null=True)),
+                ('incubated_at', models.DateTimeField(blank=True, null=True)),
+                ('candled_at', models.DateTimeField(blank=True, null=True)),
+                ('hatched_at', models.DateTimeField(blank=True, null=True)),
+                ('held_at', models.DateTimeField(blank=True, null=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('breeders', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hatchcycle_breeders', to='breeders.breeders')),
+                ('customer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hatchcycle_customer', to='customer.customer')),
+                ('eggsetting', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='hatchcycle_eggsetting', to='hatchery.eggsetting')),
+            ],
+            options={
+                'verbose_name': 'HatchCycle',
+                'verbose_name_plural': 'HatchCycles',
+                'db_table': 'hatch_cycle',
+                'ordering': ['set_at'],
+                'managed': True,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='hatchcycle',
+            index=models.Index(fields=['customer', 'set_at'], name='hatch_cycle_customer_set_at'),
+        ),
+        migrations.AddIndex(
+            model_name='hatchcycle',
+            index=models.Index(fields=['set_at'], name='hatch_cycle_set_at'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.1.2 on 2020-10-25 11:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hatchery', '0002_hatchcycle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eggsetting',
+            name='capacity',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eggsetting_capacity', to='hatchery.incubatorcapacity'),
+        ),
+        migrations.AddField(
+            model_name='eggsetting',
+            name='reserved',
+            field=models.IntegerField(default=0),
+        ),
+    ]
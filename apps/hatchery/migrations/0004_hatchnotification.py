@@ -0,0 +1,42 @@
+# Generated by Django 3.1.2 on 2020-10-29 09:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0001_initial'),
+        ('hatchery', '0003_eggsetting_reservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HatchNotification',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('chicks', models.IntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('skipped', 'Skipped')], default='pending', max_length=10)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('customer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='hatchnotification_customer', to='customer.customer')),
+                ('hatching', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='hatchnotification_hatching', to='hatchery.hatching')),
+            ],
+            options={
+                'verbose_name': 'HatchNotification',
+                'verbose_name_plural': 'HatchNotifications',
+                'db_table': 'hatch_notification',
+                'ordering': ['created'],
+                'managed': True,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='hatchnotification',
+            index=models.Index(fields=['status', 'customer'], name='hatch_notification_status'),
+        ),
+        migrations.AddIndex(
+            model_name='hatchnotification',
+            index=models.Index(fields=['customer', 'sent_at'], name='hatch_notification_sent_at'),
+        ),
+    ]
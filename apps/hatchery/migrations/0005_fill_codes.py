@@ -0,0 +1,43 @@
+# Generated by Django 3.1.2 on 2020-10-31 10:12
+
+from django.db import migrations
+
+from apps.core.codes import fill_codes
+
+CODES = (
+    ('Incubators', 'code', 'INC'),
+    ('EggSetting', 'settingcode', 'SET'),
+    ('Incubation', 'incubationcode', 'INB'),
+    ('Candling', 'candlingcode', 'CAN'),
+    ('Hatching', 'hatchingcode', 'HAT'),
+    ('Holding', 'holdingcode', 'HOL'),
+)
+
+
+def deduplicate_hatchery_names(Hatchery):
+    Hatchery.objects.filter(name='').update(name=None)
+    seen = set()
+    for hatchery_id, name in Hatchery.objects.exclude(name=None)\
+            .order_by('id').values_list('id', 'name'):
+        if name in seen:
+            suffix = ' ({})'.format(hatchery_id)
+            Hatchery.objects.filter(id=hatchery_id).update(
+                name=name[:50 - len(suffix)] + suffix)
+        seen.add(name)
+
+
+def fill(apps, schema_editor):
+    deduplicate_hatchery_names(apps.get_model('hatchery', 'Hatchery'))
+    for model, field, prefix in CODES:
+        fill_codes(apps.get_model('hatchery', model), field, prefix)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hatchery', '0004_hatchnotification'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.1.2 on 2020-10-31 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hatchery', '0005_fill_codes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hatchery',
+            name='name',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='incubators',
+            name='code',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='eggsetting',
+            name='settingcode',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='incubation',
+            name='incubationcode',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='candling',
+            name='candlingcode',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='hatching',
+            name='hatchingcode',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='holding',
+            name='holdingcode',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.1.2 on 2020-11-02 16:20
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hatchery', '0006_unique_codes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRecord',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=50)),
+                ('record_id', models.IntegerField()),
+                ('eggsetting_id', models.IntegerField(blank=True, db_index=True, null=True)),
+                ('created', models.DateTimeField(blank=True, null=True)),
+                ('period', models.DateField()),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'ArchivedRecord',
+                'verbose_name_plural': 'ArchivedRecords',
+                'db_table': 'archived_record',
+                'ordering': ['model', 'period'],
+                'managed': True,
+            },
+        ),
+        migrations.AddField(
+            model_name='hatchcycle',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='hatchcycle',
+            name='eggsetting',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hatchcycle_eggsetting', to='hatchery.eggsetting'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedrecord',
+            index=models.Index(fields=['model', 'period'], name='archived_record_period'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='archivedrecord',
+            unique_together={('model', 'record_id')},
+        ),
+    ]
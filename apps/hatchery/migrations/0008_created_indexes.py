@@ -0,0 +1,113 @@
+# Generated by Django 3.1.2 on 2020-11-04 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hatchery', '0007_archive'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='candling',
+            options={'managed': True, 'verbose_name': 'Candling', 'verbose_name_plural': 'Candling'},
+        ),
+        migrations.AlterModelOptions(
+            name='eggsetting',
+            options={'managed': True, 'verbose_name': 'EggSetting', 'verbose_name_plural': 'EggSettings'},
+        ),
+        migrations.AlterModelOptions(
+            name='hatchery',
+            options={'managed': True, 'verbose_name': 'Hatchery', 'verbose_name_plural': 'Hatcheries'},
+        ),
+        migrations.AlterModelOptions(
+            name='hatching',
+            options={'managed': True, 'verbose_name': 'Hatching', 'verbose_name_plural': 'Hatching'},
+        ),
+        migrations.AlterModelOptions(
+            name='hatchnotification',
+            options={'managed': True, 'verbose_name': 'HatchNotification', 'verbose_name_plural': 'HatchNotifications'},
+        ),
+        migrations.AlterModelOptions(
+            name='holding',
+            options={'managed': True, 'verbose_name': 'Holding', 'verbose_name_plural': 'Holding'},
+        ),
+        migrations.AlterModelOptions(
+            name='incubation',
+            options={'managed': True, 'verbose_name': 'Incubation', 'verbose_name_plural': 'Incubations'},
+        ),
+        migrations.AlterModelOptions(
+            name='incubatorcapacity',
+            options={'managed': True, 'verbose_name': 'IncubatorCapacity', 'verbose_name_plural': 'IncubatorCapacity'},
+        ),
+        migrations.AlterModelOptions(
+            name='incubators',
+            options={'managed': True, 'verbose_name': 'Incubator', 'verbose_name_plural': 'Incubators'},
+        ),
+        migrations.AddIndex(
+            model_name='candling',
+            index=models.Index(fields=['created'], name='candling_created'),
+        ),
+        migrations.AddIndex(
+            model_name='candling',
+            index=models.Index(fields=['customer', 'created'], name='candling_customer_created'),
+        ),
+        migrations.AddIndex(
+            model_name='eggsetting',
+            index=models.Index(fields=['created'], name='eggsetting_created'),
+        ),
+        migrations.AddIndex(
+            model_name='eggsetting',
+            index=models.Index(fields=['customer', 'created'], name='eggsetting_customer_created'),
+        ),
+        migrations.AddIndex(
+            model_name='eggsetting',
+            index=models.Index(fields=['incubator', 'created'], name='eggsetting_incubator_created'),
+        ),
+        migrations.AddIndex(
+            model_name='hatchery',
+            index=models.Index(fields=['created'], name='hatchery_created'),
+        ),
+        migrations.AddIndex(
+            model_name='hatching',
+            index=models.Index(fields=['created'], name='hatching_created'),
+        ),
+        migrations.AddIndex(
+            model_name='hatching',
+            index=models.Index(fields=['customer', 'created'], name='hatching_customer_created'),
+        ),
+        migrations.AddIndex(
+            model_name='holding',
+            index=models.Index(fields=['created'], name='holding_created'),
+        ),
+        migrations.AddIndex(
+            model_name='holding',
+            index=models.Index(fields=['customer', 'created'], name='holding_customer_created'),
+        ),
+        migrations.AddIndex(
+            model_name='incubation',
+            index=models.Index(fields=['created'], name='incubation_created'),
+        ),
+        migrations.AddIndex(
+            model_name='incubation',
+            index=models.Index(fields=['customer', 'created'], name='incubation_customer_created'),
+        ),
+        migrations.AddIndex(
+            model_name='incubatorcapacity',
+            index=models.Index(fields=['created'], name='incubator_capacity_created'),
+        ),
+        migrations.AddIndex(
+            model_name='incubatorcapacity',
+            index=models.Index(fields=['incubator', 'created'], name='incubator_capacity_inc_created'),
+        ),
+        migrations.AddIndex(
+            model_name='incubators',
+            index=models.Index(fields=['created'], name='incubators_created'),
+        ),
+        migrations.AddIndex(
+            model_name='incubators',
+            index=models.Index(fields=['hatchery', 'created'], name='incubators_hatchery_created'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.1.2 on 2020-11-06 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hatchery', '0008_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candling',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='hatching',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='candling',
+            index=models.Index(fields=['updated', 'id'], name='candling_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='hatching',
+            index=models.Index(fields=['updated', 'id'], name='hatching_updated'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.2 on 2020-11-09 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hatchery', '0009_updated'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hatchery',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, upload_to='hatchery_photos'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.2 on 2026-10-18 14:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hatchery', '0010_raw_photos'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hatchnotification',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('skipped', 'Skipped')], default='pending', max_length=10),
+        ),
+    ]
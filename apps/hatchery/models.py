@@ -10,17 +10,20 @@ import os
 import datetime
 from django.core.validators import MaxValueValidator, MinValueValidator
 
-from django.db import models
-from django.db.models import ImageField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import ImageField, Sum, Min, Max, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.safestring import mark_safe
 from django.template.defaultfilters import truncatechars, slugify  # or truncatewords
 from django.contrib.gis.db import models as gismodels
 
-from imagekit.models import ProcessedImageField
-from imagekit.processors import ResizeToFit
-
 from telelbirds import settings
 from apps.breeders.models import Breeders
+from apps.core.codes import save_with_code
+from apps.core.derived import Derived, DerivedQuerySet, compute_derived
+from apps.core.ordering import ChronologicalQuerySet
 from apps.customer.models import Customer
 
 class Hatchery(models.Model):
@@ -28,8 +31,8 @@ class Hatchery(models.Model):
     Hatchery Model
     """
     id = models.AutoField(primary_key=True)
-    name=models.CharField(null=True,blank=True,max_length=50)
-    photo = ProcessedImageField(upload_to='hatchery_photos',null=True,blank=True, processors=[ResizeToFit(1280)], format='JPEG', options={'quality': 70})
+    name=models.CharField(null=True,blank=True,max_length=50,unique=True)
+    photo = models.ImageField(upload_to='hatchery_photos',null=True,blank=True)
     email=models.EmailField(null=True,blank=True,max_length=50)
     phone=models.CharField(null=True,blank=True,max_length=15)
     address=models.CharField(null=True,blank=True,max_length=50)
@@ -44,12 +47,16 @@ class Hatchery(models.Model):
     totalcapacity=models.IntegerField(null=True,blank=True,max_length=50)    
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = ChronologicalQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "hatchery"
         verbose_name = 'Hatchery'
         verbose_name_plural = "Hatcheries"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='hatchery_created'),
+        ]
 
 
     def __str__(self):
@@ -74,15 +81,25 @@ class Incubators(models.Model):
     manufacturer=models.CharField(null=True,blank=True,max_length=50)
     model=models.CharField(null=True,blank=True,max_length=15)
     year=models.CharField(null=True,blank=True,max_length=50)
-    code=models.CharField(null=True,blank=True,max_length=50)    
+    code=models.CharField(null=True,blank=True,max_length=50,unique=True)
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = ChronologicalQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "incubators"
         verbose_name = 'Incubator'
         verbose_name_plural = "Incubators"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='incubators_created'),
+            models.Index(fields=['hatchery', 'created'],
+                         name='incubators_hatchery_created'),
+        ]
+
+    def save(self, *args, **kwargs):
+        save_with_code(self, 'code', 'INC',
+                       lambda: super(Incubators, self).save(*args, **kwargs))
 
     def get_absolute_url(self):
         return '/incubator/{}'.format(self.code)
@@ -101,16 +118,33 @@ class IncubatorCapacity(models.Model):
     available=models.IntegerField(null=True,blank=True,max_length=50)
     created = models.DateTimeField(auto_now_add=True)
 
+    DERIVED = {
+        'available': Derived(
+            ('capacity', 'occupied'),
+            lambda capacity, occupied: (capacity or 0) - (occupied or 0),
+            expression=lambda capacity, occupied:
+                Coalesce(capacity, 0) - Coalesce(occupied, 0),
+            strict=False),
+    }
+
+    objects = DerivedQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "incubator_capacity"
         verbose_name = 'IncubatorCapacity'
         verbose_name_plural = "IncubatorCapacity"
-        managed = True  
+        managed = True
+        indexes = [
+            models.Index(fields=['created'], name='incubator_capacity_created'),
+            models.Index(fields=['incubator', 'created'],
+                         name='incubator_capacity_inc_created'),
+        ]  
 
     def save(self, *args, **kwargs):
-        self.available = self.capacity - self.occupied
+        compute_derived(self)
         super(IncubatorCapacity, self).save(*args, **kwargs)
+        from apps.hatchery import occupancy
+        occupancy.invalidate_incubator(self.incubator_id)
 
     def get_absolute_url(self):
         return '/incubator_capacity/{}'.format(self.id)
@@ -121,7 +155,7 @@ class EggSetting(models.Model):
     EggSetting Model
     """
     id = models.AutoField(primary_key=True)
-    settingcode=models.CharField(null=True,blank=True,max_length=50)
+    settingcode=models.CharField(null=True,blank=True,max_length=50,unique=True)
     incubator=models.ForeignKey(Incubators,
         related_name="eggsetting_incubator", blank=True, null=True,
         on_delete=models.SET_NULL)
@@ -132,14 +166,57 @@ class EggSetting(models.Model):
         related_name="eggsetting_breeders", blank=True, null=True,
         on_delete=models.SET_NULL)
     eggs=models.IntegerField(null=True,blank=True,max_length=50)
+    capacity=models.ForeignKey(IncubatorCapacity,
+        related_name="eggsetting_capacity", blank=True, null=True,
+        on_delete=models.SET_NULL)
+    reserved=models.IntegerField(default=0)
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = ChronologicalQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "eggsetting"
         verbose_name = 'EggSetting'
         verbose_name_plural = "EggSettings"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='eggsetting_created'),
+            models.Index(fields=['customer', 'created'],
+                         name='eggsetting_customer_created'),
+            models.Index(fields=['incubator', 'created'],
+                         name='eggsetting_incubator_created'),
+        ]
+
+    def save(self, *args, **kwargs):
+        from apps.hatchery import occupancy
+        with transaction.atomic():
+            if self.pk is None:
+                occupancy.reserve(self)
+            else:
+                self._move_reservation()
+            save_with_code(
+                self, 'settingcode', 'SET',
+                lambda: super(EggSetting, self).save(*args, **kwargs))
+        HatchCycle.objects.refresh_for(self)
+
+    def _move_reservation(self):
+        """
+        Reserve the slots again when the incubator, the capacity row or the
+        number of eggs of a setting still holding slots changes. The row is
+        always picked by occupancy.reserve(). IncubatorFull rolls the edit
+        back.
+        """
+        from apps.hatchery import occupancy
+        stored = EggSetting.objects.filter(pk=self.pk, reserved__gt=0)\
+            .values('incubator_id', 'capacity_id', 'eggs').first()
+        if stored is None or (stored['incubator_id'] == self.incubator_id and
+                              stored['capacity_id'] == self.capacity_id and
+                              stored['eggs'] == self.eggs):
+            return
+        occupancy.release(self.pk)
+        self.capacity_id = None
+        self.reserved = 0
+        occupancy.reserve(self)
 
     def get_absolute_url(self):
         return '/egg_setting/{}'.format(self.settingcode)
@@ -150,7 +227,7 @@ class Incubation(models.Model):
     Incubation Model
     """
     id = models.AutoField(primary_key=True)
-    incubationcode=models.CharField(null=True,blank=True,max_length=50)
+    incubationcode=models.CharField(null=True,blank=True,max_length=50,unique=True)
     eggsetting=models.ForeignKey(EggSetting,
         related_name="incubation_eggsetting", blank=True, null=True,
         on_delete=models.SET_NULL)
@@ -163,12 +240,24 @@ class Incubation(models.Model):
     eggs=models.IntegerField(null=True,blank=True,max_length=50)
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = ChronologicalQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "incubation"
         verbose_name = 'Incubation'
         verbose_name_plural = "Incubations"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='incubation_created'),
+            models.Index(fields=['customer', 'created'],
+                         name='incubation_customer_created'),
+        ]
+
+    def save(self, *args, **kwargs):
+        previous = previous_eggsetting_id(self)
+        save_with_code(self, 'incubationcode', 'INB',
+                       lambda: super(Incubation, self).save(*args, **kwargs))
+        HatchCycle.objects.refresh_for(self, previous)
 
     def get_absolute_url(self):
         return '/incubation/{}'.format(self.incubationcode)
@@ -179,7 +268,7 @@ class Candling(models.Model):
     Candling Model
     """
     id = models.AutoField(primary_key=True)
-    candlingcode=models.CharField(null=True,blank=True,max_length=50)
+    candlingcode=models.CharField(null=True,blank=True,max_length=50,unique=True)
     incubation=models.ForeignKey(Incubation,
         related_name="candling_incubation", blank=True, null=True,
         on_delete=models.SET_NULL)
@@ -195,17 +284,33 @@ class Candling(models.Model):
     spoilt_eggs=models.IntegerField(null=True,blank=True,max_length=50)
     fertile_eggs=models.IntegerField(null=True,blank=True,max_length=50)
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    DERIVED = {
+        'fertile_eggs': Derived(('eggs', 'spoilt_eggs'),
+                                lambda eggs, spoilt: eggs - spoilt),
+    }
+
+    objects = DerivedQuerySet.as_manager()
 
     class Meta:
-        ordering = ['created']
         db_table = "Candling"
         verbose_name = 'Candling'
         verbose_name_plural = "Candling"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='candling_created'),
+            models.Index(fields=['updated', 'id'], name='candling_updated'),
+            models.Index(fields=['customer', 'created'],
+                         name='candling_customer_created'),
+        ]
 
     def save(self, *args, **kwargs):
-        self.fertile_eggs = self.eggs - self.spoilt_eggs
-        super(Candling, self).save(*args, **kwargs)
+        compute_derived(self)
+        previous = previous_eggsetting_id(self)
+        save_with_code(self, 'candlingcode', 'CAN',
+                       lambda: super(Candling, self).save(*args, **kwargs))
+        HatchCycle.objects.refresh_for(self, previous)
 
     def get_absolute_url(self):
         return '/candling/{}'.format(self.candlingcode)
@@ -216,7 +321,7 @@ class Hatching(models.Model):
     Hatching Model
     """
     id = models.AutoField(primary_key=True)
-    hatchingcode=models.CharField(null=True,blank=True,max_length=50)
+    hatchingcode=models.CharField(null=True,blank=True,max_length=50,unique=True)
     candling=models.ForeignKey(Candling,
         related_name="hatching_candling", blank=True, null=True,
         on_delete=models.SET_NULL)
@@ -232,17 +337,37 @@ class Hatching(models.Model):
     chicks_hatched=models.IntegerField(null=True,blank=True,max_length=50)
     notify_customer=models.BooleanField(null=True,blank=True,max_length=50)
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    DERIVED = {
+        'chicks_hatched': Derived(('hatched', 'deformed'),
+                                  lambda hatched, deformed: hatched - deformed),
+    }
+
+    objects = DerivedQuerySet.as_manager()
 
     class Meta:
-        ordering = ['created']
         db_table = "Hatching"
         verbose_name = 'Hatching'
         verbose_name_plural = "Hatching"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='hatching_created'),
+            models.Index(fields=['updated', 'id'], name='hatching_updated'),
+            models.Index(fields=['customer', 'created'],
+                         name='hatching_customer_created'),
+        ]
 
     def save(self, *args, **kwargs):
-        self.chicks_hatched = self.hatched - self.deformed
-        super(Hatching, self).save(*args, **kwargs)
+        compute_derived(self)
+        previous = previous_eggsetting_id(self)
+        save_with_code(self, 'hatchingcode', 'HAT',
+                       lambda: super(Hatching, self).save(*args, **kwargs))
+        from apps.hatchery import occupancy
+        occupancy.release(eggsetting_id_for(self))
+        HatchCycle.objects.refresh_for(self, previous)
+        if self.notify_customer and self.customer_id:
+            HatchNotification.objects.enqueue(self)
 
     def get_absolute_url(self):
         return '/Hatching/{}'.format(self.hatchingcode)
@@ -253,7 +378,7 @@ class Holding(models.Model):
     Holding Model
     """
     id = models.AutoField(primary_key=True)
-    holdingcode=models.CharField(null=True,blank=True,max_length=50)
+    holdingcode=models.CharField(null=True,blank=True,max_length=50,unique=True)
     hatching=models.ForeignKey(Hatching,
         related_name="holding_hatching", blank=True, null=True,
         on_delete=models.SET_NULL)
@@ -275,16 +400,403 @@ class Holding(models.Model):
     cost=models.FloatField(null=True,blank=True,max_length=50)
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = ChronologicalQuerySet.as_manager()
+
     class Meta:
-        ordering = ['created']
         db_table = "Holding"
         verbose_name = 'Holding'
         verbose_name_plural = "Holding"
         managed = True
+        indexes = [
+            models.Index(fields=['created'], name='holding_created'),
+            models.Index(fields=['customer', 'created'],
+                         name='holding_customer_created'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(Holding, cls).from_db(db, field_names, values)
+        instance._loaded = dict(zip(field_names, values))
+        return instance
 
     def save(self, *args, **kwargs):
-        self.cost = self.distance #* self.location
-        super(Holding, self).save(*args, **kwargs)
+        loaded = getattr(self, '_loaded', {})
+        moved = 'location' in loaded and self.location != loaded['location']
+        if self.location is not None and (self.distance is None or moved):
+            from apps.spatial.queries import holding_distance
+            self.distance = holding_distance(self)
+        # The cost planned for the delivery route (DeliveryRoute.plan_day)
+        # is kept until the distance changes.
+        if self.cost is None or 'distance' not in loaded or \
+                self.distance != loaded['distance']:
+            from apps.delivery.models import delivery_cost
+            self.cost = delivery_cost(self.distance)
+        previous = previous_eggsetting_id(self)
+        save_with_code(self, 'holdingcode', 'HOL',
+                       lambda: super(Holding, self).save(*args, **kwargs))
+        self._loaded = dict(loaded, location=self.location,
+                            distance=self.distance)
+        HatchCycle.objects.refresh_for(self, previous)
+
+    def get_absolute_url(self):
+        return '/holding/{}'.format(self.holdingcode)
+
+
+# Lookup from each pipeline model back to the EggSetting it belongs to.
+SETTING_PATHS = {
+    'EggSetting': 'id',
+    'Incubation': 'eggsetting_id',
+    'Candling': 'incubation__eggsetting_id',
+    'Hatching': 'candling__incubation__eggsetting_id',
+    'Holding': 'hatching__candling__incubation__eggsetting_id',
+}
+
+
+def eggsetting_id_for(instance):
+    """
+    Return the id of the EggSetting a pipeline record belongs to, or None.
+    """
+    path = SETTING_PATHS[instance.__class__.__name__]
+    if path == 'id':
+        return instance.id
+    return instance.__class__.objects.filter(
+        pk=instance.pk).values_list(path, flat=True).first()
+
+
+def previous_eggsetting_id(instance):
+    """
+    The EggSetting a pipeline record belongs to as stored, read before a
+    save that may link it to another one.
+    """
+    if instance.pk is None:
+        return None
+    return eggsetting_id_for(instance)
+
+
+class HatchCycleManager(models.Manager):
+    """
+    Maintains the HatchCycle ledger from the pipeline models.
+    """
+    def refresh_for(self, instance, previous=None):
+        """
+        Refresh the ledger row of the cycle the given pipeline record
+        belongs to, and that of ``previous``, the setting it belonged to
+        before, if it moved. Records not (yet) linked to an EggSetting are
+        ignored.
+        """
+        eggsetting_id = eggsetting_id_for(instance)
+        if previous is not None and previous != eggsetting_id:
+            self.refresh(previous)
+        if eggsetting_id is None:
+            return None
+        return self.refresh(eggsetting_id)
+
+    def refresh(self, eggsetting_id):
+        """
+        Recompute the ledger row for a single EggSetting.
+        """
+        rows = self._build([eggsetting_id])
+        if not rows:
+            self.filter(eggsetting_id=eggsetting_id).delete()
+            return None
+        values = rows[0]
+        cycle, created = self.update_or_create(
+            eggsetting_id=eggsetting_id, defaults=values)
+        return cycle
+
+    def rebuild(self, batch_size=2000):
+        """
+        Rebuild the whole ledger from the pipeline tables, batch_size
+        settings at a time. Returns the number of rows written.
+        """
+        setting_ids = list(EggSetting.objects.order_by('id')
+                           .values_list('id', flat=True))
+        total = 0
+        with transaction.atomic():
+            # Archived cycles no longer have their pipeline rows.
+            self.filter(archived_at__isnull=True).delete()
+            for start in range(0, len(setting_ids), batch_size):
+                chunk = setting_ids[start:start + batch_size]
+                cycles = [HatchCycle(**row)
+                          for row in self._build(chunk, with_key=True)]
+                self.bulk_create(cycles, batch_size=batch_size)
+                total += len(cycles)
+        return total
+
+    def _build(self, setting_ids, with_key=False):
+        """
+        Aggregate every stage for the given settings with one grouped
+        query per stage and merge them into ledger rows.
+        """
+        def grouped(model, path, condition=Q(), **aggregates):
+            # order_by() clears the default ordering, which would otherwise
+            # leak into the GROUP BY clause.
+            qs = (model.objects.filter(condition,
+                                       **{path + '__in': setting_ids})
+                  .values(path).order_by().annotate(**aggregates))
+            return {row.pop(path): row for row in qs}
+
+        incubations = grouped(
+            Incubation, 'eggsetting_id',
+            eggs_incubated=Sum('eggs'),
+            incubated_at=Min('created'))
+        candlings = grouped(
+            Candling, 'incubation__eggsetting_id',
+            eggs_candled=Sum('eggs'),
+            spoilt_eggs=Sum('spoilt_eggs'),
+            fertile_eggs=Sum('fertile_eggs'),
+            candled_at=Max('candled_date'))
+        hatchings = grouped(
+            Hatching, 'candling__incubation__eggsetting_id',
+            hatched=Sum('hatched'),
+            deformed=Sum('deformed'),
+            chicks_hatched=Sum('chicks_hatched'),
+            hatched_at=Max('created'))
+        holdings = grouped(
+            Holding, 'hatching__candling__incubation__eggsetting_id',
+            held_at=Max('created'))
+        # Summed over the hatchings, each counted once however many
+        # delivered holdings it has.
+        deliveries = grouped(
+            Hatching, 'candling__incubation__eggsetting_id',
+            Q(id__in=Holding.objects.filter(customer_delivery=True)
+              .values('hatching_id')),
+            delivered=Sum('chicks_hatched'))
+
+        rows = []
+        settings_qs = EggSetting.objects.filter(id__in=setting_ids).values(
+            'id', 'settingcode', 'customer_id', 'breeders_id', 'eggs',
+            'created').order_by()
+        for setting in settings_qs:
+            setting_id = setting['id']
+            row = {
+                'settingcode': setting['settingcode'],
+                'customer_id': setting['customer_id'],
+                'breeders_id': setting['breeders_id'],
+                'eggs_set': setting['eggs'] or 0,
+                'set_at': setting['created'],
+                'incubated_at': None,
+                'candled_at': None,
+                'hatched_at': None,
+                'held_at': None,
+            }
+            for stage in (incubations, candlings, hatchings, holdings,
+                          deliveries):
+                for field, value in stage.get(setting_id, {}).items():
+                    row[field] = value
+            for field in HatchCycle.COUNT_FIELDS:
+                row[field] = row.get(field) or 0
+            if with_key:
+                row['eggsetting_id'] = setting_id
+            rows.append(row)
+        return rows
+
+    def for_customer(self, customer):
+        """
+        Totals of every stage for one customer, in a single query.
+        """
+        return self.filter(customer=customer).aggregate(
+            **{field: Sum(field) for field in HatchCycle.COUNT_FIELDS})
+
+
+class HatchCycle(models.Model):
+    """
+    HatchCycle Model
+
+    Denormalized ledger with one row per EggSetting, kept up to date from the
+    save() of each pipeline model. Rebuild with the rebuild_hatch_ledger
+    management command. Rows of archived cycles are kept, with archived_at
+    set and no eggsetting, so reports over the ledger still cover them.
+    """
+    COUNT_FIELDS = (
+        'eggs_set', 'eggs_incubated', 'eggs_candled', 'spoilt_eggs',
+        'fertile_eggs', 'hatched', 'deformed', 'chicks_hatched', 'delivered',
+    )
+
+    id = models.AutoField(primary_key=True)
+    eggsetting=models.OneToOneField(EggSetting,
+        related_name="hatchcycle_eggsetting", blank=True, null=True,
+        on_delete=models.SET_NULL)
+    settingcode=models.CharField(null=True,blank=True,max_length=50,db_index=True)
+    customer=models.ForeignKey(Customer,
+        related_name="hatchcycle_customer", blank=True, null=True,
+        on_delete=models.SET_NULL)
+    breeders=models.ForeignKey(Breeders,
+        related_name="hatchcycle_breeders", blank=True, null=True,
+        on_delete=models.SET_NULL)
+    eggs_set=models.IntegerField(default=0)
+    eggs_incubated=models.IntegerField(default=0)
+    eggs_candled=models.IntegerField(default=0)
+    spoilt_eggs=models.IntegerField(default=0)
+    fertile_eggs=models.IntegerField(default=0)
+    hatched=models.IntegerField(default=0)
+    deformed=models.IntegerField(default=0)
+    chicks_hatched=models.IntegerField(default=0)
+    delivered=models.IntegerField(default=0)
+    set_at=models.DateTimeField(null=True,blank=True)
+    incubated_at=models.DateTimeField(null=True,blank=True)
+    candled_at=models.DateTimeField(null=True,blank=True)
+    hatched_at=models.DateTimeField(null=True,blank=True)
+    held_at=models.DateTimeField(null=True,blank=True)
+    archived_at=models.DateTimeField(null=True,blank=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = HatchCycleManager()
+
+    class Meta:
+        ordering = ['set_at']
+        db_table = "hatch_cycle"
+        verbose_name = 'HatchCycle'
+        verbose_name_plural = "HatchCycles"
+        managed = True
+        indexes = [
+            models.Index(fields=['customer', 'set_at'],
+                         name='hatch_cycle_customer_set_at'),
+            models.Index(fields=['set_at'], name='hatch_cycle_set_at'),
+        ]
+
+    def __str__(self):
+        return self.settingcode or str(self.eggsetting_id)
 
     def get_absolute_url(self):
-        return '/holding/{}'.format(self.holdingcode)
\ No newline at end of file
+        return '/egg_setting/{}'.format(self.settingcode)
+
+
+class HatchNotificationManager(models.Manager):
+
+    def enqueue(self, hatching):
+        """
+        Queue a notification for a hatching. A hatching is only ever queued
+        once, saving it again updates the pending notification.
+        """
+        notification, created = self.get_or_create(
+            hatching=hatching,
+            defaults={'customer_id': hatching.customer_id,
+                      'chicks': hatching.chicks_hatched or 0})
+        if not created and notification.status == HatchNotification.PENDING:
+            self.filter(pk=notification.pk).update(
+                customer_id=hatching.customer_id,
+                chicks=hatching.chicks_hatched or 0)
+        return notification
+
+
+class HatchNotification(models.Model):
+    """
+    HatchNotification Model
+
+    A hatch event waiting to be sent to a customer. Pending events are
+    coalesced into one message per customer by
+    apps.hatchery.notifications.dispatch().
+    """
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    SKIPPED = 'skipped'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (SKIPPED, 'Skipped'),
+    )
+
+    id = models.AutoField(primary_key=True)
+    hatching=models.OneToOneField(Hatching,
+        related_name="hatchnotification_hatching", on_delete=models.CASCADE)
+    customer=models.ForeignKey(Customer,
+        related_name="hatchnotification_customer", blank=True, null=True,
+        on_delete=models.CASCADE)
+    chicks=models.IntegerField(default=0)
+    status=models.CharField(max_length=10,choices=STATUS_CHOICES,default=PENDING)
+    sent_at=models.DateTimeField(null=True,blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = HatchNotificationManager()
+
+    class Meta:
+        db_table = "hatch_notification"
+        verbose_name = 'HatchNotification'
+        verbose_name_plural = "HatchNotifications"
+        managed = True
+        indexes = [
+            models.Index(fields=['status', 'customer'],
+                         name='hatch_notification_status'),
+            models.Index(fields=['customer', 'sent_at'],
+                         name='hatch_notification_sent_at'),
+        ]
+
+
+def month_of(moment):
+    """
+    First day of the local month of a datetime, the ArchivedRecord period.
+    """
+    return timezone.localtime(moment).date().replace(day=1)
+
+
+class ArchivedRecordManager(models.Manager):
+    """
+    Read-through access to archived pipeline rows, see apps.hatchery.archive.
+    """
+    def for_model(self, model, since=None, until=None):
+        """
+        Archived rows of a model, optionally created in [since, until).
+        The month partition is filtered first so only the relevant periods
+        are read.
+        """
+        qs = self.filter(model=model._meta.label_lower).order_by()
+        if since is not None:
+            qs = qs.filter(period__gte=month_of(since), created__gte=since)
+        if until is not None:
+            qs = qs.filter(period__lte=month_of(until), created__lt=until)
+        return qs
+
+    def rows(self, model, since=None, until=None):
+        """
+        Yield the archived rows of a model as dicts of attname: value.
+        """
+        qs = self.for_model(model, since, until).values_list('data', flat=True)
+        for data in qs.iterator(chunk_size=2000):
+            yield data
+
+    def instances(self, model, since=None, until=None):
+        """
+        Yield unsaved model instances rebuilt from the archived rows.
+        """
+        fields = model._meta.concrete_fields
+        for data in self.rows(model, since, until):
+            yield model(**{field.attname: field.to_python(data[field.attname])
+                           for field in fields if field.attname in data})
+
+
+class ArchivedRecord(models.Model):
+    """
+    ArchivedRecord Model
+
+    A pipeline row moved out of its table by apps.hatchery.archive once its
+    cycle was delivered long enough ago. Rows are partitioned by the month
+    they were created in.
+    """
+    id = models.AutoField(primary_key=True)
+    model=models.CharField(max_length=50)
+    record_id=models.IntegerField()
+    eggsetting_id=models.IntegerField(null=True,blank=True,db_index=True)
+    created=models.DateTimeField(null=True,blank=True)
+    period=models.DateField()
+    data=models.JSONField(encoder=DjangoJSONEncoder)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ArchivedRecordManager()
+
+    class Meta:
+        ordering = ['model', 'period']
+        db_table = "archived_record"
+        verbose_name = 'ArchivedRecord'
+        verbose_name_plural = "ArchivedRecords"
+        managed = True
+        unique_together = (('model', 'record_id'),)
+        indexes = [
+            models.Index(fields=['model', 'period'],
+                         name='archived_record_period'),
+        ]
+
+    def __str__(self):
+        return '{} {}'.format(self.model, self.record_id)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Hatch notifications.
+
+Hatching.save() queues a HatchNotification when notify_customer is set.
+dispatch(), run periodically by the dispatch_hatch_notifications task,
+coalesces all pending notifications of a customer into a single SMS and
+hands every message of the run to the SMS gateway in one call. No
+database transaction or row lock is held while the gateway is called.
+
+Settings:
+    SMS_NOTIFICATION_INTERVAL: minimum number of seconds between two
+        messages to the same customer (default 1 hour). Notifications
+        arriving in between wait for the next run past the interval.
+    SMS_MAX_MESSAGES_PER_RUN: cap on messages per run (default 500), the
+        rest stay pending for the next run.
+    SMS_CLAIM_TIMEOUT: seconds after which notifications claimed by a run
+        that never recorded its outcome are sent again (default 15
+        minutes).
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.customer.models import Customer
+from apps.hatchery import sms
+from apps.hatchery.models import HatchNotification
+
+MESSAGE = 'Hello {name}, {batches} of your egg batches hatched with ' \
+          '{chicks} chicks in total. TelelBirds'
+
+
+def interval():
+    return datetime.timedelta(
+        seconds=getattr(settings, 'SMS_NOTIFICATION_INTERVAL', 60 * 60))
+
+
+def max_messages():
+    return getattr(settings, 'SMS_MAX_MESSAGES_PER_RUN', 500)
+
+
+def format_message(customer, batches, chicks):
+    return MESSAGE.format(name=customer['first_name'] or 'customer',
+                          batches=batches, chicks=chicks)
+
+
+def dispatch(backend=None):
+    """
+    Send one message per customer with pending notifications.
+
+    The notifications are claimed (marked as sending) in a first short
+    transaction, the gateway is called with no transaction open, and the
+    outcome is recorded in a second one. Returns the number of messages
+    handed to the gateway.
+    """
+    backend = backend or sms.get_backend()
+    claimed, messages = claim()
+    if not messages:
+        return 0
+
+    try:
+        sent = backend.send_messages(messages)
+    except Exception:
+        with transaction.atomic():
+            claimed.update(status=HatchNotification.PENDING, sent_at=None)
+        raise
+    with transaction.atomic():
+        claimed.update(status=HatchNotification.SENT, sent_at=timezone.now())
+    return sent
+
+
+def claim():
+    """
+    Mark the notifications to send now as sending, and skip those of
+    customers who cannot be reached.
+
+    Returns the queryset of the claimed notifications and the (phone, text)
+    messages to send for them. Claims older than SMS_CLAIM_TIMEOUT, left by
+    a run that died before recording its outcome, are taken over.
+    """
+    now = timezone.now()
+    claim_timeout = datetime.timedelta(
+        seconds=getattr(settings, 'SMS_CLAIM_TIMEOUT', 15 * 60))
+
+    with transaction.atomic():
+        # Lock the pending rows so concurrent runs never claim them twice.
+        pending = HatchNotification.objects.select_for_update(
+            skip_locked=True).filter(
+                Q(status=HatchNotification.PENDING) |
+                Q(status=HatchNotification.SENDING,
+                  sent_at__lt=now - claim_timeout))
+        pending_ids = list(pending.order_by('id').values_list('id', flat=True))
+        if not pending_ids:
+            return HatchNotification.objects.none(), []
+        pending = HatchNotification.objects.filter(id__in=pending_ids)
+
+        recently_notified = HatchNotification.objects.filter(
+            status__in=(HatchNotification.SENT, HatchNotification.SENDING),
+            sent_at__gte=now - interval())\
+            .exclude(id__in=pending_ids).values('customer_id')
+        groups = list(pending.exclude(customer_id__in=recently_notified)
+                      .values('customer_id').order_by('customer_id')
+                      .annotate(batches=Count('id'), chicks=Sum('chicks'))
+                      [:max_messages()])
+
+        customers = Customer.objects.in_bulk(
+            [group['customer_id'] for group in groups
+             if group['customer_id'] is not None])
+        customers = {pk: {'first_name': customer.first_name,
+                          'phone': customer.phone,
+                          'notification_sms': customer.notification_sms}
+                     for pk, customer in customers.items()}
+
+        messages, notified, skipped = [], [], []
+        for group in groups:
+            customer = customers.get(group['customer_id'])
+            if customer is None or not customer['notification_sms'] or \
+                    not customer['phone']:
+                skipped.append(group['customer_id'])
+                continue
+            messages.append((customer['phone'], format_message(
+                customer, group['batches'], group['chicks'] or 0)))
+            notified.append(group['customer_id'])
+
+        claimed_ids = list(pending.filter(customer_id__in=notified)
+                           .values_list('id', flat=True))
+        HatchNotification.objects.filter(id__in=claimed_ids).update(
+            status=HatchNotification.SENDING, sent_at=now)
+        pending.filter(customer_id__in=skipped).update(
+            status=HatchNotification.SKIPPED)
+        if None in skipped:
+            pending.filter(customer_id__isnull=True).update(
+                status=HatchNotification.SKIPPED)
+    return HatchNotification.objects.filter(
+        id__in=claimed_ids, status=HatchNotification.SENDING), messages
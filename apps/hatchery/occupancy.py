@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Incubator occupancy.
+
+Egg settings reserve slots on an IncubatorCapacity row when they are created
+and give them back when the batch hatches. Reservations are conditional
+UPDATEs on row-locked capacities, so two clerks setting eggs at the same time
+can never push an incubator past its capacity.
+"""
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from apps.breeders.models import Breeders
+from apps.hatchery.models import EggSetting, IncubatorCapacity, Incubators
+
+AVAILABILITY_CACHE_KEY = 'hatchery:{}:availability'
+AVAILABILITY_CACHE_TIMEOUT = 60 * 60
+
+
+class IncubatorFull(ValidationError):
+    """
+    Raised when an incubator has no capacity row with enough free slots.
+    """
+
+
+def reserve(eggsetting):
+    """
+    Reserve slots for a new egg setting on its incubator.
+
+    A capacity row for the breed being set is preferred over the others.
+    Sets ``capacity`` and ``reserved`` on the (unsaved) egg setting and
+    raises IncubatorFull when no row has room for all the eggs. Incubators
+    without capacity rows are not tracked: nothing is reserved for them.
+    """
+    eggs = eggsetting.eggs or 0
+    if not eggsetting.incubator_id or eggs <= 0:
+        return None
+
+    breed = None
+    if eggsetting.breeders_id:
+        breed = Breeders.objects.filter(pk=eggsetting.breeders_id)\
+            .values_list('breed__breed', flat=True).first()
+
+    with transaction.atomic():
+        candidates = IncubatorCapacity.objects.select_for_update().filter(
+            incubator_id=eggsetting.incubator_id, available__gte=eggs)\
+            .annotate(breed_match=Case(
+                When(breed=breed, then=Value(0)), default=Value(1),
+                output_field=IntegerField()))\
+            .order_by('breed_match', 'id')
+
+        for capacity_id in candidates.values_list('id', flat=True):
+            # The available__gte guard makes the update a no-op if another
+            # transaction took the slots after the candidates were read.
+            updated = IncubatorCapacity.objects.filter(
+                pk=capacity_id, available__gte=eggs).update(
+                occupied=Coalesce(F('occupied'), 0) + eggs,
+                available=F('available') - eggs)
+            if updated:
+                eggsetting.capacity_id = capacity_id
+                eggsetting.reserved = eggs
+                transaction.on_commit(
+                    lambda: invalidate_incubator(eggsetting.incubator_id))
+                return capacity_id
+
+        if not IncubatorCapacity.objects.filter(
+                incubator_id=eggsetting.incubator_id).exists():
+            return None
+
+    raise IncubatorFull(
+        'Incubator %(incubator)s has no room for %(eggs)s eggs.',
+        code='incubator_full',
+        params={'incubator': eggsetting.incubator_id, 'eggs': eggs})
+
+
+def release(eggsetting_id):
+    """
+    Give the slots held by an egg setting back to its incubator.
+
+    Safe to call more than once: only the first call releases anything.
+    """
+    if eggsetting_id is None:
+        return 0
+
+    with transaction.atomic():
+        setting = EggSetting.objects.select_for_update().filter(
+            pk=eggsetting_id, reserved__gt=0).values(
+            'capacity_id', 'incubator_id', 'reserved').first()
+        if setting is None:
+            return 0
+
+        if setting['capacity_id']:
+            IncubatorCapacity.objects.filter(
+                pk=setting['capacity_id']).update(
+                occupied=F('occupied') - setting['reserved'],
+                available=F('available') + setting['reserved'])
+        EggSetting.objects.filter(pk=eggsetting_id).update(reserved=0)
+        transaction.on_commit(
+            lambda: invalidate_incubator(setting['incubator_id']))
+
+    return setting['reserved']
+
+
+def hatchery_availability(hatchery_id):
+    """
+    Return ``{incubator_id: {'capacity', 'occupied', 'available'}}`` for a
+    hatchery, served from the cache and rebuilt with one query on a miss.
+    """
+    key = AVAILABILITY_CACHE_KEY.format(hatchery_id)
+    availability = cache.get(key)
+    if availability is None:
+        rows = IncubatorCapacity.objects.filter(
+            incubator__hatchery_id=hatchery_id)\
+            .values('incubator_id').order_by()\
+            .annotate(capacity=Coalesce(Sum('capacity'), 0),
+                      occupied=Coalesce(Sum('occupied'), 0),
+                      available=Coalesce(Sum('available'), 0))
+        availability = {
+            row.pop('incubator_id'): row for row in rows
+        }
+        cache.set(key, availability, AVAILABILITY_CACHE_TIMEOUT)
+    return availability
+
+
+def invalidate_incubator(incubator_id):
+    """
+    Drop the cached availability of the hatchery owning an incubator.
+    """
+    if incubator_id is None:
+        return
+    hatchery_id = Incubators.objects.filter(pk=incubator_id)\
+        .values_list('hatchery_id', flat=True).first()
+    if hatchery_id is not None:
+        cache.delete(AVAILABILITY_CACHE_KEY.format(hatchery_id))
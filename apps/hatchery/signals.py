@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+from apps.hatchery import occupancy
+from apps.hatchery.models import (Candling, EggSetting, HatchCycle, Hatching,
+                                  Holding, Incubation, eggsetting_id_for)
+
+
+@receiver(pre_delete, sender=EggSetting)
+def eggsetting_deleted(sender, instance, **kwargs):
+    # Before the delete, while the row still tells what it holds; in the
+    # same transaction.
+    occupancy.release(instance.id)
+    HatchCycle.objects.filter(eggsetting_id=instance.id,
+                              archived_at__isnull=True).delete()
+
+
+@receiver(pre_delete, sender=Incubation)
+@receiver(pre_delete, sender=Candling)
+@receiver(pre_delete, sender=Hatching)
+@receiver(pre_delete, sender=Holding)
+def pipeline_record_deleting(sender, instance, **kwargs):
+    # The path to the setting goes through the row being deleted.
+    instance._hatchcycle_eggsetting_id = eggsetting_id_for(instance)
+
+
+@receiver(post_delete, sender=Incubation)
+@receiver(post_delete, sender=Candling)
+@receiver(post_delete, sender=Hatching)
+@receiver(post_delete, sender=Holding)
+def pipeline_record_deleted(sender, instance, **kwargs):
+    eggsetting_id = getattr(instance, '_hatchcycle_eggsetting_id', None)
+    # Archiving deletes the rows of cycles whose ledger row stays as it is.
+    if eggsetting_id is not None and not HatchCycle.objects.filter(
+            eggsetting_id=eggsetting_id, archived_at__isnull=False).exists():
+        HatchCycle.objects.refresh(eggsetting_id)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+SMS gateway backends, chosen with the SMS_BACKEND setting in the same way
+as Django's EMAIL_BACKEND.
+
+    SMS_BACKEND = 'apps.hatchery.sms.ConsoleBackend'   # default
+    SMS_BACKEND = 'apps.hatchery.sms.LocMemBackend'    # tests
+
+A gateway backend subclasses BaseBackend and implements send_messages().
+"""
+import sys
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = 'apps.hatchery.sms.ConsoleBackend'
+
+# Messages "sent" through the LocMemBackend.
+outbox = []
+
+
+class BaseBackend(object):
+
+    def send_messages(self, messages):
+        """
+        Send a list of (phone, text) pairs and return the number sent.
+        """
+        raise NotImplementedError
+
+
+class ConsoleBackend(BaseBackend):
+    """
+    Write messages to stdout instead of sending them.
+    """
+    _lock = threading.RLock()
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def send_messages(self, messages):
+        with self._lock:
+            for phone, text in messages:
+                self.stream.write('SMS to {}: {}\n'.format(phone, text))
+            self.stream.flush()
+        return len(messages)
+
+
+class LocMemBackend(BaseBackend):
+    """
+    Keep messages in apps.hatchery.sms.outbox, for tests.
+    """
+
+    def send_messages(self, messages):
+        outbox.extend(messages)
+        return len(messages)
+
+
+def get_backend(path=None):
+    path = path or getattr(settings, 'SMS_BACKEND', DEFAULT_BACKEND)
+    return import_string(path)()
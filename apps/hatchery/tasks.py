@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from celery import shared_task
+
+from apps.hatchery import notifications
+
+
+@shared_task(ignore_result=True)
+def dispatch_hatch_notifications():
+    """
+    Send the pending hatch notifications, one message per customer.
+    """
+    return notifications.dispatch()
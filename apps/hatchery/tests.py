@@ -1,3 +1,566 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import io
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core import codes
+from apps.core.paginator import EstimatedCountPaginator
+from apps.customer.admin import CustomerAdmin
+from apps.customer.models import Customer
+from apps.dashboard.models import DailyRollup
+from apps.hatchery import archive, notifications, occupancy, sms
+from apps.hatchery.management.commands import benchmark_changelist
+from apps.hatchery.models import (Hatchery, Incubators, IncubatorCapacity,
+                                  EggSetting, Incubation, Candling, Hatching,
+                                  Holding, HatchCycle, HatchNotification,
+                                  ArchivedRecord)
+from apps.hatchery.views import EggSettingDatatableView
+
+
+class HatchCycleTest(TestCase):
+
+    def setUp(self):
+        self.customer = Customer.objects.create(first_name='Jane',
+                                                last_name='Doe')
+
+    def run_cycle(self, code, eggs=100, spoilt=10, hatched=80, deformed=5):
+        setting = EggSetting.objects.create(settingcode=code,
+                                            customer=self.customer, eggs=eggs)
+        incubation = Incubation.objects.create(eggsetting=setting, eggs=eggs)
+        candling = Candling.objects.create(incubation=incubation, eggs=eggs,
+                                           spoilt_eggs=spoilt)
+        hatching = Hatching.objects.create(candling=candling, hatched=hatched,
+                                           deformed=deformed)
+        Holding.objects.create(hatching=hatching, customer_delivery=True,
+                               distance=0)
+        return setting
+
+    def test_ledger_follows_pipeline_saves(self):
+        setting = self.run_cycle('ES-1')
+        cycle = HatchCycle.objects.get(eggsetting=setting)
+        self.assertEqual(cycle.settingcode, 'ES-1')
+        self.assertEqual(cycle.eggs_set, 100)
+        self.assertEqual(cycle.fertile_eggs, 90)
+        self.assertEqual(cycle.chicks_hatched, 75)
+        self.assertEqual(cycle.delivered, 75)
+        self.assertIsNotNone(cycle.held_at)
+
+    def test_delivered_counts_each_hatching_once(self):
+        setting = self.run_cycle('ES-1')
+        hatching = Hatching.objects.get()
+        Holding.objects.create(hatching=hatching, customer_delivery=True,
+                               distance=0)
+        self.assertEqual(HatchCycle.objects.get(eggsetting=setting).delivered,
+                         75)
+        HatchCycle.objects.rebuild()
+        self.assertEqual(HatchCycle.objects.get(eggsetting=setting).delivered,
+                         75)
+
+    def test_ledger_follows_deletes_and_moves(self):
+        first = self.run_cycle('ES-1')
+        second = self.run_cycle('ES-2', eggs=50, spoilt=0, hatched=40,
+                                deformed=0)
+        Holding.objects.get(
+            hatching__candling__incubation__eggsetting=first).delete()
+        cycle = HatchCycle.objects.get(eggsetting=first)
+        self.assertEqual((cycle.delivered, cycle.held_at), (0, None))
+
+        Hatching.objects.filter(candling__incubation__eggsetting=first)\
+            .delete()
+        self.assertEqual(
+            HatchCycle.objects.get(eggsetting=first).chicks_hatched, 0)
+
+        # A candling moved to the other setting's incubation.
+        candling = Candling.objects.get(incubation__eggsetting=first)
+        candling.incubation = Incubation.objects.get(eggsetting=second)
+        candling.save()
+        self.assertEqual(
+            HatchCycle.objects.get(eggsetting=first).eggs_candled, 0)
+        self.assertEqual(
+            HatchCycle.objects.get(eggsetting=second).eggs_candled, 150)
+
+        first.delete()
+        self.assertFalse(HatchCycle.objects.filter(
+            settingcode='ES-1').exists())
+
+    def test_rebuild_matches_incremental(self):
+        self.run_cycle('ES-1')
+        self.run_cycle('ES-2', eggs=50, spoilt=0, hatched=40, deformed=0)
+        before = HatchCycle.objects.for_customer(self.customer)
+        HatchCycle.objects.all().delete()
+
+        self.assertEqual(HatchCycle.objects.rebuild(batch_size=1), 2)
+        self.assertEqual(HatchCycle.objects.for_customer(self.customer), before)
+        self.assertEqual(before['delivered'], 115)
+
+    def test_archive_delivered_cycles(self):
+        archived = self.run_cycle('ES-1')
+        kept = self.run_cycle('ES-2')
+        Holding.objects.filter(
+            hatching__candling__incubation__eggsetting=kept).delete()
+        HatchCycle.objects.refresh(kept.id)
+        DailyRollup.objects.refresh()
+        fields = ('date',) + DailyRollup.COUNT_FIELDS
+        before = list(DailyRollup.objects.values(*fields))
+        totals = HatchCycle.objects.for_customer(self.customer)
+
+        self.assertEqual(archive.archive_cycles(months=0), (1, 5))
+        self.assertFalse(EggSetting.objects.filter(id=archived.id).exists())
+        self.assertEqual(Candling.objects.count(), 1)
+        self.assertEqual(ArchivedRecord.objects.count(), 5)
+        cycle = HatchCycle.objects.get(settingcode='ES-1')
+        self.assertIsNone(cycle.eggsetting_id)
+        self.assertIsNotNone(cycle.archived_at)
+        self.assertEqual(HatchCycle.objects.for_customer(self.customer), totals)
+
+        # Reports read the archived rows back.
+        candling, = ArchivedRecord.objects.instances(Candling)
+        self.assertEqual(candling.fertile_eggs, 90)
+        self.assertIsNotNone(candling.created.tzinfo)
+        DailyRollup.objects.refresh()
+        self.assertEqual(list(DailyRollup.objects.values(*fields)), before)
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = archive.export_period(timezone.localdate(), directory)
+            self.assertEqual(len(paths), 5)
+            with gzip.open(os.path.join(
+                    directory, 'hatchery.candling-{:%Y-%m}.csv.gz'.format(
+                        timezone.localdate())), 'rt') as stream:
+                rows = list(csv.DictReader(stream))
+            self.assertEqual(rows[0]['fertile_eggs'], '90')
+
+        # Archived cycles are not rebuilt nor archived twice.
+        self.assertEqual(HatchCycle.objects.rebuild(), 1)
+        self.assertEqual(HatchCycle.objects.count(), 2)
+        self.assertEqual(archive.archive_cycles(months=0), (0, 0))
+
+
+class OccupancyTest(TransactionTestCase):
+
+    def setUp(self):
+        self.hatchery = Hatchery.objects.create(name='Main')
+        self.incubator = Incubators.objects.create(hatchery=self.hatchery,
+                                                   code='INC-1')
+        self.capacity = IncubatorCapacity.objects.create(
+            incubator=self.incubator, capacity=100, occupied=0)
+
+    def test_reserve_and_release(self):
+        setting = EggSetting.objects.create(incubator=self.incubator, eggs=60)
+        self.capacity.refresh_from_db()
+        self.assertEqual(self.capacity.available, 40)
+        self.assertEqual(setting.reserved, 60)
+        self.assertEqual(
+            occupancy.hatchery_availability(self.hatchery.id)
+            [self.incubator.id]['available'], 40)
+
+        incubation = Incubation.objects.create(eggsetting=setting, eggs=60)
+        candling = Candling.objects.create(incubation=incubation, eggs=60,
+                                           spoilt_eggs=0)
+        Hatching.objects.create(candling=candling, hatched=60, deformed=0)
+        self.capacity.refresh_from_db()
+        self.assertEqual(self.capacity.available, 100)
+        self.assertEqual(occupancy.release(setting.id), 0)
+        self.assertEqual(
+            occupancy.hatchery_availability(self.hatchery.id)
+            [self.incubator.id]['occupied'], 0)
+
+    def test_availability_view(self):
+        self.client.force_login(User.objects.create_user('clerk'))
+        url = reverse('hatchery_availability', args=['Main'])
+        EggSetting.objects.create(incubator=self.incubator, eggs=60)
+        self.assertEqual(self.client.get(url).json(), {'incubators': [
+            {'incubator': self.incubator.id, 'capacity': 100,
+             'occupied': 60, 'available': 40}]})
+        with self.assertNumQueries(3):
+            # Session and user, then the hatchery; the slots are cached.
+            self.client.get(url)
+
+        EggSetting.objects.create(incubator=self.incubator, eggs=30)
+        self.assertEqual(
+            self.client.get(url).json()['incubators'][0]['available'], 10)
+        self.assertEqual(self.client.get(
+            reverse('hatchery_availability', args=['None'])).status_code, 404)
+
+    def test_overbooking_is_refused(self):
+        EggSetting.objects.create(incubator=self.incubator, eggs=80)
+        with self.assertRaises(occupancy.IncubatorFull):
+            EggSetting.objects.create(incubator=self.incubator, eggs=30)
+        self.assertEqual(EggSetting.objects.count(), 1)
+
+    def test_untracked_incubator(self):
+        other = Incubators.objects.create(hatchery=self.hatchery,
+                                          code='INC-2')
+        setting = EggSetting.objects.create(incubator=other, eggs=500)
+        self.assertEqual(setting.reserved, 0)
+        self.assertIsNone(setting.capacity_id)
+
+    def test_delete_releases(self):
+        setting = EggSetting.objects.create(incubator=self.incubator, eggs=60)
+        setting.delete()
+        self.capacity.refresh_from_db()
+        self.assertEqual(self.capacity.available, 100)
+        EggSetting.objects.create(incubator=self.incubator, eggs=60)
+        EggSetting.objects.all().delete()
+        self.capacity.refresh_from_db()
+        self.assertEqual(self.capacity.available, 100)
+
+    def test_edit_moves_reservation(self):
+        setting = EggSetting.objects.create(incubator=self.incubator, eggs=60)
+        setting.eggs = 90
+        setting.save()
+        self.capacity.refresh_from_db()
+        self.assertEqual(self.capacity.available, 10)
+        self.assertEqual(setting.reserved, 90)
+
+        setting.eggs = 120
+        with self.assertRaises(occupancy.IncubatorFull):
+            setting.save()
+        self.capacity.refresh_from_db()
+        self.assertEqual(self.capacity.available, 10)
+        self.assertEqual(EggSetting.objects.get(pk=setting.pk).eggs, 90)
+
+        other = Incubators.objects.create(hatchery=self.hatchery,
+                                          code='INC-2')
+        setting.refresh_from_db()
+        setting.incubator = other
+        setting.save()
+        self.capacity.refresh_from_db()
+        self.assertEqual(self.capacity.available, 100)
+        self.assertEqual((setting.reserved, setting.capacity_id), (0, None))
+
+    def test_moving_the_capacity_reserves_again(self):
+        setting = EggSetting.objects.create(incubator=self.incubator, eggs=60)
+        other = IncubatorCapacity.objects.create(
+            incubator=self.incubator, capacity=50, occupied=0)
+        setting.capacity = other
+        setting.save()
+        self.capacity.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.capacity.occupied, other.occupied), (60, 0))
+        self.assertEqual(setting.capacity_id, self.capacity.id)
+
+        setting.delete()
+        self.capacity.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.capacity.occupied, other.occupied), (0, 0))
+
+
+@override_settings(SMS_BACKEND='apps.hatchery.sms.LocMemBackend')
+class HatchNotificationTest(TransactionTestCase):
+
+    def setUp(self):
+        sms.outbox[:] = []
+        self.customer = Customer.objects.create(
+            first_name='Jane', last_name='Doe', phone='+254700000000',
+            notification_sms=True)
+
+    def hatch(self, customer, chicks=10):
+        return Hatching.objects.create(customer=customer, hatched=chicks,
+                                       deformed=0, notify_customer=True)
+
+    def test_one_message_per_customer(self):
+        for _ in range(3):
+            hatching = self.hatch(self.customer)
+        hatching.save()
+        silent = Customer.objects.create(first_name='John', last_name='Doe',
+                                         notification_sms=False)
+        self.hatch(silent)
+
+        self.assertEqual(notifications.dispatch(), 1)
+        self.assertEqual(len(sms.outbox), 1)
+        phone, text = sms.outbox[0]
+        self.assertEqual(phone, '+254700000000')
+        self.assertIn('3 of your egg batches', text)
+        self.assertIn('30 chicks', text)
+        self.assertFalse(HatchNotification.objects.filter(
+            status=HatchNotification.PENDING).exists())
+
+    def test_throttled_customers_wait(self):
+        self.hatch(self.customer)
+        notifications.dispatch()
+        self.hatch(self.customer)
+        self.assertEqual(notifications.dispatch(), 0)
+        self.assertEqual(len(sms.outbox), 1)
+
+        with override_settings(SMS_NOTIFICATION_INTERVAL=0):
+            self.assertEqual(notifications.dispatch(), 1)
+
+    def test_gateway_called_after_claiming(self):
+        notification = self.hatch(self.customer).hatchnotification_hatching
+
+        def send_messages(messages):
+            self.assertFalse(connection.in_atomic_block)
+            notification.refresh_from_db()
+            self.assertEqual(notification.status, HatchNotification.SENDING)
+            return len(messages)
+
+        backend = mock.Mock(send_messages=send_messages)
+        self.assertEqual(notifications.dispatch(backend), 1)
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, HatchNotification.SENT)
+
+    def test_failed_send_stays_pending(self):
+        notification = self.hatch(self.customer).hatchnotification_hatching
+        backend = mock.Mock()
+        backend.send_messages.side_effect = OSError('gateway down')
+        with self.assertRaises(OSError):
+            notifications.dispatch(backend)
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, HatchNotification.PENDING)
+
+        self.assertEqual(notifications.dispatch(), 1)
+
+    def test_stale_claims_are_taken_over(self):
+        notification = self.hatch(self.customer).hatchnotification_hatching
+        HatchNotification.objects.update(
+            status=HatchNotification.SENDING, sent_at=timezone.now())
+        self.assertEqual(notifications.dispatch(), 0)
+
+        HatchNotification.objects.update(
+            sent_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(notifications.dispatch(), 1)
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, HatchNotification.SENT)
+
+
+class CodeTest(TestCase):
+
+    def test_sequential_codes(self):
+        first = EggSetting.objects.create(eggs=10)
+        second = EggSetting.objects.create(eggs=10)
+        manual = EggSetting.objects.create(settingcode='SET-OLD', eggs=10)
+        third = EggSetting.objects.create(eggs=10)
+        self.assertEqual(first.settingcode, 'SET-00000001')
+        self.assertEqual(second.settingcode, 'SET-00000002')
+        self.assertEqual(manual.settingcode, 'SET-OLD')
+        self.assertEqual(third.settingcode, 'SET-00000003')
+
+    def test_collision_retries(self):
+        EggSetting.objects.create(eggs=10)
+        taken = codes.next_code(EggSetting, 'settingcode', 'SET')
+        original = codes.next_code
+        calls = []
+
+        def stale_next_code(*args):
+            # The first call returns a code another writer just took.
+            calls.append(args)
+            if len(calls) == 1:
+                EggSetting.objects.create(settingcode=taken, eggs=10)
+                return taken
+            return original(*args)
+
+        with mock.patch.object(codes, 'next_code', stale_next_code):
+            setting = EggSetting.objects.create(eggs=10)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(setting.settingcode, 'SET-00000003')
+
+    def test_fill_codes(self):
+        first = Incubation.objects.create(eggs=1)
+        second = Incubation.objects.create(eggs=1)
+        Incubation.objects.filter(id__in=[first.id, second.id]).update(
+            incubationcode=None)
+        self.assertEqual(codes.fill_codes(Incubation, 'incubationcode', 'INB'),
+                         2)
+        self.assertEqual(
+            list(Incubation.objects.order_by('id').values_list(
+                'incubationcode', flat=True)),
+            ['INB-00000001', 'INB-00000002'])
+
+    def test_detail_views(self):
+        hatchery = Hatchery.objects.create(name='Kisumu')
+        setting = EggSetting.objects.create(eggs=10)
+        customer = Customer.objects.create(first_name='Jane', last_name='Doe')
+        User.objects.create_user('clerk', password='pass')
+        self.client.login(username='clerk', password='pass')
+        for obj in (hatchery, setting, customer):
+            response = self.client.get(obj.get_absolute_url())
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context['object'], obj)
+        self.assertEqual(self.client.get('/egg_setting/SET-9').status_code,
+                         404)
+
+
+class OrderingTest(TestCase):
+
+    def test_ordering_is_opt_in(self):
+        first = Candling.objects.create(eggs=10, spoilt_eggs=0)
+        second = Candling.objects.create(eggs=10, spoilt_eggs=0)
+        Candling.objects.filter(pk=first.pk).update(
+            created=second.created + datetime.timedelta(days=1))
+        self.assertFalse(Candling.objects.all().ordered)
+        self.assertEqual(list(Candling.objects.chronological()),
+                         [second, first])
+        self.assertEqual(list(Candling.objects.latest_first()),
+                         [first, second])
+
+    def test_benchmark_command(self):
+        stdout = io.StringIO()
+        call_command('benchmark_changelist', rows=50, repeat=1, stdout=stdout)
+        self.assertIn('hatchery.Candling, 50 rows', stdout.getvalue())
+        self.assertEqual(Candling.objects.count(), 0)
+
+    def test_benchmark_baseline_is_a_plain_admin(self):
+        command = benchmark_changelist.Command()
+        baseline = command.baseline_admin(Candling)
+        self.assertIs(baseline.paginator, Paginator)
+        self.assertTrue(baseline.show_full_result_count)
+        self.assertEqual(baseline.get_ordering(None), ('created',))
+        self.assertIs(command.current_admin(Candling).paginator,
+                      EstimatedCountPaginator)
+
+
+class AdminTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_superuser('admin', 'admin@example.com',
+                                             'pass')
+        self.client.force_login(user)
+        self.customer = Customer.objects.create(first_name='Jane',
+                                                last_name='Doe')
+        self.other = Customer.objects.create(first_name='John',
+                                             last_name='Doe')
+
+    def changelist(self, model, **params):
+        return self.client.get(reverse('admin:hatchery_{}_changelist'.format(
+            model._meta.model_name)), params)
+
+    def test_changelist_queries_do_not_grow(self):
+        EggSetting.objects.create(customer=self.customer, eggs=10)
+        with CaptureQueriesContext(connection) as first:
+            self.assertEqual(self.changelist(EggSetting).status_code, 200)
+        for _ in range(5):
+            EggSetting.objects.create(customer=self.other, eggs=10)
+        with self.assertNumQueries(len(first)):
+            response = self.changelist(EggSetting)
+        self.assertEqual(response.context['cl'].result_count, 6)
+
+    def test_customer_code_filter(self):
+        mine = EggSetting.objects.create(customer=self.customer, eggs=10)
+        EggSetting.objects.create(customer=self.other, eggs=10)
+        response = self.changelist(
+            EggSetting, customercode=self.customer.customercode)
+        self.assertEqual(list(response.context['cl'].result_list), [mine])
+        self.assertContains(response, 'name="customercode"')
+
+    def test_autocomplete_uses_search_index(self):
+        response = self.client.get(reverse('admin:customer_customer_autocomplete'),
+                                   {'term': 'john'})
+        self.assertEqual([result['id'] for result in response.json()['results']],
+                         [str(self.other.id)])
+
+    def test_customer_search_by_code(self):
+        url = reverse('admin:customer_customer_changelist')
+        response = self.client.get(url, {'q': self.other.customercode})
+        self.assertEqual(list(response.context['cl'].result_list),
+                         [self.other])
+
+    def test_customer_search_says_when_truncated(self):
+        url = reverse('admin:customer_customer_changelist')
+        with mock.patch.object(CustomerAdmin, 'search_limit', 1):
+            response = self.client.get(url, {'q': 'doe'})
+        self.assertEqual(len(response.context['cl'].result_list), 1)
+        message, = response.context['messages']
+        self.assertTrue(str(message).startswith(
+            'Only the first 1 matches of "doe" are listed'))
+
+    def test_capacity_edit_keeps_reservations(self):
+        incubator = Incubators.objects.create(code='INC-1')
+        capacity = IncubatorCapacity.objects.create(
+            incubator=incubator, capacity=100, occupied=0)
+        EggSetting.objects.create(incubator=incubator, eggs=60)
+        response = self.client.post(
+            reverse('admin:hatchery_incubatorcapacity_change',
+                    args=[capacity.id]),
+            {'incubator': incubator.id, 'breed': '', 'capacity': 150,
+             'occupied': 0})
+        self.assertEqual(response.status_code, 302)
+        capacity.refresh_from_db()
+        self.assertEqual((capacity.occupied, capacity.available), (60, 90))
+
+    def test_paginator_counts_exactly_without_estimate(self):
+        for _ in range(3):
+            Candling.objects.create(eggs=10, spoilt_eggs=0)
+        paginator = EstimatedCountPaginator(Candling.objects.order_by('id'), 2)
+        paginator.threshold = 0
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
+
+
+class DatatableTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('clerk', password='pass',
+                                        is_staff=True)
+        self.client.force_login(user)
+        self.customer = Customer.objects.create(first_name='Jane',
+                                                last_name='Doe')
+        self.settings = [
+            EggSetting.objects.create(customer=self.customer, eggs=eggs)
+            for eggs in (30, 10, 20, 10, None)]
+        self.url = reverse('eggsetting_records')
+
+    def fetch(self, order=None, length=2, **params):
+        columns = EggSettingDatatableView.columns
+        data = {'draw': 1, 'start': 0, 'length': length}
+        for index, column in enumerate(columns):
+            data['columns[{}][data]'.format(index)] = column
+            data['columns[{}][name]'.format(index)] = ''
+        if order:
+            column, direction = order
+            data['order[0][column]'] = columns.index(column)
+            data['order[0][dir]'] = direction
+        data.update(params)
+        return self.client.get(self.url, data).json()
+
+    def walk(self, order):
+        ids, cursor = [], None
+        while True:
+            page = self.fetch(order, **({'after': cursor} if cursor else {}))
+            ids += [row['id'] for row in page['data']]
+            cursor = page['next']
+            if not cursor:
+                return ids
+
+    def test_keyset_pages_follow_the_ordering(self):
+        for direction in ('asc', 'desc'):
+            expected = [setting.id for setting in EggSetting.objects.order_by(
+                ('-' if direction == 'desc' else '') + 'eggs',
+                ('-' if direction == 'desc' else '') + 'id')]
+            self.assertEqual(self.walk(('eggs', direction)), expected)
+        self.assertEqual(self.walk(None),
+                         [setting.id for setting in reversed(self.settings)])
+
+    def test_values_and_filters(self):
+        page = self.fetch(**{'columns[4][search][value]': '10'})
+        self.assertEqual(page['recordsTotal'], 5)
+        self.assertEqual(page['recordsFiltered'], 2)
+        self.assertEqual(set(page['data'][0]),
+                         {'id'} | set(EggSettingDatatableView.columns))
+        self.assertEqual(page['data'][0]['customer__customercode'],
+                         self.customer.customercode)
+
+        page = self.fetch(**{'search[value]': 'SET-0000000'})
+        self.assertEqual(page['recordsFiltered'], 5)
+        page = self.fetch(**{'columns[6][search][value]':
+                             str(timezone.localdate())})
+        self.assertEqual(page['recordsFiltered'], 5)
+        self.assertIn('error', self.fetch(**{'columns[4][search][value]': 'x'}))
+
+    def test_page_and_permissions(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, "data: 'customer__customercode'")
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url, {'draw': 1}).status_code,
+                         302)
@@ -0,0 +1,38 @@
+from django.urls import path
+
+from apps.hatchery.views import (CandlingDatatableView, CandlingDetailView,
+                                 EggSettingDatatableView, EggSettingDetailView,
+                                 HatcheryDetailView, HatchingDatatableView,
+                                 HatchingDetailView, HoldingDatatableView,
+                                 HoldingDetailView, IncubationDetailView,
+                                 IncubatorDetailView,
+                                 hatchery_availability_view)
+
+# No trailing slashes, these match the models' get_absolute_url().
+urlpatterns = [
+    path('hatchery/<str:code>', HatcheryDetailView.as_view(),
+         name='hatchery_detail'),
+    path('hatchery/<str:code>/availability', hatchery_availability_view,
+         name='hatchery_availability'),
+    path('incubator/<str:code>', IncubatorDetailView.as_view(),
+         name='incubator_detail'),
+    path('egg_setting/<str:code>', EggSettingDetailView.as_view(),
+         name='eggsetting_detail'),
+    path('incubation/<str:code>', IncubationDetailView.as_view(),
+         name='incubation_detail'),
+    path('candling/<str:code>', CandlingDetailView.as_view(),
+         name='candling_detail'),
+    path('Hatching/<str:code>', HatchingDetailView.as_view(),
+         name='hatching_detail'),
+    path('holding/<str:code>', HoldingDetailView.as_view(),
+         name='holding_detail'),
+    # Browsing pages, and their DataTables server-side data.
+    path('records/egg_settings', EggSettingDatatableView.as_view(),
+         name='eggsetting_records'),
+    path('records/candlings', CandlingDatatableView.as_view(),
+         name='candling_records'),
+    path('records/hatchings', HatchingDatatableView.as_view(),
+         name='hatching_records'),
+    path('records/holdings', HoldingDatatableView.as_view(),
+         name='holding_records'),
+]
@@ -1,3 +1,127 @@
-from django.shortcuts import render
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.generic import DetailView
 
-# Create your views here.
+from apps.core.datatables import KeysetDatatableView
+from apps.hatchery import occupancy
+from apps.hatchery.models import (Candling, EggSetting, Hatchery, Hatching,
+                                  Holding, Incubation, Incubators)
+
+
+class CodeDetailView(LoginRequiredMixin, DetailView):
+    """
+    Detail page of a record addressed by its unique code, as returned by
+    the model's get_absolute_url(). The lookup is a seek on the unique
+    index of ``slug_field``.
+    """
+    template_name = 'hatchery/detail.html'
+    slug_url_kwarg = 'code'
+    exclude = ('id', 'photo', 'location')
+
+    def get_queryset(self):
+        related = [field.name for field in self.model._meta.fields
+                   if field.many_to_one]
+        return self.model._default_manager.select_related(*related)
+
+    def get_context_data(self, **kwargs):
+        context = super(CodeDetailView, self).get_context_data(**kwargs)
+        context['code'] = getattr(self.object, self.slug_field)
+        context['verbose_name'] = self.model._meta.verbose_name
+        context['fields'] = [
+            (field.verbose_name, getattr(self.object, field.name))
+            for field in self.model._meta.fields
+            if field.name not in self.exclude and field.name != self.slug_field]
+        return context
+
+
+class HatcheryDetailView(CodeDetailView):
+    model = Hatchery
+    slug_field = 'name'
+
+
+@login_required
+def hatchery_availability_view(request, code):
+    """
+    Capacity, occupied and available slots of each tracked incubator of a
+    hatchery, from the cached availability.
+    """
+    hatchery = get_object_or_404(Hatchery.objects.only('id'), name=code)
+    availability = occupancy.hatchery_availability(hatchery.id)
+    return JsonResponse({'incubators': [
+        dict(slots, incubator=incubator_id)
+        for incubator_id, slots in sorted(availability.items())]})
+
+
+class IncubatorDetailView(CodeDetailView):
+    model = Incubators
+    slug_field = 'code'
+
+
+class EggSettingDetailView(CodeDetailView):
+    model = EggSetting
+    slug_field = 'settingcode'
+
+
+class IncubationDetailView(CodeDetailView):
+    model = Incubation
+    slug_field = 'incubationcode'
+
+
+class CandlingDetailView(CodeDetailView):
+    model = Candling
+    slug_field = 'candlingcode'
+
+
+class HatchingDetailView(CodeDetailView):
+    model = Hatching
+    slug_field = 'hatchingcode'
+
+
+class HoldingDetailView(CodeDetailView):
+    model = Holding
+    slug_field = 'holdingcode'
+
+
+class EggSettingDatatableView(KeysetDatatableView):
+    model = EggSetting
+    columns = ['settingcode', 'customer__customercode', 'breeders__batch',
+               'incubator__code', 'eggs', 'reserved', 'created']
+    search_columns = ['settingcode', 'customer__customercode']
+    detail_url_name = 'eggsetting_detail'
+
+
+class CandlingDatatableView(KeysetDatatableView):
+    model = Candling
+    columns = ['candlingcode', 'incubation__incubationcode',
+               'customer__customercode', 'eggs', 'spoilt_eggs',
+               'fertile_eggs', 'candled', 'candled_date', 'created']
+    search_columns = ['candlingcode', 'customer__customercode']
+    detail_url_name = 'candling_detail'
+
+
+class HatchingDatatableView(KeysetDatatableView):
+    model = Hatching
+    columns = ['hatchingcode', 'candling__candlingcode',
+               'customer__customercode', 'hatched', 'deformed', 'spoilt',
+               'chicks_hatched', 'notify_customer', 'created']
+    search_columns = ['hatchingcode', 'customer__customercode']
+    detail_url_name = 'hatching_detail'
+
+
+class HoldingDatatableView(KeysetDatatableView):
+    model = Holding
+    columns = ['holdingcode', 'hatching__hatchingcode',
+               'customer__customercode', 'customer_delivery',
+               'mode_delivery', 'distance', 'cost', 'created']
+    search_columns = ['holdingcode', 'customer__customercode']
+    lookups = {'mode_delivery': 'iexact'}
+    detail_url_name = 'holding_detail'
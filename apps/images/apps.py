@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ImagesConfig(AppConfig):
+    name = 'apps.images'
+    label = 'images'
+
+    def ready(self):
+        from apps.images import signals
+        signals.connect()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.images import renditions, tasks
+
+
+class Command(BaseCommand):
+    help = 'Queue the resized copies of the stored photos that have none, ' \
+           'e.g. the photos uploaded before the renditions existed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Queue every photo, even those with renditions.')
+
+    def handle(self, *args, **options):
+        queued = set()
+        for model, fields in renditions.image_fields():
+            for field in fields:
+                names = model._default_manager.exclude(**{field: ''})\
+                    .exclude(**{field + '__isnull': True})\
+                    .values_list(field, flat=True)
+                for name in names.iterator():
+                    # Records share the files of identical photos.
+                    if name in queued:
+                        continue
+                    if options['force'] or not renditions.is_ready(name):
+                        tasks.generate_renditions.delay(name, options['force'])
+                        queued.add(name)
+        self.stdout.write('Queued %s photo(s).\n' % len(queued))
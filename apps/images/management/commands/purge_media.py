@@ -0,0 +1,65 @@
+import datetime
+import posixpath
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.images import renditions
+
+
+def walk(storage, directory):
+    """
+    Names of the files under a storage directory.
+    """
+    try:
+        directories, files = storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield posixpath.join(directory, name)
+    for subdirectory in directories:
+        yield from walk(storage, posixpath.join(directory, subdirectory))
+
+
+class Command(BaseCommand):
+    help = 'Delete the stored photos no record refers to any more, with ' \
+           'their renditions. Photos are named after their content and ' \
+           'shared between records, so they are never deleted along with ' \
+           'a record.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age', type=float, default=24,
+            help='Keep files written in the last hours (default: 24), '
+                 'whose record may not be committed yet.')
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only count the files that would be deleted.')
+
+    def handle(self, *args, **options):
+        # upload_to directory: names referred to
+        referenced = {}
+        for model, fields in renditions.image_fields():
+            for field in fields:
+                directory = model._meta.get_field(field).upload_to
+                names = model._default_manager.exclude(**{field: ''})\
+                    .exclude(**{field + '__isnull': True})\
+                    .values_list(field, flat=True)
+                referenced.setdefault(directory, set()).update(
+                    names.iterator())
+
+        storage = default_storage
+        purge = getattr(storage, 'purge', storage.delete)
+        cutoff = timezone.now() - datetime.timedelta(hours=options['min_age'])
+        purged = 0
+        for directory, names in referenced.items():
+            for name in walk(storage, directory):
+                if name in names or storage.get_modified_time(name) > cutoff:
+                    continue
+                if not options['dry_run']:
+                    purge(name)
+                    renditions.delete(name, storage)
+                purged += 1
+        self.stdout.write('%s %s unreferenced photo(s).\n' % (
+            'Found' if options['dry_run'] else 'Deleted', purged))
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Resized renditions of the uploaded photos.
+
+Uploads are stored under the hash of their content (see
+apps/core/storage.py). Once the row is committed, the generate_renditions
+task writes a JPEG and a WebP copy of the photo fitted in WIDTHS (1280, 640
+and 160 px squares) next to it, under renditions/:
+
+    customer_photos/3f/a2/3fa2...e1.jpg
+        -> renditions/customer_photos/3f/a2/3fa2...e1-160.webp
+
+Records with the same photo share the file and its renditions, which are
+only written once.
+
+Pages and API responses link the rendition of the width they show through
+url(); until the worker is done, the original is linked instead.
+"""
+import hashlib
+import io
+import posixpath
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+from imagekit.processors import ResizeToFit, Transpose
+from PIL import Image
+
+# model: image fields
+IMAGE_FIELDS = {
+    'breeders.Breed': ('front_photo', 'side_photo', 'back_photo'),
+    'breeders.Breeders': ('hens_photo', 'cocks_photo'),
+    'customer.Customer': ('photo',),
+    'customer.Eggs': ('photo',),
+    'hatchery.Hatchery': ('photo',),
+}
+
+WIDTHS = (1280, 640, 160)
+FORMATS = {
+    'jpg': ('JPEG', {'quality': 70, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 70, 'method': 4}),
+}
+DIRECTORY = 'renditions'
+
+
+def image_fields():
+    for label, fields in IMAGE_FIELDS.items():
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            continue
+        yield model, fields
+
+
+def rendition_name(name, width, extension='jpg'):
+    stem = posixpath.splitext(name)[0]
+    return posixpath.join(DIRECTORY, '{}-{}.{}'.format(stem, width,
+                                                       extension))
+
+
+def _ready_key(name):
+    return 'images:ready:' + hashlib.md5(name.encode()).hexdigest()
+
+
+def is_ready(name, storage=default_storage):
+    """
+    Whether the renditions of a file exist. The answer is cached; the
+    storage is only asked after a cache miss.
+    """
+    ready = cache.get(_ready_key(name))
+    if ready is None:
+        ready = storage.exists(rendition_name(name, WIDTHS[-1]))
+        cache.set(_ready_key(name), ready, None if ready else 60)
+    return ready
+
+
+def generate(name, storage=default_storage):
+    """
+    Write every rendition of the file ``name``. Returns their names.
+    """
+    with storage.open(name) as source:
+        image = Image.open(source)
+        image.load()
+    image = Transpose().process(image)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    names = []
+    for width in WIDTHS:
+        resized = ResizeToFit(width, width, upscale=False).process(image)
+        for extension, (fmt, options) in FORMATS.items():
+            output = io.BytesIO()
+            resized.save(output, fmt, **options)
+            target = rendition_name(name, width, extension)
+            # The storage would pick another name for an existing file.
+            storage.delete(target)
+            names.append(storage.save(target, ContentFile(output.getvalue())))
+    cache.set(_ready_key(name), True, None)
+    return names
+
+
+def delete(name, storage=default_storage):
+    for width in WIDTHS:
+        for extension in FORMATS:
+            storage.delete(rendition_name(name, width, extension))
+    cache.delete(_ready_key(name))
+
+
+def url(fieldfile, width, extension='jpg'):
+    """
+    URL of the rendition of an image field's file, or of the original
+    while it has none yet. None without a file.
+    """
+    if not fieldfile:
+        return None
+    if not is_ready(fieldfile.name, fieldfile.storage):
+        return fieldfile.url
+    return fieldfile.storage.url(rendition_name(fieldfile.name, width,
+                                                extension))
+
+
+def thumbnail(field, width=WIDTHS[-1], description=None):
+    """
+    A list_display column showing the thumbnail of an image field.
+    """
+    def display(obj):
+        src = url(getattr(obj, field), width)
+        if not src:
+            return ''
+        return format_html('<img src="{}" alt="" width="{}" loading="lazy">',
+                           src, 48)
+    display.short_description = description or field.replace('_', ' ')
+    return display
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_init, post_save
+
+from apps.images import renditions, tasks
+
+
+def _names(instance, fields):
+    # Read from __dict__: deferred fields are not loaded for this.
+    names = {}
+    for field in fields:
+        value = instance.__dict__.get(field)
+        names[field] = getattr(value, 'name', value) or None
+    return names
+
+
+def object_loaded(sender, instance, fields, **kwargs):
+    instance._image_names = _names(instance, fields)
+
+
+def object_saved(sender, instance, fields, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, '_image_names', {})
+    after = _names(instance, fields)
+    for field, name in after.items():
+        # The worker must see the committed row and file. The renditions
+        # of the previous file are kept: the file is named after its
+        # content and other records may show it (see purge_media).
+        if name and name != before.get(field):
+            transaction.on_commit(partial(tasks.generate_renditions.delay,
+                                          name))
+    instance._image_names = after
+
+
+def connect():
+    for model, fields in renditions.image_fields():
+        uid = 'images_{}'.format(model._meta.label_lower)
+        post_init.connect(partial(object_loaded, fields=fields), sender=model,
+                          weak=False, dispatch_uid=uid + '_loaded')
+        post_save.connect(partial(object_saved, fields=fields), sender=model,
+                          weak=False, dispatch_uid=uid + '_saved')
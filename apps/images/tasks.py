@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from celery import shared_task
+
+from apps.images import renditions
+
+
+@shared_task(ignore_result=True, acks_late=True, autoretry_for=(IOError,),
+             retry_backoff=True, max_retries=5)
+def generate_renditions(name, force=False):
+    """
+    Write the resized copies of an uploaded photo, unless a record sharing
+    the file already had them written.
+    """
+    if force or not renditions.is_ready(name):
+        renditions.generate(name)
@@ -0,0 +1,13 @@
+from django import template
+
+from apps.images import renditions
+
+register = template.Library()
+
+
+@register.simple_tag
+def rendition(fieldfile, width=160, extension='jpg'):
+    """
+    {% rendition customer.photo 160 %}: URL of a resized copy of a photo.
+    """
+    return renditions.url(fieldfile, int(width), extension) or ''
@@ -0,0 +1,124 @@
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+from PIL import Image
+
+from apps.customer.models import Customer
+from apps.images import renditions
+
+
+def upload(name='jane.png', size=(2000, 1000), color=(200, 100, 0, 255)):
+    output = io.BytesIO()
+    Image.new('RGBA', size, color).save(output, 'PNG')
+    return SimpleUploadedFile(name, output.getvalue(), 'image/png')
+
+
+class MediaRootMixin(object):
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+
+class StorageTest(MediaRootMixin, TestCase):
+
+    def test_content_addressed(self):
+        name = default_storage.save('customer_photos/Jane.PNG', upload())
+        directory, filename = os.path.split(name)
+        self.assertEqual(filename[-4:], '.png')
+        self.assertEqual(directory, 'customer_photos/{}/{}'.format(
+            filename[:2], filename[2:4]))
+
+        # The same content is stored once, whatever its name.
+        self.assertEqual(default_storage.save('customer_photos/copy.png',
+                                              upload('copy.png')), name)
+        self.assertEqual(default_storage.listdir(directory)[1], [filename])
+        self.assertNotEqual(default_storage.save(
+            'customer_photos/jane.png', upload(color=(0, 0, 0, 255))), name)
+
+        # Shared files are only deleted by purge().
+        default_storage.delete(name)
+        self.assertTrue(default_storage.exists(name))
+        default_storage.purge(name)
+        self.assertFalse(default_storage.exists(name))
+
+        # Renditions keep their names and are overwritten.
+        target = renditions.rendition_name(name, 160)
+        self.assertEqual(default_storage.save(target, ContentFile(b'a')),
+                         target)
+        default_storage.delete(target)
+        self.assertFalse(default_storage.exists(target))
+
+
+class RenditionTest(MediaRootMixin, TestCase):
+
+    def test_generate(self):
+        name = default_storage.save('customer_photos/jane.png', upload())
+        customer = Customer(photo=name)
+        self.assertEqual(renditions.url(customer.photo, 160), '/media/' + name)
+
+        self.assertEqual(len(renditions.generate(name)), 6)
+        with default_storage.open(
+                renditions.rendition_name(name, 160)) as stream:
+            self.assertEqual(Image.open(stream).size, (160, 80))
+        with default_storage.open(
+                renditions.rendition_name(name, 1280, 'webp')) as stream:
+            self.assertEqual(Image.open(stream).format, 'WEBP')
+        self.assertEqual(renditions.url(customer.photo, 640, 'webp'),
+                         '/media/' + renditions.rendition_name(name, 640,
+                                                               'webp'))
+        self.assertIn(renditions.rendition_name(name, 160),
+                      renditions.thumbnail('photo')(customer))
+
+        # Small photos are not enlarged.
+        name = default_storage.save('customer_photos/small.png',
+                                    upload(size=(100, 50)))
+        renditions.generate(name)
+        with default_storage.open(
+                renditions.rendition_name(name, 640)) as stream:
+            self.assertEqual(Image.open(stream).size, (100, 50))
+
+
+class RenditionSignalTest(MediaRootMixin, TransactionTestCase):
+
+    def test_renditions_follow_the_photo(self):
+        customer = Customer.objects.create(first_name='Jane',
+                                           photo=upload('jane.png'))
+        first = customer.photo.name
+        self.assertTrue(default_storage.exists(
+            renditions.rendition_name(first, 160)))
+        other = Customer.objects.create(first_name='John',
+                                        photo=upload('john.png'))
+        self.assertEqual(other.photo.name, first)
+
+        customer = Customer.objects.get(pk=customer.pk)
+        customer.photo = upload('janet.png', color=(0, 0, 0, 255))
+        customer.save()
+        self.assertTrue(renditions.is_ready(customer.photo.name))
+        # Still shown for the other customer.
+        self.assertTrue(default_storage.exists(
+            renditions.rendition_name(first, 160)))
+
+        call_command('purge_media', min_age=0, stdout=io.StringIO())
+        self.assertTrue(default_storage.exists(first))
+        other.delete()
+        out = io.StringIO()
+        call_command('purge_media', min_age=1, stdout=out)
+        self.assertIn('Deleted 0', out.getvalue())
+        call_command('purge_media', min_age=0, stdout=out)
+        self.assertFalse(default_storage.exists(first))
+        self.assertFalse(default_storage.exists(
+            renditions.rendition_name(first, 160)))
+        self.assertTrue(default_storage.exists(customer.photo.name))
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Cache backends counting their hits and misses.
+
+Every read is counted in metrics.CACHE_LOOKUPS by key group: the part of
+the key before the first colon (``analytics`` for ``analytics:breed:1``),
+``page`` and ``page:headers`` for the entries of cache_page, and
+``fragment:<name>`` for the {% cache %} template fragments. The counts are
+those of the process; stats() adds what the backend itself knows, shared
+by all the processes for Redis.
+"""
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django_redis.cache import RedisCache
+from redis.exceptions import RedisError
+
+from apps.monitoring import metrics
+
+_MISSING = object()
+
+
+def key_group(key):
+    if key.startswith('template.cache.'):
+        return 'fragment:' + key.split('.')[2]
+    if key.startswith('views.decorators.cache.cache_header.'):
+        return 'page:headers'
+    if key.startswith('views.decorators.cache.cache_page.'):
+        return 'page'
+    return key.split(':', 1)[0]
+
+
+def _record(key, hit):
+    metrics.CACHE_LOOKUPS.inc(key_group(key), 'hit' if hit else 'miss')
+
+
+def hit_rates():
+    """
+    (group, hits, misses, hit rate in percent) of the key groups read by
+    this process, busiest first.
+    """
+    with metrics.CACHE_LOOKUPS.lock:
+        items = list(metrics.CACHE_LOOKUPS.values.items())
+    groups = {}
+    for (group, result), count in items:
+        groups.setdefault(group, {'hit': 0, 'miss': 0})[result] += count
+    rows = [(group, counts['hit'], counts['miss'],
+             percent(counts['hit'], counts['hit'] + counts['miss']))
+            for group, counts in groups.items()]
+    return sorted(rows, key=lambda row: (-row[1] - row[2], row[0]))
+
+
+def percent(part, whole):
+    return round(100.0 * part / whole, 1) if whole else None
+
+
+class InstrumentedCacheMixin(object):
+    """
+    Mixed in before a cache backend to count its reads.
+    """
+
+    def get(self, key, default=None, version=None, **kwargs):
+        value = super(InstrumentedCacheMixin, self).get(
+            key, _MISSING, version=version, **kwargs)
+        _record(key, value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def stats(self):
+        """
+        (name, value) pairs describing the backend's state.
+        """
+        return []
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    """
+    Memory of the process: for tests and development.
+    """
+
+    def stats(self):
+        return [('Entries', len(self._cache)),
+                ('Max entries', self._max_entries)]
+
+
+class InstrumentedFileBasedCache(InstrumentedCacheMixin, FileBasedCache):
+    """
+    Files in a directory, shared by the processes of a single server.
+    """
+
+    def stats(self):
+        return [('Directory', self._dir),
+                ('Entries', len(self._list_cache_files())),
+                ('Max entries', self._max_entries)]
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    """
+    Redis, shared by every server.
+    """
+
+    def get_many(self, keys, version=None, **kwargs):
+        # Unlike the other backends', does not go through get().
+        keys = list(keys)
+        values = super(InstrumentedRedisCache, self).get_many(
+            keys, version=version, **kwargs)
+        for key in keys:
+            _record(key, key in values)
+        return values
+
+    def stats(self):
+        try:
+            info = self.client.get_client().info()
+        except RedisError as e:
+            return [('Error', str(e))]
+        return [
+            ('Server hit rate (%)', percent(
+                info['keyspace_hits'],
+                info['keyspace_hits'] + info['keyspace_misses'])),
+            ('Server hits', info['keyspace_hits']),
+            ('Server misses', info['keyspace_misses']),
+            ('Memory used', info['used_memory_human']),
+            ('Evicted keys', info['evicted_keys']),
+            ('Expired keys', info['expired_keys']),
+            ('Connected clients', info['connected_clients']),
+            ('Uptime (days)', info['uptime_in_days']),
+        ]
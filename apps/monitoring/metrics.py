@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+In-process counters and histograms, exported in the Prometheus text format
+(https://prometheus.io/docs/instrumenting/exposition_formats/).
+
+The values live in the memory of each server process and are labelled
+with its pid: Prometheus sums the series of the processes it scrapes.
+"""
+import bisect
+import os
+import threading
+
+# Query counts and seconds.
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n')\
+        .replace('"', r'\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + [('pid', os.getpid())] + list(extra)
+    return '{' + ','.join('{}="{}"'.format(name, _escape(value))
+                          for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(object):
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+
+    def render(self):
+        lines = ['# HELP {} {}'.format(self.name, self.documentation),
+                 '# TYPE {} {}'.format(self.name, self.kind)]
+        with self.lock:
+            items = sorted(self.values.items())
+        for labels, value in items:
+            lines.extend(self.samples(labels, value))
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def get(self, *labels):
+        return self.values.get(labels, 0)
+
+    def samples(self, labels, value):
+        yield '{}_total{} {}'.format(
+            self.name, _labels(self.label_names, labels), _number(value))
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=TIME_BUCKETS):
+        super(Histogram, self).__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.values.get(
+                labels, ([0] * (len(self.buckets) + 1), 0))
+            counts[index] += 1
+            self.values[labels] = (counts, total + value)
+
+    def get(self, *labels):
+        """
+        (count, sum) of the observations.
+        """
+        counts, total = self.values.get(labels, ((), 0))
+        return sum(counts), total
+
+    def samples(self, labels, value):
+        counts, total = value
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            yield '{}_bucket{} {}'.format(
+                self.name,
+                _labels(self.label_names, labels, [('le', _number(bound))]),
+                cumulative)
+        label_text = _labels(self.label_names, labels)
+        yield '{}_sum{} {}'.format(self.name, label_text, _number(total))
+        yield '{}_count{} {}'.format(self.name, label_text, cumulative)
+
+
+REQUESTS = Counter('django_view_requests', 'Requests by view.',
+                   ('view', 'method', 'status'))
+QUERIES = Histogram('django_view_queries', 'SQL queries per request.',
+                    ('view',), COUNT_BUCKETS)
+DB_SECONDS = Histogram('django_view_db_seconds',
+                       'Time spent in SQL queries per request.', ('view',))
+RENDER_SECONDS = Histogram('django_view_render_seconds',
+                           'Time spent rendering template responses.',
+                           ('view',))
+DURATION_SECONDS = Histogram('django_view_duration_seconds',
+                             'Time spent handling a request.', ('view',))
+REPEATED_QUERIES = Counter(
+    'django_view_repeated_queries',
+    'Requests running one statement with different parameters at least '
+    'QUERY_REPEAT_THRESHOLD times, the sign of an N+1 pattern.',
+    ('view',))
+BUDGET_EXCEEDED = Counter('django_view_query_budget_exceeded',
+                          'Requests running more queries than their budget.',
+                          ('view',))
+CACHE_LOOKUPS = Counter('django_cache_lookups',
+                        'Cache reads by key group, hit or miss.',
+                        ('group', 'result'))
+
+METRICS = (REQUESTS, QUERIES, DB_SECONDS, RENDER_SECONDS, DURATION_SECONDS,
+           REPEATED_QUERIES, BUDGET_EXCEEDED, CACHE_LOOKUPS)
+
+
+def render():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def clear():
+    for metric in METRICS:
+        metric.clear()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+SQL and latency instrumentation of the views.
+
+QueryMetricsMiddleware records, for every request, the number of SQL
+queries and the time spent in them, in rendering the template response
+and in the whole request, labelled with the URL name of the view (see
+metrics.py, exported at /metrics/).
+
+Two checks run on the queries:
+
+- a statement run QUERY_REPEAT_THRESHOLD times or more with different
+  parameters - once per row of a list, typically a foreign key read
+  without select_related - is logged and counted as an N+1 pattern;
+- a view running more queries than its budget is logged and counted, and
+  raises QueryBudgetExceeded when QUERY_BUDGET_STRICT is set, as it is
+  under ``manage.py test``, failing the test that requested it.
+
+Budgets are declared on the view with @query_budget(n), a ``query_budget``
+attribute of a class-based view, or in the QUERY_BUDGETS setting, by URL
+name or fnmatch pattern of URL names (e.g. ``admin:*_changelist``).
+"""
+import collections
+import contextlib
+import fnmatch
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from apps.monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """
+    A statement with its parameters and literals replaced by ``?`` and its
+    IN lists by ``IN (...)``: the statements of an N+1 pattern normalize
+    to the same string.
+    """
+    sql = _LITERAL.sub('?', sql).replace('%s', '?')
+    return _SPACE.sub(' ', _IN_LIST.sub('IN (...)', sql)).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(queries):
+    """
+    Decorator declaring the most SQL queries a view may run per request.
+    """
+    def decorator(view):
+        view.query_budget = queries
+        return view
+    return decorator
+
+
+class QueryRecorder(object):
+    """
+    Database execute wrapper counting and timing the queries.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.statements.append(sql)
+
+    def most_repeated(self):
+        """
+        The (normalized statement, count) run the most times.
+        """
+        if not self.statements:
+            return None, 0
+        counts = collections.Counter(map(normalize_sql, self.statements))
+        return counts.most_common(1)[0]
+
+
+def get_budget(match):
+    func = match.func
+    for owner in (func, getattr(func, 'view_class', None),
+                  getattr(func, 'cls', None)):
+        budget = getattr(owner, 'query_budget', None)
+        if budget is not None:
+            return budget
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    if match.view_name in budgets:
+        return budgets[match.view_name]
+    for pattern, budget in budgets.items():
+        if fnmatch.fnmatchcase(match.view_name, pattern):
+            return budget
+    return None
+
+
+class QueryMetricsMiddleware(object):
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with contextlib.ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        self.record(request, response, recorder,
+                    time.perf_counter() - started)
+        return response
+
+    def process_template_response(self, request, response):
+        # Called right before the response is rendered.
+        started = time.perf_counter()
+
+        def rendered(response):
+            request.render_seconds = time.perf_counter() - started
+        response.add_post_render_callback(rendered)
+        return response
+
+    def record(self, request, response, recorder, duration):
+        match = request.resolver_match
+        view = match.view_name if match else '<unresolved>'
+        queries = len(recorder.statements)
+        metrics.REQUESTS.inc(view, request.method, response.status_code)
+        metrics.QUERIES.observe(queries, view)
+        metrics.DB_SECONDS.observe(recorder.seconds, view)
+        metrics.DURATION_SECONDS.observe(duration, view)
+        if hasattr(request, 'render_seconds'):
+            metrics.RENDER_SECONDS.observe(request.render_seconds, view)
+
+        threshold = getattr(settings, 'QUERY_REPEAT_THRESHOLD', 10)
+        statement, repeats = (None, 0)
+        if queries >= threshold:
+            statement, repeats = recorder.most_repeated()
+        if repeats >= threshold:
+            metrics.REPEATED_QUERIES.inc(view)
+            logger.warning('%s %s ran the same query %s times: %s',
+                           request.method, view, repeats, statement)
+
+        budget = get_budget(match) if match else None
+        if budget is None or queries <= budget:
+            return
+        metrics.BUDGET_EXCEEDED.inc(view)
+        message = '{} {} ran {} queries, over its budget of {}.'.format(
+            request.method, view, queries, budget)
+        if repeats >= threshold:
+            message += ' {} of them: {}'.format(repeats, statement)
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
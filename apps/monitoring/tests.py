@@ -0,0 +1,136 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import ResolverMatch, reverse
+
+from apps.breeders.models import Breed
+from apps.chicks.admin import ChicksAdmin
+from apps.chicks.models import Chicks
+from apps.monitoring import metrics
+from apps.monitoring.cache import hit_rates, key_group
+from apps.monitoring.middleware import (QueryBudgetExceeded,
+                                        QueryMetricsMiddleware, normalize_sql,
+                                        query_budget)
+
+
+def lookups(request):
+    for breed in Breed.objects.all():
+        list(Chicks.objects.filter(breed=breed))
+    return HttpResponse('')
+
+
+class MiddlewareTest(TestCase):
+
+    def setUp(self):
+        metrics.clear()
+        for number in range(12):
+            Breed.objects.create(breed='Breed {}'.format(number))
+
+    def run_view(self, view, name='lookups'):
+        request = RequestFactory().get('/')
+        request.resolver_match = ResolverMatch(view, (), {}, url_name=name)
+        with self.assertLogs('apps.monitoring.middleware', 'WARNING') as logs:
+            QueryMetricsMiddleware(view)(request)
+        return logs.output
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql('SELECT "a"."id" FROM "a" WHERE "a"."id" IN '
+                          '(%s, %s,%s) AND "T3"."x" = 5\n  LIMIT 21'),
+            'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (...) AND '
+            '"T3"."x" = ? LIMIT ?')
+
+    def test_records_queries_and_repeats(self):
+        logs = self.run_view(lookups)
+        self.assertEqual(metrics.QUERIES.get('lookups')[0], 1)
+        self.assertEqual(metrics.QUERIES.get('lookups')[1], 13)
+        self.assertEqual(metrics.REPEATED_QUERIES.get('lookups'), 1)
+        self.assertEqual(metrics.REQUESTS.get('lookups', 'GET', 200), 1)
+        self.assertIn('same query 12 times', logs[0])
+
+        text = metrics.render()
+        self.assertIn('# TYPE django_view_queries histogram', text)
+        self.assertIn('django_view_queries_bucket{view="lookups",pid=', text)
+        self.assertIn('le="20"} 1', text)
+
+    @override_settings(QUERY_BUDGETS={'look*': 5}, QUERY_BUDGET_STRICT=True)
+    def test_budget(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded,
+                                      'ran 13 queries, over its budget of 5'):
+            self.run_view(lookups)
+        self.assertEqual(metrics.BUDGET_EXCEEDED.get('lookups'), 1)
+        # The view's own budget wins over the setting.
+        self.run_view(query_budget(20)(lookups))
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_admin_changelist_budget(self):
+        user = User.objects.create_superuser('admin', 'admin@example.com',
+                                             'pass')
+        self.client.force_login(user)
+        for breed in Breed.objects.all():
+            Chicks.objects.create(breed=breed, number=10)
+        url = reverse('admin:chicks_chicks_changelist')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        # Reading the breed of every row would be over budget.
+        with mock.patch.object(ChicksAdmin, 'list_select_related', ()):
+            with self.assertLogs('apps.monitoring.middleware', 'WARNING'), \
+                    self.assertRaises(QueryBudgetExceeded):
+                self.client.get(url)
+
+
+class MetricsViewTest(TestCase):
+
+    def test_access(self):
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        with override_settings(METRICS_TOKEN='secret'):
+            response = self.client.get(url, HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response['Content-Type'].startswith(
+                'text/plain; version=0.0.4'))
+            self.assertContains(response, 'django_view_requests_total')
+            self.assertEqual(self.client.get(
+                url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+
+
+class CacheStatsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        metrics.clear()
+
+    def test_key_group(self):
+        self.assertEqual(key_group('analytics:breed:1'), 'analytics')
+        self.assertEqual(key_group('template.cache.dashboard_daily.4c1b'),
+                         'fragment:dashboard_daily')
+        self.assertEqual(
+            key_group('views.decorators.cache.cache_page.page:1.GET.a.b'),
+            'page')
+        self.assertEqual(
+            key_group('views.decorators.cache.cache_header.page:1.a'),
+            'page:headers')
+
+    def test_counts_hits_and_misses(self):
+        cache.set('analytics:breed:1', 0)
+        self.assertEqual(cache.get('analytics:breed:1', 5), 0)
+        self.assertEqual(cache.get('analytics:breed:2', 5), 5)
+        self.assertEqual(cache.get_many(['analytics:breed:1', 'search:x']),
+                         {'analytics:breed:1': 0})
+        self.assertEqual(metrics.CACHE_LOOKUPS.get('analytics', 'hit'), 2)
+        self.assertEqual(metrics.CACHE_LOOKUPS.get('analytics', 'miss'), 1)
+        self.assertEqual(hit_rates(), [('analytics', 2, 1, 66.7),
+                                       ('search', 0, 1, 0.0)])
+
+    def test_stats_page(self):
+        url = reverse('cache_stats')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(User.objects.create_superuser(
+            'admin', 'admin@example.com', 'pass'))
+        cache.get('analytics:breed:1')
+        response = self.client.get(url)
+        self.assertContains(response, '<td>analytics</td>')
+        self.assertContains(response, 'InstrumentedLocMemCache')
+        self.assertContains(response, 'Max entries')
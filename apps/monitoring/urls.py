@@ -0,0 +1,8 @@
+from django.urls import path
+
+from apps.monitoring.views import cache_stats_view, metrics_view
+
+urlpatterns = [
+    path('', metrics_view, name='metrics'),
+    path('cache/', cache_stats_view, name='cache_stats'),
+]
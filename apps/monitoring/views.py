@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+import hmac
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.views.decorators.cache import never_cache
+
+from apps.monitoring import metrics
+from apps.monitoring.cache import hit_rates
+
+
+def _authorized(request):
+    if request.user.is_active and request.user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    return bool(token) and hmac.compare_digest(
+        request.META.get('HTTP_AUTHORIZATION', ''), 'Bearer ' + token)
+
+
+@never_cache
+def metrics_view(request):
+    """
+    The metrics of this process, for Prometheus. Scrapers authenticate
+    with the METRICS_TOKEN bearer token; staff may read them without.
+    """
+    if not _authorized(request):
+        return HttpResponse('Forbidden.', status=403,
+                            content_type='text/plain')
+    return HttpResponse(metrics.render(),
+                        content_type='text/plain; version=0.0.4; '
+                                     'charset=utf-8')
+
+
+@staff_member_required
+@never_cache
+def cache_stats_view(request):
+    """
+    Hit rates of the cache by key group, as seen by this process, and the
+    state of each configured cache.
+    """
+    backends = []
+    for alias in settings.CACHES:
+        backend = caches[alias]
+        stats = getattr(backend, 'stats', None)
+        backends.append({
+            'alias': alias,
+            'backend': settings.CACHES[alias]['BACKEND'],
+            'stats': stats() if stats else [],
+        })
+    context = dict(admin.site.each_context(request), title='Cache statistics',
+                   hit_rates=hit_rates(), backends=backends)
+    return render(request, 'monitoring/cache_stats.html', context)
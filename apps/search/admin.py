@@ -1,3 +1,46 @@
-from django.contrib import admin
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.contrib import messages
+from django.db.models import Q
 
-# Register your models here.
+from apps.search import index
+
+
+class SearchIndexMixin(object):
+    """
+    ModelAdmin mixin answering the changelist and autocomplete searches
+    from the search index instead of LIKE scans over search_fields.
+
+    Only the first ``search_limit`` matches of the index are listed, and
+    the changelist says so when there are more. The exact ``=`` fields of
+    search_fields are still matched on the table, through their indexes,
+    so that a code finds its row even when the index does not know it.
+    """
+    search_kind = None
+    search_limit = 200
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        ids = [entry.object_id for entry in index.search(
+            search_term, kinds=[self.search_kind],
+            limit=self.search_limit + 1)]
+        if len(ids) > self.search_limit:
+            ids = ids[:self.search_limit]
+            if getattr(request.resolver_match, 'url_name', '')\
+                    .endswith('_changelist'):
+                messages.warning(
+                    request, 'Only the first {} matches of "{}" are listed, '
+                             'refine the search to see the others.'.format(
+                                 self.search_limit, search_term))
+        exact = Q(id__in=ids)
+        for field in self.get_search_fields(request):
+            if field.startswith('='):
+                exact |= Q(**{field[1:] + '__iexact': search_term})
+        return queryset.filter(exact), False
@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 
 class SearchConfig(AppConfig):
-    name = 'search'
+    name = 'apps.search'
+    label = 'search'
+
+    def ready(self):
+        from apps.search import signals
+        signals.connect()
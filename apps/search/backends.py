@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Search backends over the SearchEntry table.
+
+PostgresBackend relies on the full-text and trigram GIN indexes created by
+the search migrations. InMemoryBackend, used on SQLite/SpatiaLite, keeps an
+inverted index of token -> entry ids in the process and answers prefix
+queries with a binary search over the sorted tokens.
+
+Processes share a version number in the cache. Every write bumps it and
+records the ids of the entries it changed under the new version, so the
+other processes re-read only those entries on their next search. They
+load the whole table again only when they are too far behind or a change
+record is missing (evicted, or too large to be kept). Writes are published
+once their transaction commits, so that no process reads the entries
+before they are visible, or after they are rolled back.
+"""
+import bisect
+import re
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+from apps.search.models import SearchEntry
+
+WORD_RE = re.compile(r'[^\W_]+', re.UNICODE)
+VERSION_KEY = 'search:index:version'
+CHANGE_KEY = 'search:index:change:{}'
+CHANGE_TIMEOUT = 60 * 60
+# Past this many versions or entries, loading the table is as cheap.
+MAX_CHANGES = 1000
+
+
+def normalize(text):
+    return ' '.join((text or '').lower().split())
+
+
+def index_tokens(text):
+    """
+    Tokens stored for a text: its whitespace separated chunks (so that
+    "egg-00" finds "EGG-0012") and the words inside them.
+    """
+    chunks = normalize(text).split()
+    tokens = set(chunks)
+    for chunk in chunks:
+        tokens.update(WORD_RE.findall(chunk))
+    return tokens
+
+
+def query_tokens(query):
+    return normalize(query).split()
+
+
+class PostgresBackend(object):
+
+    def search(self, query, kinds=None, limit=20):
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+
+        qs = SearchEntry.objects.none()
+        words = [word for token in tokens for word in WORD_RE.findall(token)]
+        if words:
+            # Prefix match on every word, served by search_entry_text_fts.
+            tsquery = ' & '.join('{}:*'.format(word) for word in words)
+            qs = qs | SearchEntry.objects.filter(RawSQL(
+                "to_tsvector('simple', text) @@ to_tsquery('simple', %s)",
+                (tsquery,), output_field=BooleanField()))
+        substring = Q()
+        for token in tokens:
+            if len(token) >= 3:
+                # Served by the trigram index search_entry_text_trgm.
+                substring &= Q(text__contains=token)
+        if substring:
+            qs = qs | SearchEntry.objects.filter(substring)
+
+        if kinds:
+            qs = qs.filter(kind__in=kinds)
+        return list(qs.order_by('kind', 'title')[:limit])
+
+    def update(self, entry):
+        pass
+
+    def update_many(self, entries):
+        pass
+
+    def remove(self, entry_id):
+        pass
+
+    def reset(self):
+        pass
+
+
+class InMemoryBackend(object):
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._version = None
+        self._postings = {}
+        self._tokens = []
+        self._entries = {}
+        self._entry_tokens = {}
+
+    def _current_version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            # A lost key must not match a version loaded earlier, so start
+            # from the clock rather than from 1.
+            cache.add(VERSION_KEY, int(time.time() * 1000), None)
+            version = cache.get(VERSION_KEY)
+        return version
+
+    def _publish(self, entry_ids=None):
+        """
+        Move to a new version and record the entries changed at it. Without
+        entry ids, or with too many, the other processes reload everything.
+        Returns the new version.
+        """
+        try:
+            version = cache.incr(VERSION_KEY)
+        except ValueError:
+            return self._current_version()
+        if entry_ids is not None and len(entry_ids) <= MAX_CHANGES:
+            cache.set(CHANGE_KEY.format(version), list(entry_ids),
+                      CHANGE_TIMEOUT)
+        return version
+
+    def _published(self, version):
+        # Our own write was the only one since the version we are at.
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+
+    def _ensure_loaded(self):
+        version = self._current_version()
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            if not self._apply_changes(version):
+                self._reload()
+            self._version = version
+
+    def _apply_changes(self, version):
+        """
+        Re-read the entries changed since the loaded version. False when
+        the changes are not all known.
+        """
+        if self._version is None or \
+                not 0 < version - self._version <= MAX_CHANGES:
+            return False
+        keys = [CHANGE_KEY.format(number)
+                for number in range(self._version + 1, version + 1)]
+        changes = cache.get_many(keys)
+        if len(changes) != len(keys):
+            return False
+        entry_ids = sorted(set().union(*changes.values()))
+        if len(entry_ids) > MAX_CHANGES:
+            return False
+        rows = []
+        for start in range(0, len(entry_ids), 500):
+            rows.extend(SearchEntry.objects.filter(
+                id__in=entry_ids[start:start + 500]).order_by().values_list(
+                'id', 'kind', 'object_id', 'title', 'url', 'text'))
+        for entry_id in entry_ids:
+            self._discard(entry_id)
+        for row in rows:
+            self._add(row, sort=True)
+        return True
+
+    def _reload(self):
+        self._postings, self._entries, self._entry_tokens = {}, {}, {}
+        rows = SearchEntry.objects.order_by().values_list(
+            'id', 'kind', 'object_id', 'title', 'url', 'text')
+        for row in rows.iterator(chunk_size=5000):
+            self._add(row)
+        self._tokens = sorted(self._postings)
+
+    def _add(self, row, sort=False):
+        """
+        Index an entry. With ``sort``, new tokens are also inserted in the
+        sorted token list, which a full load sorts once at the end.
+        """
+        entry_id, text = row[0], row[5]
+        self._entries[entry_id] = SearchEntry(
+            id=entry_id, kind=row[1], object_id=row[2], title=row[3],
+            url=row[4])
+        tokens = self._entry_tokens[entry_id] = index_tokens(text)
+        for token in tokens:
+            if sort and token not in self._postings:
+                bisect.insort(self._tokens, token)
+            self._postings.setdefault(token, set()).add(entry_id)
+
+    def _discard(self, entry_id):
+        self._entries.pop(entry_id, None)
+        for token in self._entry_tokens.pop(entry_id, ()):
+            ids = self._postings[token]
+            ids.discard(entry_id)
+            if not ids:
+                del self._postings[token]
+                index = bisect.bisect_left(self._tokens, token)
+                if index < len(self._tokens) and self._tokens[index] == token:
+                    del self._tokens[index]
+
+    def _prefix_ids(self, prefix):
+        ids = set()
+        tokens = self._tokens
+        index = bisect.bisect_left(tokens, prefix)
+        while index < len(tokens) and tokens[index].startswith(prefix):
+            ids |= self._postings[tokens[index]]
+            index += 1
+        return ids
+
+    def search(self, query, kinds=None, limit=20):
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+        self._ensure_loaded()
+        with self._lock:
+            ids = None
+            for token in sorted(tokens, key=len, reverse=True):
+                matches = self._prefix_ids(token)
+                ids = matches if ids is None else ids & matches
+                if not ids:
+                    return []
+            entries = [self._entries[entry_id] for entry_id in ids]
+        if kinds:
+            entries = [entry for entry in entries if entry.kind in kinds]
+        entries.sort(key=lambda entry: (entry.kind, entry.title or ''))
+        return entries[:limit]
+
+    def _publish_on_commit(self, entry_ids):
+        def publish():
+            with self._lock:
+                self._published(self._publish(entry_ids))
+        transaction.on_commit(publish)
+
+    def update(self, entry):
+        """
+        Apply a saved entry to this process and tell the others to re-read
+        it once the transaction commits.
+        """
+        self.update_many([entry])
+
+    def update_many(self, entries):
+        with self._lock:
+            for entry in entries:
+                self._discard(entry.id)
+                self._add((entry.id, entry.kind, entry.object_id,
+                           entry.title, entry.url, entry.text), sort=True)
+        self._publish_on_commit([entry.id for entry in entries])
+
+    def remove(self, entry_id):
+        with self._lock:
+            self._discard(entry_id)
+        self._publish_on_commit([entry_id])
+
+    def reset(self):
+        with self._lock:
+            self._publish()
+            self._version = None
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if connection.vendor == 'postgresql':
+            _backend = PostgresBackend()
+        else:
+            _backend = InMemoryBackend()
+    return _backend
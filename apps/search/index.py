@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Search index maintenance and lookups.
+
+REGISTRY lists the indexed models. Saving or deleting one of them updates
+its SearchEntry through the signal handlers connected in
+SearchConfig.ready(). Bulk writes send no signals: update_objects()
+indexes the rows they wrote, rebuild() reindexes everything.
+"""
+from django.apps import apps
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from apps.search.backends import get_backend, normalize
+from apps.search.models import SearchEntry
+
+# kind: (model, indexed fields, title field)
+REGISTRY = {
+    'customer': ('customer.Customer',
+                 ('customercode', 'full_name', 'phone', 'email'),
+                 'full_name'),
+    'eggs': ('customer.Eggs', ('batchnumber',), 'batchnumber'),
+    'chicks': ('chicks.Chicks', ('batchnumber',), 'batchnumber'),
+    'breed': ('breeders.Breed', ('breed', 'code'), 'breed'),
+    'blog': ('blogs.Blog', ('title', 'content'), 'title'),
+}
+
+
+def registered_models():
+    """
+    Yield (kind, model class, fields, title field) for the installed models.
+    """
+    for kind, (label, fields, title) in sorted(REGISTRY.items()):
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            continue
+        yield kind, model, fields, title
+
+
+def kind_for(model):
+    for kind, registered, _, _ in registered_models():
+        if registered is model:
+            return kind
+    return None
+
+
+def build_entry(kind, instance):
+    _, fields, title = REGISTRY[kind]
+    values = [strip_tags(str(getattr(instance, field) or ''))
+              for field in fields]
+    try:
+        url = instance.get_absolute_url()
+    except Exception:
+        url = None
+    return SearchEntry(
+        kind=kind,
+        object_id=instance.pk,
+        title=(str(getattr(instance, title) or '') or str(instance))[:255],
+        url=url[:255] if url else None,
+        text=normalize(' '.join(values)),
+    )
+
+
+def update_object(instance):
+    kind = kind_for(type(instance))
+    if kind is None:
+        return None
+    entry = build_entry(kind, instance)
+    entry, _ = SearchEntry.objects.update_or_create(
+        kind=kind, object_id=instance.pk,
+        defaults={'title': entry.title, 'url': entry.url, 'text': entry.text})
+    get_backend().update(entry)
+    return entry
+
+
+def update_objects(queryset, batch_size=2000):
+    """
+    Index the rows of a queryset, batch_size at a time, e.g. after a
+    bulk_create. Returns the number of rows indexed.
+    """
+    kind = kind_for(queryset.model)
+    if kind is None:
+        return 0
+    total = 0
+    batch = []
+    for instance in queryset.order_by().iterator(chunk_size=batch_size):
+        batch.append(instance)
+        if len(batch) >= batch_size:
+            total += _update_batch(kind, batch)
+            batch = []
+    return total + _update_batch(kind, batch)
+
+
+def _update_batch(kind, instances):
+    if not instances:
+        return 0
+    entries = {instance.pk: build_entry(kind, instance)
+               for instance in instances}
+    with transaction.atomic():
+        existing = list(SearchEntry.objects.filter(
+            kind=kind, object_id__in=list(entries)))
+        for entry in existing:
+            built = entries.pop(entry.object_id)
+            entry.title, entry.url, entry.text = \
+                built.title, built.url, built.text
+        SearchEntry.objects.bulk_update(existing, ['title', 'url', 'text'])
+        SearchEntry.objects.bulk_create(entries.values())
+        saved = list(SearchEntry.objects.filter(
+            kind=kind, object_id__in=[instance.pk for instance in instances]))
+    get_backend().update_many(saved)
+    return len(instances)
+
+
+def remove_object(instance):
+    kind = kind_for(type(instance))
+    if kind is None:
+        return
+    entry_ids = list(SearchEntry.objects.filter(
+        kind=kind, object_id=instance.pk).values_list('id', flat=True))
+    SearchEntry.objects.filter(id__in=entry_ids).delete()
+    for entry_id in entry_ids:
+        get_backend().remove(entry_id)
+
+
+def rebuild(batch_size=2000):
+    """
+    Recreate every SearchEntry. Returns the number of entries written.
+    """
+    total = 0
+    with transaction.atomic():
+        SearchEntry.objects.all().delete()
+        for kind, model, _, _ in registered_models():
+            batch = []
+            for instance in model.objects.order_by().iterator(
+                    chunk_size=batch_size):
+                batch.append(build_entry(kind, instance))
+                if len(batch) >= batch_size:
+                    SearchEntry.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            SearchEntry.objects.bulk_create(batch)
+            total += len(batch)
+    get_backend().reset()
+    return total
+
+
+def search(query, kinds=None, limit=20):
+    """
+    Entries matching every word of ``query`` as a prefix, optionally
+    restricted to the given kinds.
+    """
+    return get_backend().search(query, kinds=kinds, limit=limit)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.search import index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index from the customer, batch, breed and ' \
+           'blog tables. Run it after bulk imports, which skip the signals ' \
+           'keeping the index up to date.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Number of entries written per query.')
+
+    def handle(self, *args, **options):
+        total = index.rebuild(batch_size=options['batch_size'])
+        self.stdout.write('Indexed %s object(s).\n' % total)
@@ -0,0 +1,57 @@
+# Generated by Django 3.1.2 on 2020-10-30 14:05
+
+from django.db import migrations, models
+
+
+POSTGRES_INDEXES = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "CREATE INDEX IF NOT EXISTS search_entry_text_fts ON search_entry "
+    "USING gin (to_tsvector('simple', text))",
+    'CREATE INDEX IF NOT EXISTS search_entry_text_trgm ON search_entry '
+    'USING gin (text gin_trgm_ops)',
+]
+
+
+def create_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in POSTGRES_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS search_entry_text_fts')
+    schema_editor.execute('DROP INDEX IF EXISTS search_entry_text_trgm')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.IntegerField()),
+                ('title', models.CharField(blank=True, max_length=255, null=True)),
+                ('url', models.CharField(blank=True, max_length=255, null=True)),
+                ('text', models.TextField(blank=True, default='')),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'SearchEntry',
+                'verbose_name_plural': 'SearchEntries',
+                'db_table': 'search_entry',
+                'managed': True,
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_postgres_indexes, drop_postgres_indexes),
+    ]
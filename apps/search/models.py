@@ -1,3 +1,42 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from __future__ import unicode_literals
+
 from django.db import models
 
-# Create your models here.
+
+class SearchEntry(models.Model):
+    """
+    SearchEntry Model
+
+    One row per indexed object, holding its searchable text lower-cased.
+    On PostgreSQL the text carries a full-text and a trigram GIN index
+    (see migration 0001); elsewhere apps.search.backends.InMemoryBackend
+    builds an inverted index from this table.
+    """
+    id = models.AutoField(primary_key=True)
+    kind=models.CharField(max_length=20)
+    object_id=models.IntegerField()
+    title=models.CharField(null=True,blank=True,max_length=255)
+    url=models.CharField(null=True,blank=True,max_length=255)
+    text=models.TextField(blank=True,default='')
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "search_entry"
+        verbose_name = 'SearchEntry'
+        verbose_name_plural = "SearchEntries"
+        managed = True
+        unique_together = (('kind', 'object_id'),)
+
+    def __str__(self):
+        return self.title or ''
+
+    def as_dict(self):
+        return {'kind': self.kind, 'id': self.object_id, 'title': self.title,
+                'url': self.url}
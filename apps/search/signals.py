@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.db.models.signals import post_delete, post_save
+
+from apps.search import index
+
+
+def object_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index.update_object(instance)
+
+
+def object_deleted(sender, instance, **kwargs):
+    index.remove_object(instance)
+
+
+def connect():
+    for kind, model, _, _ in index.registered_models():
+        post_save.connect(object_saved, sender=model,
+                          dispatch_uid='search_saved_' + kind)
+        post_delete.connect(object_deleted, sender=model,
+                            dispatch_uid='search_deleted_' + kind)
@@ -1,3 +1,114 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from apps.breeders.models import Breed
+from apps.customer.models import Customer, Eggs
+from apps.search import index
+from apps.search.backends import CHANGE_KEY, InMemoryBackend, index_tokens
+from apps.search.models import SearchEntry
+
+
+class SearchIndexTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.breed = Breed.objects.create(code='KUR', breed='Kuroiler')
+        self.customer = Customer.objects.create(
+            first_name='Jane', last_name='Wanjiru', phone='0722123456',
+            email='jane@example.com')
+        self.eggs = Eggs.objects.create(batchnumber='EGG-0012',
+                                        customer=self.customer,
+                                        breed=self.breed, brought=30)
+
+    def kinds(self, query, **kwargs):
+        return [(entry.kind, entry.object_id)
+                for entry in index.search(query, **kwargs)]
+
+    def test_index_tokens(self):
+        self.assertEqual(index_tokens('EGG-0012 Jane'),
+                         {'egg-0012', 'egg', '0012', 'jane'})
+
+    def test_entries_follow_saves_and_deletes(self):
+        self.assertEqual(SearchEntry.objects.count(), 3)
+        self.assertEqual(self.kinds('wanj'),
+                         [('customer', self.customer.id)])
+        self.assertEqual(self.kinds('egg-00'), [('eggs', self.eggs.id)])
+        self.assertEqual(self.kinds('0722'), [('customer', self.customer.id)])
+        self.assertEqual(self.kinds('kur', kinds=['breed']),
+                         [('breed', self.breed.id)])
+
+        self.customer.last_name = 'Otieno'
+        self.customer.save()
+        self.assertEqual(self.kinds('wanj'), [])
+        self.assertEqual(self.kinds('jane oti'),
+                         [('customer', self.customer.id)])
+
+        self.eggs.delete()
+        self.assertEqual(self.kinds('egg'), [])
+        self.assertEqual(SearchEntry.objects.count(), 2)
+
+    def test_rebuild(self):
+        SearchEntry.objects.all().delete()
+        self.assertEqual(index.rebuild(batch_size=2), 3)
+        self.assertEqual(self.kinds('kuroiler'), [('breed', self.breed.id)])
+
+    def test_other_processes_reload(self):
+        other = InMemoryBackend()
+        self.assertEqual(len(other.search('jane')), 1)
+        Customer.objects.create(first_name='Janet', last_name='Achieng')
+        self.assertEqual(len(other.search('jane')), 2)
+
+    def test_other_processes_apply_changes(self):
+        other = InMemoryBackend()
+        other.search('jane')
+        janet = Customer.objects.create(first_name='Janet',
+                                        last_name='Achieng')
+        self.eggs.delete()
+        self.customer.last_name = 'Otieno'
+        self.customer.save()
+        with mock.patch.object(other, '_reload') as reload:
+            self.assertEqual([entry.object_id for entry in
+                              other.search('jane', kinds=['customer'])],
+                             [self.customer.id, janet.id])
+            self.assertEqual(other.search('wanjiru'), [])
+            self.assertEqual(other.search('egg'), [])
+            self.assertFalse(reload.called)
+
+        # A lost change record makes the process load everything again.
+        Customer.objects.create(first_name='Jane', last_name='Kamau')
+        cache.delete(CHANGE_KEY.format(cache.get('search:index:version')))
+        self.assertEqual(len(other.search('kamau')), 1)
+
+    def test_changes_are_published_on_commit(self):
+        other = InMemoryBackend()
+        other.search('jane')
+        with transaction.atomic():
+            Customer.objects.create(first_name='Janet', last_name='Achieng')
+            self.assertEqual(len(index.search('janet')), 1)
+            self.assertEqual(other.search('janet'), [])
+        self.assertEqual(len(other.search('janet')), 1)
+
+        try:
+            with transaction.atomic():
+                Customer.objects.create(first_name='Jane', last_name='Kamau')
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(other.search('kamau'), [])
+
+    def test_view(self):
+        url = reverse('search')
+        self.assertEqual(self.client.get(url, {'q': 'jane'}).status_code, 302)
+        User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.login(username='admin', password='pass')
+        response = self.client.get(url, {'q': 'jane', 'limit': -5})
+        self.assertEqual(len(response.json()['results']), 1)
+        response = self.client.get(url, {'q': 'EGG', 'kind': 'eggs'})
+        self.assertEqual(response.json()['results'], [{
+            'kind': 'eggs', 'id': self.eggs.id, 'title': 'EGG-0012',
+            'url': '/customer_eggs/EGG-0012'}])
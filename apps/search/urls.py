@@ -0,0 +1,7 @@
+from django.urls import path
+
+from apps.search.views import search_view
+
+urlpatterns = [
+    path('', search_view, name='search'),
+]
@@ -1,3 +1,28 @@
-from django.shortcuts import render
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
 
-# Create your views here.
+from apps.search import index
+
+MAX_RESULTS = 50
+
+
+@staff_member_required
+def search_view(request):
+    """
+    Type-ahead lookup: ``?q=<words>&kind=customer&kind=eggs&limit=10``.
+    """
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 10)), MAX_RESULTS))
+    except ValueError:
+        limit = 10
+    results = index.search(request.GET.get('q', ''),
+                           kinds=request.GET.getlist('kind') or None,
+                           limit=limit)
+    return JsonResponse({'results': [entry.as_dict() for entry in results]})
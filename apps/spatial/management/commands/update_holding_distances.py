@@ -0,0 +1,22 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.spatial.queries import update_holding_distances
+
+
+class Command(BaseCommand):
+    help = 'Compute the hatchery-to-delivery distance of the Holding ' \
+           'records created on a given day (today by default).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date', type=datetime.date.fromisoformat,
+            default=None, help='Day to process, as YYYY-MM-DD.')
+
+    def handle(self, *args, **options):
+        day = options['date'] or timezone.localdate()
+        total = update_holding_distances(day)
+        self.stdout.write('Updated %s holding distance(s) for %s.\n'
+                          % (total, day))
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2020:  TelelBirds
+#
+#
+#########################################################################
+"""
+Spatial queries over the geography PointFields of Hatchery, Customer and
+Holding.
+
+Radius filters use ST_DWithin on PostGIS so they are answered from the
+spatial index; nearest-neighbour searches use the PostGIS ``<->`` KNN
+operator. SpatiaLite falls back to the equivalent distance lookups.
+"""
+from django.contrib.gis.db.models import FloatField, Func, GeometryField
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.db import connection
+from django.db.models import Q, Value
+
+from apps.customer.models import Customer
+from apps.delivery.models import delivery_cost
+from apps.hatchery.models import Hatchery, Holding
+
+# Path from a Holding back to the hatchery whose incubator produced it.
+HOLDING_HATCHERY_PATH = \
+    'hatching__candling__incubation__eggsetting__incubator__hatchery'
+# The same path walked from the hatchery side.
+HATCHERY_HATCHING_PATH = \
+    'incubators_hatchery__eggsetting_incubator__incubation_eggsetting__' \
+    'candling_incubation__hatching_candling'
+
+
+class KNNDistance(Func):
+    """
+    PostGIS ``<->`` operator, which lets ORDER BY walk the GiST index.
+
+    Func does not adapt geometries itself: the point is passed as a Value
+    with a geometry output field, so that it is sent as one.
+    """
+    arg_joiner = ' <-> '
+    template = '%(expressions)s'
+    output_field = FloatField()
+
+    def __init__(self, expression, point, geography=True, **extra):
+        point = Value(point, output_field=GeometryField(
+            srid=point.srid or 4326, geography=geography))
+        super(KNNDistance, self).__init__(expression, point, **extra)
+
+
+def as_point(obj):
+    """
+    Return a Point for a Point, a (longitude, latitude) pair or any model
+    instance with a ``location`` or ``longitude``/``latitude`` fields.
+    """
+    if obj is None or isinstance(obj, Point):
+        return obj
+    if isinstance(obj, (tuple, list)):
+        return Point(float(obj[0]), float(obj[1]), srid=4326)
+    location = getattr(obj, 'location', None)
+    if location is not None:
+        return location
+    if getattr(obj, 'longitude', None) is not None and \
+            getattr(obj, 'latitude', None) is not None:
+        return Point(obj.longitude, obj.latitude, srid=4326)
+    return None
+
+
+def within_km(field, point, km):
+    """
+    Return a Q selecting rows whose ``field`` lies within ``km`` of point.
+    """
+    if connection.ops.postgis:
+        return Q(**{field + '__dwithin': (point, D(km=km))})
+    return Q(**{field + '__distance_lte': (point, D(km=km))})
+
+
+def _nearest(queryset, point, k):
+    queryset = queryset.filter(location__isnull=False)\
+        .annotate(distance=Distance('location', point))
+    if connection.ops.postgis:
+        geography = queryset.model._meta.get_field('location').geography
+        queryset = queryset.annotate(knn=KNNDistance(
+            'location', point, geography=geography)).order_by('knn')
+    else:
+        queryset = queryset.order_by('distance')
+    return queryset[:k]
+
+
+def nearest_hatcheries(target, k=5):
+    """
+    Return the ``k`` hatcheries closest to target (a customer, a point or a
+    (longitude, latitude) pair), annotated with ``distance``.
+    """
+    point = as_point(target)
+    if point is None:
+        return Hatchery.objects.none()
+    return _nearest(Hatchery.objects.all(), point, k)
+
+
+def customers_within(hatchery, km):
+    """
+    Return the customers within ``km`` of a hatchery, nearest first.
+    """
+    point = as_point(hatchery)
+    if point is None:
+        return Customer.objects.none()
+    return Customer.objects.filter(within_km('location', point, km))\
+        .annotate(distance=Distance('location', point))\
+        .order_by('distance')
+
+
+def holding_distance(holding):
+    """
+    Return the distance in km from the hatchery that produced a holding to
+    its delivery location, or None when either point is unknown.
+    """
+    if holding.location is None or holding.hatching_id is None:
+        return None
+    distance = Hatchery.objects.filter(
+        location__isnull=False,
+        **{HATCHERY_HATCHING_PATH: holding.hatching_id})\
+        .annotate(distance=Distance('location', holding.location))\
+        .values_list('distance', flat=True).first()
+    return distance.km if distance is not None else None
+
+
+def update_holding_distances(day, batch_size=1000):
+    """
+    Compute the hatchery-to-delivery distance of every Holding created on
+    ``day`` in a single query and save them with bulk_update. Returns the
+    number of rows updated.
+    """
+    rows = Holding.objects.filter(
+        created__date=day, location__isnull=False,
+        **{HOLDING_HATCHERY_PATH + '__location__isnull': False})\
+        .annotate(computed=Distance(
+            'location', HOLDING_HATCHERY_PATH + '__location'))\
+        .only('id', 'distance', 'cost')\
+        .order_by()
+
+    holdings = []
+    for holding in rows.iterator(chunk_size=batch_size):
+        holding.distance = holding.computed.km
+        holding.cost = delivery_cost(holding.distance)
+        holdings.append(holding)
+    Holding.objects.bulk_update(holdings, ['distance', 'cost'],
+                                batch_size=batch_size)
+    return len(holdings)
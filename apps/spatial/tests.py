@@ -1,3 +1,95 @@
-from django.test import TestCase
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.geos import Point
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from apps.customer.models import Customer
+from apps.hatchery.models import (Hatchery, Incubators, EggSetting,
+                                  Incubation, Candling, Hatching, Holding)
+from apps.spatial.queries import (KNNDistance, as_point, customers_within,
+                                  nearest_hatcheries, within_km)
+
+NAIROBI = Point(36.8219, -1.2921, srid=4326)
+
+
+class AsPointTest(TestCase):
+
+    def test_as_point(self):
+        self.assertIs(as_point(NAIROBI), NAIROBI)
+        self.assertIsNone(as_point(None))
+        self.assertEqual(as_point((36.8, -1.3)).coords, (36.8, -1.3))
+        self.assertEqual(as_point((36.8, -1.3)).srid, 4326)
+        self.assertEqual(as_point(Customer(location=NAIROBI)), NAIROBI)
+        self.assertEqual(as_point(Customer(longitude=36.8, latitude=-1.3))
+                         .coords, (36.8, -1.3))
+        self.assertIsNone(as_point(Customer()))
+
+    def test_knn_distance_sends_a_geometry(self):
+        point = KNNDistance('location', NAIROBI).get_source_expressions()[1]
+        self.assertIsInstance(point.output_field, GeometryField)
+        self.assertEqual(point.output_field.srid, 4326)
+        self.assertTrue(point.output_field.geography)
+
+
+class SpatialQueryTest(TestCase):
+
+    def setUp(self):
+        # About 1, 20 and 150 km away from Nairobi.
+        self.near = Hatchery.objects.create(
+            name='Near', location=Point(36.83, -1.2921, srid=4326))
+        self.middle = Hatchery.objects.create(
+            name='Middle', location=Point(36.82, -1.47, srid=4326))
+        self.far = Hatchery.objects.create(
+            name='Far', location=Point(38.17, -1.29, srid=4326))
+        Hatchery.objects.create(name='Nowhere')
+
+    def test_nearest_hatcheries(self):
+        hatcheries = list(nearest_hatcheries(NAIROBI, k=2))
+        self.assertEqual(hatcheries, [self.near, self.middle])
+        self.assertLess(hatcheries[0].distance.km, 2)
+        self.assertEqual(list(nearest_hatcheries((36.82, -1.29))),
+                         [self.near, self.middle, self.far])
+        self.assertFalse(nearest_hatcheries(Customer()).exists())
+
+    def test_within_km(self):
+        self.assertEqual(
+            list(Hatchery.objects.filter(within_km('location', NAIROBI, 50))
+                 .order_by('name')),
+            [self.middle, self.near])
+
+    def test_customers_within(self):
+        near = Customer.objects.create(
+            first_name='Near', location=Point(36.84, -1.30, srid=4326))
+        Customer.objects.create(
+            first_name='Far', location=Point(38.0, -1.0, srid=4326))
+        Customer.objects.create(first_name='Nowhere')
+        customers = list(customers_within(self.near, 10))
+        self.assertEqual(customers, [near])
+        self.assertLess(customers[0].distance.km, 10)
+
+    @override_settings(DELIVERY_COST_PER_KM=2.0, DELIVERY_COST_PER_STOP=0.0)
+    def test_moving_a_holding_measures_it_again(self):
+        incubator = Incubators.objects.create(hatchery=self.near,
+                                              code='INC-1')
+        setting = EggSetting.objects.create(incubator=incubator, eggs=10)
+        incubation = Incubation.objects.create(eggsetting=setting, eggs=10)
+        candling = Candling.objects.create(incubation=incubation, eggs=10,
+                                           spoilt_eggs=0)
+        hatching = Hatching.objects.create(candling=candling, hatched=10,
+                                           deformed=0)
+        holding = Holding.objects.create(hatching=hatching,
+                                         location=self.near.location)
+        self.assertLess(holding.distance, 1)
+
+        holding = Holding.objects.get(id=holding.id)
+        holding.location = self.far.location
+        holding.save()
+        holding.refresh_from_db()
+        self.assertGreater(holding.distance, 140)
+        self.assertEqual(holding.cost, 2.0 * holding.distance)
+
+        # Saves that do not move it keep the distance.
+        holding.distance = 150.0
+        holding.save()
+        holding.location = Point(38.17, -1.29, srid=4326)
+        holding.save()
+        self.assertEqual(holding.distance, 150.0)
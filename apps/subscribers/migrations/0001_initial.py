@@ -1,38 +1,27 @@
-# -*- coding: utf-8 -*-
-import datetime
-from south.db import db
-from south.v2 import SchemaMigration
-from django.db import models
+# Generated by Django 3.1.2 on 2026-10-18 14:45
 
+from django.db import migrations, models
 
-class Migration(SchemaMigration):
 
-    def forwards(self, orm):
-        # Adding model 'Subscriber'
-        db.create_table(u'subscribers_subscriber', (
-            (u'id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
-            ('created', self.gf('django.db.models.fields.DateTimeField')(auto_now_add=True, blank=True)),
-            ('modified', self.gf('django.db.models.fields.DateTimeField')(auto_now=True, blank=True)),
-            ('email', self.gf('django.db.models.fields.EmailField')(max_length=75)),
-            ('source_ip', self.gf('django.db.models.fields.IPAddressField')(max_length=15)),
-        ))
-        db.send_create_signal(u'subscribers', ['Subscriber'])
+class Migration(migrations.Migration):
 
+    initial = True
 
-    def backwards(self, orm):
-        # Deleting model 'Subscriber'
-        db.delete_table(u'subscribers_subscriber')
+    dependencies = [
+    ]
 
-
-    models = {
-        u'subscribers.subscriber': {
-            'Meta': {'ordering': "['-created']", 'object_name': 'Subscriber'},
-            'created': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
-            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75'}),
-            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
-            'modified': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
-            'source_ip': ('django.db.models.fields.IPAddressField', [], {'max_length': '15'})
-        }
-    }
-
-    complete_apps = ['subscribers']
\ No newline at end of file
+    operations = [
+        migrations.CreateModel(
+            name='Subscriber',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('source_ip', models.GenericIPAddressField(default=None, null=True)),
+            ],
+            options={
+                'ordering': ['-created'],
+            },
+        ),
+    ]
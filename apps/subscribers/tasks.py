@@ -0,0 +1,141 @@
+"""
+Outbound messaging tasks: emails, MailChimp signups, subscription
+confirmations and newsletters.
+
+Views enqueue these instead of talking to SMTP or MailChimp themselves, so
+a slow or unreachable server only delays the worker, never the request.
+Transient failures are retried with an exponential backoff.
+"""
+import logging
+import smtplib
+import socket
+
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+
+import mailchimp
+import requests
+
+from apps.subscribers.models import Subscriber
+
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_EMAIL_ERRORS = (smtplib.SMTPException, socket.error)
+# Connection errors, and server errors answered with a page that is not
+# JSON. MailChimp's own errors are not retried.
+RETRYABLE_MAILCHIMP_ERRORS = (requests.RequestException, ValueError)
+MAX_RETRIES = 5
+NEWSLETTER_BATCH_SIZE = 100
+
+
+def backoff(retries):
+    """
+    Seconds to wait before the next attempt: 1, 2, 4, 8... minutes.
+    """
+    return 60 * 2 ** retries
+
+
+@shared_task(bind=True, max_retries=MAX_RETRIES, ignore_result=True)
+def send_email(self, subject, body, from_email, to, reply_to=None):
+    """
+    Send a single email.
+    """
+    email = EmailMessage(subject=subject, body=body, from_email=from_email,
+                         to=to, reply_to=reply_to)
+    try:
+        email.send()
+    except RETRYABLE_EMAIL_ERRORS as e:
+        logger.warning('Sending "%s" to %s failed: %s', subject, to, e)
+        raise self.retry(exc=e, countdown=backoff(self.request.retries))
+
+
+@shared_task(bind=True, max_retries=MAX_RETRIES, ignore_result=True)
+def send_mass_email(self, messages):
+    """
+    Send a batch of emails over a single SMTP connection.
+
+    ``messages`` is a list of (subject, body, from_email, recipient_list).
+    """
+    connection = get_connection()
+    emails = [EmailMessage(subject=subject, body=body, from_email=from_email,
+                           to=recipients, connection=connection)
+              for subject, body, from_email, recipients in messages]
+    try:
+        return connection.send_messages(emails)
+    except RETRYABLE_EMAIL_ERRORS as e:
+        logger.warning('Sending a batch of %s emails failed: %s',
+                       len(emails), e)
+        raise self.retry(exc=e, countdown=backoff(self.request.retries))
+
+
+@shared_task(bind=True, max_retries=MAX_RETRIES, ignore_result=True)
+def mailchimp_subscribe(self, email, list_id=None):
+    """
+    Sign up an email address to a MailChimp list (double opt-in).
+    """
+    list_id = list_id or settings.MAILCHIMP_LIST_ID
+    mc = mailchimp.Mailchimp(settings.MAILCHIMP_API_KEY)
+
+    try:
+        mc.lists.subscribe(
+            id=list_id,
+            email={'email': email},
+            update_existing=True,
+            double_optin=True,
+        )
+    except RETRYABLE_MAILCHIMP_ERRORS as e:
+        # The API could not be reached or answered with a server error.
+        logger.warning('MailChimp is unavailable: %s', e)
+        raise self.retry(exc=e, countdown=backoff(self.request.retries))
+    except mailchimp.Error as e:
+        # Invalid address, unknown list, etc. Retrying will not help.
+        logger.error('A MailChimp error occurred: %s', e)
+        return
+
+    logger.info('%s successfully subscribed to %s', email, list_id)
+
+
+@shared_task(ignore_result=True)
+def send_confirmation(subscriber_id):
+    """
+    Render and send the subscription confirmation email.
+    """
+    email = Subscriber.objects.filter(pk=subscriber_id)\
+        .values_list('email', flat=True).first()
+    if email is None:
+        return
+
+    subject = render_to_string('subscribers/email/subject.txt').strip()
+    message = render_to_string('subscribers/email/body.txt')
+    send_email.delay(subject, message, settings.CONTACTS['info_email'],
+                     [email])
+
+
+@shared_task(ignore_result=True)
+def send_newsletter(subject, body, batch_size=NEWSLETTER_BATCH_SIZE):
+    """
+    Send a newsletter to every subscriber.
+
+    One send_mass_email task is queued per batch_size subscribers, each of
+    them sending its batch over a single SMTP connection, so a failing batch
+    is retried on its own.
+    """
+    from_email = settings.CONTACTS['info_email']
+    emails = Subscriber.objects.order_by('id')\
+        .values_list('email', flat=True).iterator()
+
+    batch = []
+    batches = 0
+    for email in emails:
+        batch.append((subject, body, from_email, [email]))
+        if len(batch) >= batch_size:
+            send_mass_email.delay(batch)
+            batch = []
+            batches += 1
+    if batch:
+        send_mass_email.delay(batch)
+        batches += 1
+    return batches
@@ -0,0 +1,91 @@
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+
+import mailchimp
+import requests
+from celery.exceptions import Retry
+
+from apps.subscribers import tasks
+from apps.subscribers.models import Subscriber
+
+# The tasks run eagerly, as with the default memory:// broker. A retry
+# raises Retry instead of queueing the next attempt.
+
+
+class EmailTaskTest(TestCase):
+
+    def test_send_email(self):
+        tasks.send_email.delay('Hello', 'Body', 'info@telelbirds.com',
+                               ['jane@example.com'])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['jane@example.com'])
+
+    def test_transient_errors_are_retried_with_backoff(self):
+        args = ('Hello', 'Body', 'info@telelbirds.com', ['jane@example.com'])
+        error = smtplib.SMTPServerDisconnected('gone')
+        with mock.patch('django.core.mail.EmailMessage.send',
+                        side_effect=error):
+            for retries in range(tasks.MAX_RETRIES):
+                with self.assertRaises(Retry) as raised:
+                    tasks.send_email.apply(args, retries=retries)
+                self.assertEqual(raised.exception.when, 60 * 2 ** retries)
+                self.assertIs(raised.exception.exc, error)
+            # Gives up with the error once the retries are used.
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                tasks.send_email.apply(args, retries=tasks.MAX_RETRIES)
+
+    def test_send_mass_email_uses_one_connection(self):
+        messages = [('Hello', 'Body', 'info@telelbirds.com', [email])
+                    for email in ('a@example.com', 'b@example.com')]
+        self.assertEqual(tasks.send_mass_email.delay(messages).get(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+
+
+@override_settings(MAILCHIMP_API_KEY='key-us1', MAILCHIMP_LIST_ID='list')
+class MailChimpTaskTest(TestCase):
+
+    def subscribe(self, error=None, retries=0):
+        with mock.patch('mailchimp.Mailchimp') as client:
+            subscribe = client.return_value.lists.subscribe
+            subscribe.side_effect = error
+            tasks.mailchimp_subscribe.apply(('jane@example.com',),
+                                            retries=retries)
+        self.assertEqual(subscribe.call_args.kwargs['id'], 'list')
+
+    def test_subscribe(self):
+        self.subscribe()
+
+    def test_unreachable_api_is_retried(self):
+        for error in (requests.ConnectionError('down'), ValueError('HTML')):
+            with self.assertRaises(Retry) as raised:
+                self.subscribe(error, retries=2)
+            self.assertEqual(raised.exception.when, 240)
+
+    def test_api_errors_are_not_retried(self):
+        self.subscribe(mailchimp.ListDoesNotExistError('list'))
+
+
+class SubscriberTaskTest(TestCase):
+
+    def test_send_confirmation(self):
+        subscriber = Subscriber.objects.create(email='jane@example.com')
+        subscriber.send_confirmation()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject,
+                         'Thank you for subscribing to TelelBirds')
+        self.assertEqual(mail.outbox[0].to, ['jane@example.com'])
+
+    def test_send_newsletter_in_batches(self):
+        for i in range(5):
+            Subscriber.objects.create(email='{}@example.com'.format(i))
+        with mock.patch.object(tasks.send_mass_email, 'delay',
+                               wraps=tasks.send_mass_email.delay) as delay:
+            batches = tasks.send_newsletter.delay('News', 'Body',
+                                                  batch_size=2).get()
+        self.assertEqual(batches, 3)
+        self.assertEqual([len(call.args[0]) for call in delay.call_args_list],
+                         [2, 2, 1])
+        self.assertEqual(len(mail.outbox), 5)
@@ -1,8 +1,7 @@
-from django.template import RequestContext
 from django.conf import settings
-from django.shortcuts import render_to_response
+from django.shortcuts import render
 
-from core.utils import get_client_ip
+from apps.core.utils import get_client_ip
 
 from .forms import SubscriberForm
 from .models import Subscriber
@@ -14,8 +13,7 @@ def subscribe_view(request):
 
          # Check if the email address already exists.
         if Subscriber.objects.filter(email=request.POST['email']).exists():
-            return render_to_response('home.html', {'exists': True},
-                                      context_instance=RequestContext(request))
+            return render(request, 'home.html', {'exists': True})
 
         if form.is_valid():
             subscriber = form.save(commit=False)
@@ -28,8 +26,6 @@ def subscribe_view(request):
             if settings.SEND_SUBSCRIBERS_EMAIL_CONFIRMATION:
                 subscriber.send_confirmation()
 
-            return render_to_response('home.html', {'success': True},
-                                      context_instance=RequestContext(request))
+            return render(request, 'home.html', {'success': True})
 
-    return render_to_response('home.html', {'error': True},
-                              context_instance=RequestContext(request))
+    return render(request, 'home.html', {'error': True})
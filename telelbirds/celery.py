@@ -0,0 +1,22 @@
+"""
+Celery application for telelbirds.
+
+Workers are started with:
+
+    celery -A telelbirds worker -l info
+
+The broker is configured through the CELERY_* settings. Without a broker
+(CELERY_BROKER_URL = 'memory://'), tasks run eagerly in the calling process,
+which is what tests and the local demo use.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'telelbirds.settings')
+
+app = Celery('telelbirds')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
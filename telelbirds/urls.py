@@ -13,9 +13,20 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-]
+    path('analytics/', include('apps.analytics.urls')),
+    path('api/', include('apps.api.urls')),
+    path('blog/', include('apps.blogs.urls')),
+    path('metrics/', include('apps.monitoring.urls')),
+    path('search/', include('apps.search.urls')),
+    path('', include('apps.dashboard.urls')),
+    path('', include('apps.hatchery.urls')),
+    path('', include('apps.chicks.urls')),
+    path('', include('apps.customer.urls')),
+] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)